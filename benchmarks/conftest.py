@@ -0,0 +1,116 @@
+"""Runs the benchmark suite with `pytest-benchmark`, at each of the synthetic config scales.
+
+The benchmarks aren't collected by the regular test run. Run them explicitly, without coverage tracing, e.g.
+
+    poetry run pytest benchmarks --no-cov --benchmark-save=before
+
+and compare a later run against the saved results with `--benchmark-compare=0001_before`, adding
+`--benchmark-compare-fail=median:50%` to fail the run when any median got more than 50% slower.
+
+Memory benchmarks measure the peak and retained memory of a call with `tracemalloc` instead. They're saved in the
+`extra_info` of their benchmark results, and fail when they exceed the budget they're given.
+"""
+
+import gc
+import tracemalloc
+from typing import Any, Callable
+
+import pytest
+
+DEFAULT_SCALES = "10,100,1000,10000,100000"
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("omni_config benchmarks")
+    group.addoption(
+        "--scales",
+        metavar="KEYS",
+        default=DEFAULT_SCALES,
+        help=f"The comma-separated numbers of config keys to run the benchmarks with. Defaults to {DEFAULT_SCALES}.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "max_scale(keys): skip the scales above the given number of config keys",
+    )
+    if config.pluginmanager.hasplugin("_cov") and not config.getoption("no_cov"):
+        raise pytest.UsageError(
+            "Coverage tracing skews the timings; run the benchmarks with --no-cov."
+        )
+
+
+def pytest_generate_tests(metafunc):
+    if "scale" not in metafunc.fixturenames:
+        return
+
+    scales = [int(scale) for scale in metafunc.config.getoption("scales").split(",")]
+    max_scale = metafunc.definition.get_closest_marker("max_scale")
+    if max_scale is not None:
+        scales = [scale for scale in scales if scale <= max_scale.args[0]]
+    metafunc.parametrize("scale", scales, ids=str)
+
+
+class MemoryBenchmark:
+    """Measures the memory the function it's called with allocates, using `tracemalloc`."""
+
+    def __init__(self, benchmark):
+        """Creates a MemoryBenchmark instance recording its results with the given `pytest-benchmark` fixture.
+
+        Args:
+            benchmark: The `benchmark` fixture of the test.
+        """
+        self._benchmark = benchmark
+        self.peak = 0
+        self.retained = 0
+
+    def __call__(self, function: Callable[..., Any], *args, **kwargs) -> Any:
+        """Calls the function, recording the peak memory allocated during the call and the memory still held after it.
+
+        The function is called once beforehand, so the modules it imports and the caches it fills on first use aren't
+        counted. Memory retained after the call includes the result, along with anything else the call keeps alive.
+        The measured call is also timed as a single round, so its timing includes the overhead of tracing.
+
+        Args:
+            function (Callable[..., Any]): The function to measure.
+            *args: The positional arguments to call the function with.
+            **kwargs: The keyword arguments to call the function with.
+
+        Returns:
+            Any: The result of the measured call.
+        """
+        function(*args, **kwargs)
+        gc.collect()
+
+        result = self._benchmark.pedantic(
+            self._measure, args=(function, args, kwargs), rounds=1, iterations=1
+        )
+        self._benchmark.extra_info["memory"] = {
+            "peak": self.peak,
+            "retained": self.retained,
+        }
+        return result
+
+    def _measure(self, function, args, kwargs):
+        already_tracing = tracemalloc.is_tracing()
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            result = function(*args, **kwargs)
+            gc.collect()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if not already_tracing:
+                tracemalloc.stop()
+
+        self.peak = peak - before
+        self.retained = current - before
+        return result
+
+
+@pytest.fixture
+def memory_benchmark(benchmark) -> MemoryBenchmark:
+    return MemoryBenchmark(benchmark)
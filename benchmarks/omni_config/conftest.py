@@ -0,0 +1,46 @@
+"""Provides the synthetic schema, config, lookups, and autoconfig app directory for the scale each benchmark runs at."""
+
+import json
+from typing import List
+
+import pytest
+
+from benchmarks.omni_config.synthetic import (
+    APP_NAME,
+    LOOKUPS,
+    key_path,
+    synthetic_config,
+    synthetic_schema,
+)
+
+
+@pytest.fixture
+def schema(scale) -> dict:
+    return synthetic_schema(scale)
+
+
+@pytest.fixture
+def config_dict(scale) -> dict:
+    return synthetic_config(scale)
+
+
+@pytest.fixture
+def looked_up_keys(scale) -> List[str]:
+    # The keys are spread across the whole config, so large configs aren't only read at the start. Small configs are
+    # read repeatedly, so every benchmark makes the same number of lookups.
+    return [key_path(lookup * scale // LOOKUPS) for lookup in range(LOOKUPS)]
+
+
+@pytest.fixture
+def app_dir(mocker, monkeypatch, tmp_path, scale, schema):
+    monkeypatch.chdir(tmp_path)
+    mocker.patch("sys.argv", [APP_NAME])
+    mocker.patch(
+        "platformdirs.user_config_dir", lambda app: str(tmp_path / "config" / app)
+    )
+    mocker.patch("prosper_shared.omni_config._realize_input_schemata", return_value=[])
+    mocker.patch(
+        "prosper_shared.omni_config._realize_config_schemata", return_value=[schema]
+    )
+    (tmp_path / f".{APP_NAME}.json").write_text(json.dumps(synthetic_config(scale)))
+    return tmp_path
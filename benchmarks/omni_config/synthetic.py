@@ -0,0 +1,48 @@
+"""Generates the synthetic schemata and configs the omni_config benchmarks run against.
+
+A config with `scale` keys holds a section of up to 100 keys for each hundred keys, cycling through string, integer,
+and boolean values, e.g. `bench-app.section_12.key_34`.
+"""
+
+from typing import Any, Callable
+
+from prosper_shared.omni_config import ConfigKey
+
+APP_NAME = "bench-app"
+KEYS_PER_SECTION = 100
+# The number of lookups each lookup benchmark makes, spread across the config.
+LOOKUPS = 100
+
+_TYPES = (str, int, bool)
+
+
+def synthetic_value(index: int) -> Any:
+    value_type = _TYPES[index % len(_TYPES)]
+    if value_type is str:
+        return f"value-{index}"
+    if value_type is int:
+        return index
+    return index % 2 == 0
+
+
+def synthetic_schema(keys: int) -> dict:
+    sections: dict = {}
+    for index in range(keys):
+        section = sections.setdefault(f"section_{index // KEYS_PER_SECTION}", {})
+        key = ConfigKey(f"key_{index % KEYS_PER_SECTION}", "A synthetic config key.")
+        section[key] = _TYPES[index % len(_TYPES)]
+    return {APP_NAME: sections}
+
+
+def synthetic_config(keys: int, value: Callable[[int], Any] = synthetic_value) -> dict:
+    sections: dict = {}
+    for index in range(keys):
+        section = sections.setdefault(f"section_{index // KEYS_PER_SECTION}", {})
+        section[f"key_{index % KEYS_PER_SECTION}"] = value(index)
+    return {APP_NAME: sections}
+
+
+def key_path(index: int) -> str:
+    return (
+        f"{APP_NAME}.section_{index // KEYS_PER_SECTION}.key_{index % KEYS_PER_SECTION}"
+    )
@@ -0,0 +1,19 @@
+import pytest
+
+from benchmarks.omni_config.synthetic import APP_NAME
+from prosper_shared.omni_config import Config
+
+
+# Autoconfig reads the argparse source, which compares every parsed value with every argument, so larger schemata take
+# minutes.
+@pytest.mark.max_scale(10_000)
+def test_autoconfig(benchmark, app_dir):
+    benchmark(Config.autoconfig, APP_NAME)
+
+
+@pytest.mark.max_scale(10_000)
+def test_autoconfig_snapshot(benchmark, app_dir):
+    snapshot_path = str(app_dir / "config.snapshot")
+    Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+
+    benchmark(Config.autoconfig, APP_NAME, snapshot_path=snapshot_path)
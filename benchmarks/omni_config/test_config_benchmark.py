@@ -0,0 +1,56 @@
+from enum import Enum
+
+import pytest
+
+from benchmarks.omni_config.synthetic import synthetic_config
+from prosper_shared.omni_config import Config
+
+
+class _Level(Enum):
+    LOW = "low"
+    HIGH = "high"
+
+
+# The value stored for each key, and the extra arguments passed to the accessor.
+ACCESSORS = {
+    "get_as_str": (lambda index: f"value-{index}", ()),
+    "get_as_bool": (lambda index: "yes" if index % 2 else "no", ()),
+    "get_as_decimal": (lambda index: f"{index}.25", ()),
+    "get_as_enum": (lambda index: "HIGH" if index % 2 else "low", (_Level,)),
+    "get_as_type": (lambda index: "decimal.Decimal", ()),
+    "get_as_array": (lambda index: [index, index + 1, index + 2], ("q",)),
+    "get_as_frozenset": (lambda index: [f"a-{index}", f"b-{index}"], ()),
+}
+
+
+def test_get(benchmark, config_dict, looked_up_keys):
+    config = Config(config_dict)
+
+    def get_all():
+        for key in looked_up_keys:
+            config.get(key)
+
+    benchmark(get_all)
+
+
+def test_get_missing(benchmark, config_dict, looked_up_keys):
+    config = Config(config_dict)
+    missing_keys = [f"{key}_missing" for key in looked_up_keys]
+
+    def get_all():
+        for key in missing_keys:
+            config.get(key)
+
+    benchmark(get_all)
+
+
+@pytest.mark.parametrize("accessor", ACCESSORS)
+def test_get_as(benchmark, scale, looked_up_keys, accessor):
+    value, args = ACCESSORS[accessor]
+    get_as = getattr(Config(synthetic_config(scale, value)), accessor)
+
+    def get_all():
+        for key in looked_up_keys:
+            get_as(key, *args)
+
+    benchmark(get_all)
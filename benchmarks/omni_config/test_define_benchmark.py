@@ -0,0 +1,15 @@
+import pytest
+from schema import Schema
+
+from benchmarks.omni_config.synthetic import APP_NAME
+from prosper_shared.omni_config import arg_parse_from_schema
+
+
+# Validation costs about a millisecond per key, so larger configs take minutes.
+@pytest.mark.max_scale(10_000)
+def test_validation(benchmark, schema, config_dict):
+    benchmark(Schema(schema, ignore_extra_keys=False).validate, config_dict)
+
+
+def test_arg_parse_from_schema(benchmark, schema):
+    benchmark(arg_parse_from_schema, schema, {}, APP_NAME)
@@ -0,0 +1,61 @@
+import pytest
+
+from benchmarks.omni_config.synthetic import APP_NAME, synthetic_schema
+from prosper_shared.omni_config import Config, arg_parse_from_schema
+from prosper_shared.omni_config._config import _realize_schema
+
+KiB = 1 << 10
+
+# The bytes each scenario may allocate at its peak and retain after returning: a fixed allowance, plus an allowance per
+# config key. They're about 1.5 times the usage measured with CPython 3.11 on 64-bit Linux.
+BUDGETS = {
+    "autoconfig": {"peak": (128 * KiB, 2 * KiB), "retained": (64 * KiB, 400)},
+    "config_init": {"peak": (16 * KiB, 64), "retained": (16 * KiB, 56)},
+    "realize_schema": {"peak": (64 * KiB, 1536), "retained": (32 * KiB, 960)},
+    "arg_parse_from_schema": {"peak": (64 * KiB, 1 * KiB), "retained": (32 * KiB, 900)},
+}
+
+
+def assert_within_budget(memory_benchmark, scenario: str, scale: int) -> None:
+    for measurement, (fixed, per_key) in BUDGETS[scenario].items():
+        used = getattr(memory_benchmark, measurement)
+        budget = fixed + per_key * scale
+        assert used <= budget, (
+            f"{scenario} used {used} bytes of {measurement} memory for {scale} keys, "
+            f"over its budget of {budget} bytes"
+        )
+
+
+# Autoconfig reads the argparse source, which compares every parsed value with every argument, so larger schemata take
+# minutes.
+@pytest.mark.max_scale(10_000)
+def test_autoconfig(memory_benchmark, scale, app_dir):
+    memory_benchmark(Config.autoconfig, APP_NAME)
+
+    assert_within_budget(memory_benchmark, "autoconfig", scale)
+
+
+def test_config_init(memory_benchmark, scale, config_dict):
+    # Includes the deep copy of the config dict.
+    memory_benchmark(Config, config_dict)
+
+    assert_within_budget(memory_benchmark, "config_init", scale)
+
+
+def test_realize_schema(memory_benchmark, scale, mocker):
+    mocker.patch("prosper_shared.omni_config._realize_input_schemata", return_value=[])
+    # Registered schema functions build their schema on every call, so building it counts towards the realization.
+    mocker.patch(
+        "prosper_shared.omni_config._realize_config_schemata",
+        side_effect=lambda: [synthetic_schema(scale)],
+    )
+
+    memory_benchmark(_realize_schema)
+
+    assert_within_budget(memory_benchmark, "realize_schema", scale)
+
+
+def test_arg_parse_from_schema(memory_benchmark, scale, schema):
+    memory_benchmark(arg_parse_from_schema, schema, {}, APP_NAME)
+
+    assert_within_budget(memory_benchmark, "arg_parse_from_schema", scale)
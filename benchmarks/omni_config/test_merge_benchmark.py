@@ -0,0 +1,10 @@
+from benchmarks.omni_config.synthetic import synthetic_config
+from prosper_shared.omni_config import merge_config
+
+
+def test_merge_config(benchmark, scale, config_dict):
+    # Like autoconfig, merges the defaults, a file overriding every value, and environment variables overriding some.
+    overrides = synthetic_config(scale, lambda index: f"override-{index}")
+    partial_overrides = synthetic_config(max(scale // 10, 1), str)
+
+    benchmark(merge_config, [config_dict, overrides, partial_overrides])
@@ -0,0 +1,30 @@
+import pytest
+
+from benchmarks.omni_config.synthetic import APP_NAME, KEYS_PER_SECTION
+from prosper_shared.omni_config import (
+    ArgParseSource,
+    EnvironmentVariableSource,
+    arg_parse_from_schema,
+)
+
+ENV_PREFIX = "BENCH_APP"
+
+
+def test_environment_variable_source(benchmark, scale, monkeypatch):
+    for index in range(scale):
+        monkeypatch.setenv(
+            f"{ENV_PREFIX}_SECTION_{index // KEYS_PER_SECTION}__KEY_{index % KEYS_PER_SECTION}",
+            f"value-{index}",
+        )
+    source = EnvironmentVariableSource(ENV_PREFIX)
+
+    benchmark(source.read)
+
+
+# Reading compares every parsed value with every argument, so larger schemata take minutes.
+@pytest.mark.max_scale(10_000)
+def test_arg_parse_source(benchmark, schema, mocker):
+    mocker.patch("sys.argv", [APP_NAME])
+    source = ArgParseSource(arg_parse_from_schema(schema, {}, APP_NAME))
+
+    benchmark(source.read)
@@ -0,0 +1,162 @@
+"""Contains utility methods and classes for recording which config keys are read, how often, and from where.
+
+Attach an `AccessRecorder` to a config with `Config.record_access` to count every lookup made through `get` and the
+`get_as_*` accessors. Counting a lookup costs a single dict update. The call site of a lookup is only looked up for every
+`sample_every`-th lookup, and only as one frame unless `capture_stacks` is set. The report lists the hottest keys along
+with their sampled call sites, and the schema keys never read since the recorder was attached.
+"""
+
+import os
+import sys
+import threading
+import traceback
+from collections import Counter
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from schema import Optional as SchemaOptional
+
+from prosper_shared.omni_config._define import _ConfigKey, _SchemaType
+
+_PACKAGE_DIRECTORY = os.path.dirname(__file__)
+
+
+class _AccessReport(NamedTuple):
+    # The most read keys with their lookup counts, most read first.
+    hot_keys: List[Tuple[str, int]]
+    # The schema keys neither read themselves nor as part of a subtree.
+    never_read: List[str]
+    # The sampled call sites of each hot key with their sample counts, most sampled first.
+    call_sites: Dict[str, List[Tuple[str, int]]]
+
+
+class _AccessRecorder:
+    """Counts config lookups by key, and samples where they're made from."""
+
+    def __init__(
+        self,
+        sample_every: int = 100,
+        capture_stacks: bool = False,
+        stack_limit: int = 16,
+    ):
+        """Creates an AccessRecorder instance.
+
+        Args:
+            sample_every (int): Look the call site up for every n-th lookup; 1 samples every lookup.
+            capture_stacks (bool): Sample the whole call stack instead of the innermost frame outside this package.
+            stack_limit (int): How many frames of the call stack to sample if `capture_stacks` is set.
+
+        Raises:
+            ValueError: If `sample_every` isn't positive.
+        """
+        if sample_every < 1:
+            raise ValueError(
+                f"Expected a positive sampling interval; got {sample_every}"
+            )
+
+        self.counts: Counter = Counter()
+        self._sample_every = sample_every
+        self._capture_stacks = capture_stacks
+        self._stack_limit = stack_limit
+        self._until_sample = sample_every
+        self._call_sites: Dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str) -> None:
+        """Counts a lookup of the given key, sampling its call site if it's due.
+
+        Concurrent lookups from several threads may occasionally be counted once.
+
+        Args:
+            key (str): The looked up key.
+        """
+        self.counts[key] += 1
+        self._until_sample -= 1
+        if self._until_sample <= 0:
+            self._until_sample = self._sample_every
+            self._sample(key)
+
+    def report(
+        self, schema: Optional[_SchemaType] = None, top: Optional[int] = 20
+    ) -> _AccessReport:
+        """Summarizes the lookups recorded so far.
+
+        Glob lookups, e.g. `strategies.*`, count as lookups of the glob itself, so they don't mark schema keys as read.
+
+        Args:
+            schema (Optional[_SchemaType]): The schema to find never read keys in. Defaults to the realized schema.
+            top (Optional[int]): How many hot keys to report, or None for every key read.
+
+        Returns:
+            _AccessReport: The hot keys, the never read schema keys, and the sampled call sites of the hot keys.
+        """
+        counts: Counter = Counter()
+        for key, count in list(self.counts.items()):
+            counts[key.strip(".")] += count
+
+        if schema is None:
+            from prosper_shared.omni_config._config import (  # noqa: autoimport
+                _realize_schema,
+            )
+
+            schema = _realize_schema()[2]
+
+        hot_keys = counts.most_common(top)
+        with self._lock:
+            call_sites = {
+                key: self._call_sites[key].most_common()
+                for key, _ in hot_keys
+                if key in self._call_sites
+            }
+
+        return _AccessReport(
+            hot_keys,
+            [key for key in _schema_keys(schema) if not _is_read(key, counts)],
+            call_sites,
+        )
+
+    def _sample(self, key: str) -> None:
+        # Skips this frame and the Config frames above it.
+        frame = sys._getframe(2)
+        while frame is not None and frame.f_code.co_filename.startswith(
+            _PACKAGE_DIRECTORY
+        ):
+            frame = frame.f_back
+        if frame is None:
+            return
+
+        if self._capture_stacks:
+            call_site = "".join(
+                traceback.format_list(
+                    traceback.extract_stack(frame, limit=self._stack_limit)
+                )
+            )
+        else:
+            call_site = (
+                f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+            )
+
+        with self._lock:
+            self._call_sites.setdefault(key.strip("."), Counter())[call_site] += 1
+
+
+def _schema_keys(schema: dict, path: str = "") -> Iterator[str]:
+    """Lists the '.' separated paths to the leaf keys of the schema, skipping keys matched by pattern or type."""
+    for key, value in schema.items():
+        while isinstance(key, (SchemaOptional, _ConfigKey)):
+            key = key.schema
+        if not isinstance(key, str):
+            continue
+
+        key_path = f"{path}.{key}" if path else key
+        if isinstance(value, dict) and value:
+            yield from _schema_keys(value, key_path)
+        else:
+            yield key_path
+
+
+def _is_read(key: str, counts: Counter) -> bool:
+    """Tests whether the key, or any subtree holding it, was read."""
+    segments = key.split(".")
+    return any(
+        ".".join(segments[:length]) in counts for length in range(1, len(segments) + 1)
+    )
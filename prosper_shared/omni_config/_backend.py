@@ -0,0 +1,202 @@
+"""Contains the registry of parser backends used by the file-based configuration sources."""
+
+import logging
+import re
+from importlib import import_module
+from importlib.machinery import ModuleSpec, PathFinder
+from importlib.util import find_spec
+from types import ModuleType
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _ParserBackend:
+    """A named implementation capable of parsing one config file format."""
+
+    def __init__(
+        self,
+        name: str,
+        module_name: str,
+        loads: Callable[[ModuleType, str], dict],
+        requires: Optional[str] = None,
+    ):
+        """Creates a ParserBackend instance.
+
+        Arguments:
+            name (str): The unique name of this backend within its file format.
+            module_name (str): The module implementing the parser; it's only imported when the backend is first used.
+            loads (Callable[[ModuleType, str], dict]): Parses the file contents using the imported module.
+            requires (Optional[str]): The module that must be installed for this backend to be available, if it
+                differs from `module_name`.
+        """
+        self._name = name
+        self._module_name = module_name
+        self._loads = loads
+        self._requires = requires if requires else module_name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def is_available(self) -> bool:
+        """Tests whether the modules backing this parser are installed.
+
+        Returns:
+            bool: Whether this backend can be used.
+        """
+        return _find_spec_without_importing(self._requires) is not None
+
+    def loads(self, content: str) -> dict:
+        """Parses the given file contents.
+
+        Args:
+            content (str): The contents of the config file.
+
+        Returns:
+            dict: The configuration values.
+        """
+        return self._loads(import_module(self._module_name), content)
+
+    def __repr__(self):
+        return f"ParserBackend(name={self._name},module_name={self._module_name})"
+
+
+def _find_spec_without_importing(name: str) -> Optional[ModuleSpec]:
+    """Finds the named module without importing its parent packages, as `find_spec` would for a submodule.
+
+    Args:
+        name (str): The absolute name of the module.
+
+    Returns:
+        Optional[ModuleSpec]: The module spec, or None if the module isn't installed.
+    """
+    parent_name, _, _ = name.rpartition(".")
+    if not parent_name:
+        return find_spec(name)
+
+    parent_spec = _find_spec_without_importing(parent_name)
+    if parent_spec is None or parent_spec.submodule_search_locations is None:
+        return None
+    return PathFinder.find_spec(name, list(parent_spec.submodule_search_locations))
+
+
+def _loads_with_module(module: ModuleType, content: str) -> dict:
+    return module.loads(content)
+
+
+# A run of 19 digits may be an integer outside the 64-bit range orjson supports.
+_LONG_DIGIT_RUN = re.compile(r"\d{19}")
+
+
+def _loads_json_with_orjson(module: ModuleType, content: str) -> dict:
+    # orjson turns integers beyond 64 bits into floats or rejects them, depending on its version, and rejects NaN and
+    # Infinity, so those documents are parsed by the standard library to produce the same values as the json backend.
+    if _LONG_DIGIT_RUN.search(content) is None:
+        try:
+            return module.loads(content)
+        except module.JSONDecodeError:
+            pass
+
+    import json  # noqa: autoimport
+
+    return json.loads(content)
+
+
+def _loads_yaml_with_libyaml(module: ModuleType, content: str) -> dict:
+    return module.load(content, Loader=module.CSafeLoader)
+
+
+def _loads_yaml(module: ModuleType, content: str) -> dict:
+    return module.safe_load(content)
+
+
+# Backends are listed fastest first; the first installed backend for a format is used unless a source overrides it.
+_parser_backends: Dict[str, List[_ParserBackend]] = {
+    "json": [
+        _ParserBackend("orjson", "orjson", _loads_json_with_orjson),
+        _ParserBackend("json", "json", _loads_with_module),
+    ],
+    "toml": [
+        _ParserBackend("tomllib", "tomllib", _loads_with_module),
+        _ParserBackend("tomli", "tomli", _loads_with_module),
+        _ParserBackend("toml", "toml", _loads_with_module),
+    ],
+    "yaml": [
+        _ParserBackend(
+            "libyaml", "yaml", _loads_yaml_with_libyaml, requires="yaml._yaml"
+        ),
+        _ParserBackend("pyyaml", "yaml", _loads_yaml),
+    ],
+}
+
+_selected_parser_backends: Dict[str, Optional[_ParserBackend]] = {}
+
+
+def _register_parser_backend(
+    file_format: str, backend: _ParserBackend, prefer: bool = False
+) -> None:
+    """Registers an additional parser backend for the given file format.
+
+    Args:
+        file_format (str): The file format parsed by the backend, e.g. 'json', 'toml', or 'yaml'.
+        backend (_ParserBackend): The backend to register.
+        prefer (bool): Whether the backend should be preferred over the already registered ones.
+    """
+    backends = _parser_backends.setdefault(file_format, [])
+    if prefer:
+        backends.insert(0, backend)
+    else:
+        backends.append(backend)
+    _selected_parser_backends.pop(file_format, None)
+
+
+def _find_parser_backend(file_format: str) -> Optional[_ParserBackend]:
+    if file_format not in _selected_parser_backends:
+        backend = next(
+            (b for b in _parser_backends.get(file_format, []) if b.is_available()),
+            None,
+        )
+        logger.debug(
+            f"Selected {backend.name if backend else 'no'} parser backend for {file_format} files"
+        )
+        _selected_parser_backends[file_format] = backend
+
+    return _selected_parser_backends[file_format]
+
+
+def _has_parser_backend(file_format: str) -> bool:
+    return _find_parser_backend(file_format) is not None
+
+
+def _select_parser_backend(
+    file_format: str, name: Optional[str] = None
+) -> _ParserBackend:
+    """Selects the parser backend for the given file format.
+
+    Args:
+        file_format (str): The file format to parse.
+        name (Optional[str]): Use the backend with this name instead of the fastest available one.
+
+    Returns:
+        _ParserBackend: The selected backend.
+
+    Raises:
+        ValueError: If no backend with the given name is registered for the file format.
+        ImportError: If the selected backend, or any backend at all, isn't installed.
+    """
+    if name is None:
+        backend = _find_parser_backend(file_format)
+        if backend is None:
+            raise ImportError(f"No parser backend is installed for {file_format} files")
+        return backend
+
+    backend = next(
+        (b for b in _parser_backends.get(file_format, []) if b.name == name), None
+    )
+    if backend is None:
+        raise ValueError(f"Unknown parser backend {name} for {file_format} files")
+    if not backend.is_available():
+        raise ImportError(f"Parser backend {name} for {file_format} is not installed")
+
+    return backend
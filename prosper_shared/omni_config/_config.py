@@ -0,0 +1,1376 @@
+"""Contains the `Config` class and the helpers that assemble it from the default configuration sources."""
+
+import logging
+from abc import abstractmethod
+from enum import Enum
+from functools import reduce
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ContextManager,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+# Heavier dependencies are resolved through the package namespace on first use, which keeps importing `Config` cheap.
+import prosper_shared.omni_config as omni_config
+
+if TYPE_CHECKING:
+    import argparse
+    from array import array
+    from contextvars import ContextVar
+    from decimal import Decimal
+    from multiprocessing.shared_memory import SharedMemory
+
+    from prosper_shared.omni_config._access import _AccessRecorder as AccessRecorder
+    from prosper_shared.omni_config._define import _SchemaType as SchemaType
+    from prosper_shared.omni_config._fingerprint import _DigestTree as DigestTree
+    from prosper_shared.omni_config._interpolate import _Interpolator as Interpolator
+    from prosper_shared.omni_config._parse import (
+        _ConfigurationSource as ConfigurationSource,
+    )
+    from prosper_shared.omni_config._parse import (
+        _LazyConfigurationSource as LazyConfigurationSource,
+    )
+    from prosper_shared.omni_config._profile import _Profiles as Profiles
+    from prosper_shared.omni_config._stats import _AutoconfigStats as AutoconfigStats
+    from prosper_shared.omni_config._transfer import _ConfigHandle as ConfigHandle
+
+logger = logging.getLogger(__name__)
+
+_GLOB_CHARACTERS = frozenset("*?[")
+
+_REMOVED = object()
+_MISSING = object()
+
+_T = TypeVar("_T", Enum, object)
+
+
+class _LazyValue:
+    """A config value that's only loaded when it's looked up, e.g. a reference to a large sidecar file."""
+
+    # Incremented whenever `resolve` loads the value again, e.g. an expired secret, so results derived from the previous
+    # value can be told apart.
+    version = 0
+
+    @abstractmethod
+    def resolve(self) -> Any:
+        """Loads the value, typically on the first call only, reusing it on later calls.
+
+        Returns:
+            Any: The loaded value.
+        """
+
+
+class Config:
+    """Holds and allows access to prosper-api config values."""
+
+    # The `ContextVar` holding the overlay layers pushed by `override`, created on first use.
+    _overlays: Optional["ContextVar"] = None
+    # The profiles discovered by `autoconfig`, if any, and the selected one.
+    _profiles: Optional["Profiles"] = None
+    _profile: Optional[str] = None
+    # Resolves `${...}` references within the values, if interpolation is enabled.
+    _interpolator: Optional["Interpolator"] = None
+    # The sources queried for the values missing from the config dict, lowest precedence first.
+    _lazy_sources: Tuple["LazyConfigurationSource", ...] = ()
+    # The schema defaults held by the config dict, which the lazy sources take precedence over, if set up by `autoconfig`.
+    _lazy_defaults: Optional[dict] = None
+    # Counts the lookups made through `get` and the `get_as_*` accessors, if attached with `record_access`.
+    _access_recorder: Optional["AccessRecorder"] = None
+    # The digests of the config dict the fingerprint was last computed for, reused for the subtrees it still shares.
+    _digest_tree: Optional["DigestTree"] = None
+
+    def __init__(
+        self,
+        config_dict: dict = None,
+        schema: "SchemaType" = None,
+        interpolate: bool = False,
+        lazy_sources: Sequence["LazyConfigurationSource"] = (),
+    ):
+        """Builds a config class instance.
+
+        Args:
+            config_dict (dict): A Python dict representing the config.
+            schema (SchemaType): Validate the config against this schema. Unexpected or missing values will cause a validation error.
+            interpolate (bool): Whether to resolve `${...}` references to other config values, e.g. `${app.url}/v1`.
+            lazy_sources (Sequence[LazyConfigurationSource]): Sources queried per key for the values missing from the
+                config dict, later sources taking precedence. They're neither validated nor copied.
+
+        Raises:
+            ValueError: If interpolation is enabled and the config holds a circular reference.
+        """
+        from copy import deepcopy  # noqa: autoimport
+
+        self._config_dict = deepcopy(config_dict)
+
+        if schema:
+            self._config_dict = _validate_config(
+                schema, self._config_dict, ignore_extra_keys=False
+            )
+
+        self._add_lazy_sources(lazy_sources)
+        if interpolate:
+            self._enable_interpolation()
+
+    def get(self, key: str) -> object:
+        """Get the specified config value.
+
+        Values referencing sidecar files, declared like `{"$file": "blocklist.bin"}`, are loaded on first access. Dicts
+        and lists are returned as held by the config, without copying them, so they must not be modified in place; the
+        fingerprint and the values cached by the `get_as_*` accessors would no longer match them.
+
+        Args:
+            key (str): The '.' separated path to the config value.
+
+        Returns:
+            object: The stored config value for the given key, or None if it doesn't
+                exist.
+
+        Raises:
+            ValueError: If interpolation is enabled and a reference within the value can't be resolved.
+        """
+        if self._access_recorder is not None:
+            self._access_recorder.record(key)
+
+        value = self._get_unresolved(key)
+        # Lazy values found within a returned subtree are left for the caller to resolve, so they're only loaded if used.
+        return value.resolve() if isinstance(value, _LazyValue) else value
+
+    def _get_unresolved(self, key: str) -> object:
+        """Gets the config value as `get` does, but without loading it if it's a lazy value."""
+        layers = self._overlays.get() if self._overlays is not None else ()
+        if layers:
+            from prosper_shared.omni_config._overlay import (  # noqa: autoimport
+                _get_overlaid,
+            )
+
+            value = _get_overlaid(self, key, layers)
+            # Overridden values only apply to the current context, so they're resolved without being memoized.
+            if self._interpolator is not None:
+                value = self._interpolator.interpolate(self, value)
+        elif self._interpolator is not None:
+            value = self._interpolator.get(self, key)
+        else:
+            value = self._get_base(key)
+        return value
+
+    def _get_base(self, key: str) -> object:
+        """Gets the config value without applying the overrides of the current context."""
+        value = _get_path(self._config_dict, key)
+        if not self._lazy_sources or _GLOB_CHARACTERS.intersection(key):
+            return value
+
+        default = _get_path(self._lazy_defaults, key)
+        # Leaf values set by any source but the schema defaults take precedence, so they're returned without querying
+        # the lazy sources.
+        if (
+            value is not None
+            and not isinstance(value, dict)
+            and not _is_default(value, default)
+        ):
+            return value
+        return _get_layered(value, default, key, self._lazy_sources)
+
+    def override(self, overrides: dict) -> ContextManager["Config"]:
+        """Overrides config values within the current context, e.g. for one request or one account.
+
+        The overrides are only visible to lookups made in this thread or asyncio task, and the tasks it creates, until
+        the context manager exits. They're layered on top of the config values without copying them, so pushing them
+        only costs as much as the overrides themselves. Nested dicts override the individual values they hold, and
+        '.' separated keys are interpreted as paths. Whole-config operations like `fingerprint`, comparisons,
+        pickling, and `share` ignore overrides.
+
+        Args:
+            overrides (dict): The values to override.
+
+        Returns:
+            ContextManager[Config]: A context manager applying the overrides to this config while it's active.
+        """
+        from prosper_shared.omni_config._overlay import (  # noqa: autoimport
+            _override,
+        )
+
+        return _override(self, overrides)
+
+    def view(self, prefix: str) -> "Config":
+        """Scopes the config to the subtree at the given prefix without copying it.
+
+        The view looks every key up relative to the prefix through this config, so it always reflects the current
+        values, e.g. after an update from a config daemon.
+
+        Args:
+            prefix (str): The '.' separated path to the subtree.
+
+        Returns:
+            Config: A read-only config backed by this config.
+        """
+        return _ConfigView(self, prefix)
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """Lists the keys of the config values at or below the given prefix.
+
+        Keys are '.' separated paths like the ones `get` takes, down to the individual values within dicts and lists.
+        The keys are indexed on the first query after the config is loaded or updated, after which each query only
+        costs as much as the keys it returns. Overrides and the values only held by lazy sources aren't included, since
+        listing them would query every value of the lazy sources.
+
+        Args:
+            prefix (str): The '.' separated path to list the keys under; lists every key if empty.
+
+        Returns:
+            List[str]: The matching keys, in sorted order.
+        """
+        from prosper_shared.omni_config._index import (  # noqa: autoimport
+            _get_key_index,
+        )
+
+        return _get_key_index(self).keys(prefix)
+
+    def find(self, pattern: str) -> List[str]:
+        """Finds the keys matching the given glob pattern, e.g. `strategies.*.max_bid`.
+
+        Each '.' separated segment of the pattern is matched like in `get`, and `**` matches any number of segments.
+        Literal segments are followed directly through the key index, so only the keys next to wildcard segments are
+        compared against the pattern. Like in `keys`, overrides and the values only held by lazy sources aren't
+        included.
+
+        Args:
+            pattern (str): The glob pattern.
+
+        Returns:
+            List[str]: The matching keys, including the keys of dicts and lists, in sorted order.
+        """
+        from prosper_shared.omni_config._index import (  # noqa: autoimport
+            _get_key_index,
+        )
+
+        return _get_key_index(self).find(pattern)
+
+    def get_as_str(self, key, default: Union[str, None] = None):
+        """Get the specified value interpreted as a string."""
+        value = self.get(key)
+        if value is None:
+            return default
+
+        return str(value)
+
+    def get_as_decimal(self, key, default: Union["Decimal", None] = None):
+        """Get the specified value interpreted as a decimal."""
+        value = self.get(key)
+        if value is None:
+            return default
+
+        from decimal import Decimal  # noqa: autoimport
+
+        return Decimal(value)
+
+    def get_as_bool(self, key: str, default: bool = False):
+        """Get the specified value interpreted as a boolean.
+
+        Specifically, the literal value `true`, string values 'true', 't', 'yes', and 'y' (case-insensitive), and any
+        numeric value != 0 will return True, otherwise, False is returned.
+        """
+        value = self.get(key)
+        if value is None:
+            return default
+
+        from numbers import Number  # noqa: autoimport
+
+        truthy_strings = {"true", "t", "yes", "y"}
+        if isinstance(value, str) and value.lower() in truthy_strings:
+            return True
+
+        if isinstance(value, Number) and value != 0:
+            return True
+
+        return False
+
+    def get_as_enum(
+        self, key: str, enum_type: Type[_T], default: Optional[_T] = None
+    ) -> Optional[_T]:
+        """Gets a config value by enum name or value.
+
+        Args:
+            key (str): The named config to get.
+            enum_type (Type[_T]): Interpret the resulting value as an enum of this type.
+            default (Optional[_T]): The value to return if the config key doesn't exist.
+
+        Returns:
+            Optional[_T]: The config value interpreted as the given enum type or the default value.
+        """
+        value = self.get(key)
+        if value is None:
+            return default
+
+        if value in enum_type.__members__.keys():
+            return enum_type[value]
+
+        return enum_type(value)
+
+    def get_as_type(self, key: str, default: Optional[Type[_T]] = None) -> Optional[_T]:
+        """Gets a config value by dotted type reference.
+
+        The resolved type is shared with schema validation through a process-wide cache, so the referenced module is
+        imported at most once.
+
+        Args:
+            key (str): The named config to get.
+            default (Optional[Type[_T]]): The value to return if the config key doesn't exist.
+
+        Returns:
+            Optional[_T]: The config value interpreted as a type.
+        """
+        value = self.get(key)
+        if value is None:
+            return default
+
+        return omni_config.resolve_type(value)
+
+    def get_as_array(
+        self, key: str, typecode: str, default: Optional["array"] = None
+    ) -> Optional["array"]:
+        """Gets a list of numbers as a compact `array.array`, e.g. for large allow-lists or rate grids.
+
+        The array is built on the first lookup and shared by every later lookup until the config is updated, or a secret
+        it's built from is read again, so it must not be modified. Values overridden in the current context, and the
+        values of configs with lazy sources, are converted on every lookup instead.
+
+        Args:
+            key (str): The named config to get.
+            typecode (str): The `array` type code of the items, e.g. 'q' for 64-bit integers or 'd' for doubles.
+            default (Optional[array]): The value to return if the config key doesn't exist.
+
+        Returns:
+            Optional[array]: The config value as an array, or the default value.
+
+        Raises:
+            TypeError: If an item doesn't have the type given by the type code.
+            OverflowError: If an item doesn't fit the type given by the type code.
+        """
+        from array import array  # noqa: autoimport
+
+        value = self._get_converted(
+            key, ("array", typecode), lambda items: array(typecode, items)
+        )
+        return default if value is None else value
+
+    def get_as_frozenset(
+        self, key: str, default: Optional[FrozenSet] = None
+    ) -> Optional[FrozenSet]:
+        """Gets a list as a frozenset, e.g. for constant-time membership tests against a large allow-list.
+
+        The set is built on the first lookup and shared by every later lookup until the config is updated, or a secret
+        it's built from is read again. Values overridden in the current context, and the values of configs with lazy
+        sources, are converted on every lookup instead.
+
+        Args:
+            key (str): The named config to get.
+            default (Optional[FrozenSet]): The value to return if the config key doesn't exist.
+
+        Returns:
+            Optional[FrozenSet]: The config value as a frozenset, or the default value.
+        """
+        value = self._get_converted(key, ("frozenset",), frozenset)
+        return default if value is None else value
+
+    def _get_converted(
+        self, key: str, conversion: Hashable, convert: Callable[[Any], Any]
+    ) -> Any:
+        """Converts the config value, reusing the result for the same key and conversion until the value changes.
+
+        The results are kept for the current config tree, and dropped once the config holds a different one, e.g. after
+        an update from a config daemon. Results converted from a lazy value are also dropped once it's loaded again.
+        """
+        if (self._overlays is not None and self._overlays.get()) or self._lazy_sources:
+            # Overridden values only apply to the current context, and the values held by lazy sources can change at
+            # any time, so they're converted on every lookup.
+            value = self.get(key)
+            return None if value is None else convert(value)
+
+        config_dict = self._config_dict
+        converted_values = getattr(self, "_converted_values", None)
+        if converted_values is None or converted_values[0] is not config_dict:
+            converted_values = (config_dict, {})
+            self._converted_values = converted_values
+
+        if self._access_recorder is not None:
+            self._access_recorder.record(key)
+
+        cache_key = (key, conversion)
+        cached = converted_values[1].get(cache_key)
+        if cached is not None:
+            lazy_value, version, converted = cached
+            if lazy_value is None:
+                return converted
+            # Resolving the lazy value loads it again once it expired, which bumps its version.
+            lazy_value.resolve()
+            if lazy_value.version == version:
+                return converted
+
+        value = self._get_unresolved(key)
+        lazy_value = value if isinstance(value, _LazyValue) else None
+        if lazy_value is not None:
+            value = lazy_value.resolve()
+        converted = None if value is None else convert(value)
+        converted_values[1][cache_key] = (
+            lazy_value,
+            lazy_value.version if lazy_value is not None else None,
+            converted,
+        )
+        return converted
+
+    def record_access(self, recorder: Optional["AccessRecorder"]) -> None:
+        """Records the lookups made through `get` and the `get_as_*` accessors to the given recorder.
+
+        Lookups made through the views of this config are recorded with their full key.
+
+        Args:
+            recorder (Optional[AccessRecorder]): The recorder to count the lookups with, or None to stop recording.
+        """
+        self._access_recorder = recorder
+
+    @property
+    def fingerprint(self) -> str:
+        """A digest identifying the config that's stable across processes and independent of the key order.
+
+        The digest covers the config values and the settings changing how they're resolved: whether interpolation is
+        enabled, the selected profile, and the lazy sources. The digests of the subtrees are kept, so once the config
+        holds a new version, e.g. received from a config daemon, only the subtrees that aren't shared with the previous
+        version are hashed again. Like for `get`, the values must not be modified in place.
+
+        Returns:
+            str: The hex digest of the config.
+        """
+        from prosper_shared.omni_config._fingerprint import (  # noqa: autoimport
+            _fingerprint_config,
+            _fingerprint_tree,
+        )
+
+        self._digest_tree = _fingerprint_tree(self._config_dict, self._digest_tree)
+        return _fingerprint_config(
+            self._digest_tree,
+            interpolate=self._interpolator is not None,
+            profile=self._profile,
+            lazy_sources=[_identify_source(s) for s in self._lazy_sources],
+            lazy_defaults=self._lazy_defaults,
+        )
+
+    def freeze(self) -> "Config":
+        """Creates an immutable copy of the config, which is compared by content and hashable, so it can be a cache key.
+
+        The copy holds the current values, e.g. those of the selected profile or the last version received from a
+        config daemon. Its `get` returns dicts as read-only `MappingProxyType` instances and lists as tuples, so the
+        values can't be modified in place. Overrides still apply to the copy. Freezing a view freezes its parent.
+
+        Returns:
+            Config: The frozen config.
+
+        Raises:
+            ValueError: If the config has lazy sources, whose values can change at any time.
+        """
+        from prosper_shared.omni_config._frozen import (  # noqa: autoimport
+            _freeze_config,
+        )
+
+        return _freeze_config(self)
+
+    @property
+    def profiles(self) -> List[str]:
+        """The names of the profiles discovered by `autoconfig`."""
+        return self._profiles.names if self._profiles else []
+
+    @property
+    def profile(self) -> Optional[str]:
+        """The name of the selected profile, or None if no profile is selected."""
+        return self._profile
+
+    def use_profile(self, profile: Optional[str]) -> None:
+        """Switches to the given profile.
+
+        The config for each profile is resolved the first time it's selected, and kept for switching back to it
+        later, so switching between already used profiles only swaps the underlying config tree.
+
+        Args:
+            profile (Optional[str]): The profile name, or None to only use the config files without a profile.
+
+        Raises:
+            ValueError: If the profile doesn't exist.
+        """
+        if self._profiles is None:
+            if profile is None:
+                return
+            raise ValueError(
+                f"Unknown config profile {profile}; no profiles were discovered"
+            )
+
+        self._config_dict = self._profiles.resolve(profile)
+        self._profile = profile
+
+    def share(self, name: Optional[str] = None) -> "SharedMemory":
+        """Serializes the config once into shared memory, so other processes can attach to it with `Config.attach`.
+
+        The caller owns the returned segment, and should close and unlink it once no process needs it anymore.
+
+        Args:
+            name (Optional[str]): The name of the shared memory segment; a unique name is generated if omitted.
+
+        Returns:
+            SharedMemory: The shared memory segment holding the config.
+        """
+        from prosper_shared.omni_config._shared import (  # noqa: autoimport
+            _share_config,
+        )
+
+        return _share_config(self._config_dict, name, self._interpolator is not None)
+
+    @classmethod
+    def attach(cls, name: str) -> "Config":
+        """Attaches to a config shared by `Config.share` in another process.
+
+        The returned config reads values directly from the shared buffer, decoding only the values that are accessed,
+        so the memory used per host stays the same regardless of the number of attached processes.
+
+        Args:
+            name (str): The name of the shared memory segment.
+
+        Returns:
+            Config: A read-only config backed by the shared memory segment.
+        """
+        from prosper_shared.omni_config._shared import (  # noqa: autoimport
+            _SharedMemoryConfig,
+        )
+
+        return _SharedMemoryConfig(name)
+
+    def handle(self) -> "ConfigHandle":
+        """Creates a content-addressed handle to send this config to other processes, e.g. process pool workers.
+
+        The handle is pickled as a digest of the config, so sending it repeatedly costs the same regardless of the
+        config size. Unpickling it produces the config from a per-process cache, which is filled from a shared memory
+        segment on first use, or inherited from this process by forked workers. The caller owns the handle and should
+        close it once no process needs to resolve it anymore.
+
+        Returns:
+            ConfigHandle: A handle to the current config values.
+        """
+        from prosper_shared.omni_config._transfer import (  # noqa: autoimport
+            _ConfigHandle,
+        )
+
+        return _ConfigHandle(self)
+
+    def __reduce_ex__(self, protocol):
+        """Pickles the config as its config dict and the settings it's resolved with."""
+        from prosper_shared.omni_config._transfer import (  # noqa: autoimport
+            _reduce_config,
+        )
+
+        return _reduce_config(self, protocol)
+
+    @classmethod
+    def subscribe(
+        cls, socket_path: str, timeout: float = 5.0, interpolate: bool = False
+    ) -> "Config":
+        """Subscribes to a config daemon running on this host instead of resolving the config in this process.
+
+        The daemon resolves the config like `Config.autoconfig`, except for command-line arguments, and watches its
+        sources. The returned config is updated in the background with only the values that changed. Start the daemon
+        with `python -m prosper_shared.omni_config._daemon APP_NAME SOCKET_PATH`.
+
+        Args:
+            socket_path (str): The path of the daemon's Unix domain socket.
+            timeout (float): How long to wait for the daemon to come up and send the current config, in seconds.
+            interpolate (bool): Whether to resolve `${...}` references to other config values.
+
+        Returns:
+            Config: A read-only config following the versions published by the daemon.
+        """
+        from prosper_shared.omni_config._daemon import (  # noqa: autoimport
+            _SubscribedConfig,
+        )
+
+        return _SubscribedConfig(socket_path, timeout, interpolate)
+
+    @classmethod
+    def autoconfig(
+        cls,
+        app_name: str,
+        arg_parse: "argparse.ArgumentParser" = None,
+        validate: bool = False,
+        search_equivalent_names: bool = True,
+        snapshot_path: Optional[str] = None,
+        profile: Optional[str] = None,
+        interpolate: bool = False,
+        lazy_sources: Sequence["LazyConfigurationSource"] = (),
+        stats: Optional["AutoconfigStats"] = None,
+    ) -> "Config":
+        """Sets up a Config with default configuration sources.
+
+        Gets config files from the following locations:
+        1. The default config directory for the given app name.
+        2. The working directory, including searching `pyproject.toml` for a `tools.{app_name}` section, if present.
+        3. Environment variables prefixed by 'APP_NAME_' for each of the given app names.
+        4. The given argparse instance.
+
+        If `search_equivalent_names` is set, search for config locations with equivalent names in different casing
+        styles, e.g. 'config-name` -> `configName` and `config_name`.
+
+        Config values found lower in the chain will override previous values for the same key.
+
+        If `snapshot_path` is set, the resolved config is loaded from the snapshot at that path as long as the schema
+        and every source still match the fingerprints recorded in it. Otherwise, the config is resolved from scratch
+        and a new snapshot is written, e.g. for the next worker process to pick up.
+
+        Profiles are discovered next to each config file, named like the file with the profile name before the
+        extension, e.g. `config.prod.yml` or `.app-name.staging.json`. The files of the selected `profile` override the
+        other config files, but not environment variables or command-line arguments. Use `use_profile` to switch to
+        another profile later on.
+
+        Args:
+            app_name (str): An ordered list of app names for which look for configs.
+            arg_parse (argparse.ArgumentParser): A pre-configured argparse instance.
+            validate (bool): Whether to validate the config prior to returning it.
+            search_equivalent_names (bool): Whether equivalent names to the given app names should be included in the
+                config location search.
+            snapshot_path (Optional[str]): Where to load the resolved config from and save it to.
+            profile (Optional[str]): The profile to start with.
+            interpolate (bool): Whether to resolve `${...}` references to other config values, e.g. `${app.url}/v1`.
+                References are resolved on first access, and only the values depending on a changed value are resolved
+                again after switching profiles.
+            lazy_sources (Sequence[LazyConfigurationSource]): Sources queried per key instead of being read up front,
+                e.g. a `SqliteConfigurationSource` holding a large rule set. They take precedence over the schema
+                defaults, every other source takes precedence over them, and later lazy sources take precedence over
+                earlier ones. Values other sources set to their schema default count as defaults.
+            stats (Optional[AutoconfigStats]): Records how long each phase takes, e.g. reading each source, to be
+                logged or written as a Chrome trace.
+
+        Returns:
+            Config: A configured Config instance.
+
+        Raises:
+            ValueError: If the given profile doesn't exist, or interpolation is enabled and the config holds a circular
+                reference.
+        """
+        from prosper_shared.omni_config._stats import (  # noqa: autoimport
+            _phase,
+            _recording,
+        )
+
+        with _recording(stats), _phase("autoconfig", app_name=app_name):
+            return cls._autoconfig(
+                app_name,
+                arg_parse,
+                validate,
+                search_equivalent_names,
+                snapshot_path,
+                profile,
+                interpolate,
+                lazy_sources,
+            )
+
+    @classmethod
+    def _autoconfig(
+        cls,
+        app_name: str,
+        arg_parse: Optional["argparse.ArgumentParser"],
+        validate: bool,
+        search_equivalent_names: bool,
+        snapshot_path: Optional[str],
+        profile: Optional[str],
+        interpolate: bool,
+        lazy_sources: Sequence["LazyConfigurationSource"],
+    ) -> "Config":
+        """Resolves the config for `autoconfig`, timing each phase for the stats recording in the current context."""
+        from prosper_shared.omni_config._stats import _phase  # noqa: autoimport
+
+        with _phase("schema"):
+            config_schemata, input_schemata, schema = _realize_schema()
+
+        from prosper_shared.omni_config._profile import _Profiles  # noqa: autoimport
+
+        with _phase("discovery"):
+            conf_sources = _discover_sources(
+                app_name,
+                config_schemata,
+                input_schemata,
+                schema,
+                arg_parse,
+                search_equivalent_names,
+            )
+            profiles = _Profiles(conf_sources, schema, validate)
+        conf_sources = profiles.sources(profile)
+
+        config_dict = None
+        if snapshot_path:
+            from prosper_shared.omni_config._snapshot import (  # noqa: autoimport
+                _fingerprint_schema,
+                _fingerprint_sources,
+                _read_snapshot,
+                _write_snapshot,
+            )
+
+            with _phase("snapshot read", path=snapshot_path) as details:
+                schema_fingerprint = _fingerprint_schema(schema, validate)
+                # The first source holds the schema defaults, which the schema fingerprint already covers.
+                source_fingerprints = _fingerprint_sources(conf_sources[1:])
+                config_dict = _read_snapshot(
+                    snapshot_path, schema_fingerprint, source_fingerprints
+                )
+                details["hit"] = config_dict is not None
+
+        if config_dict is None:
+            config_dict = _resolve_sources(conf_sources, schema, validate)
+
+            if snapshot_path:
+                with _phase("snapshot write", path=snapshot_path):
+                    _write_snapshot(
+                        snapshot_path,
+                        config_dict,
+                        schema_fingerprint,
+                        source_fingerprints,
+                    )
+
+        config = cls._wrap(
+            config_dict, interpolate, tuple(lazy_sources), conf_sources[0]
+        )
+        if profiles.names:
+            profiles.remember(profile, config_dict)
+            config._profiles = profiles
+            config._profile = profile
+
+        return config
+
+    @classmethod
+    def autoconfig_many(
+        cls,
+        app_names: Sequence[str],
+        arg_parse: "argparse.ArgumentParser" = None,
+        validate: bool = False,
+        search_equivalent_names: bool = True,
+        profile: Optional[str] = None,
+        interpolate: bool = False,
+        lazy_sources: Sequence["LazyConfigurationSource"] = (),
+        stats: Optional["AutoconfigStats"] = None,
+    ) -> Dict[str, "Config"]:
+        """Sets up a Config for each of the given app names, like `autoconfig`, sharing the discovery work between them.
+
+        The schema is realized once, the environment variables are copied once, each directory is listed once, and each
+        config file is parsed once, e.g. a `.pyproject.toml` holding a section for every app. A given argparse instance
+        parses the command line once for every app; without one, each app builds and parses its own parser from the
+        schema, as `autoconfig` does, since the parser's help names the app.
+
+        Args:
+            app_names (Sequence[str]): The app names to set up a Config for.
+            arg_parse (argparse.ArgumentParser): A pre-configured argparse instance shared by every app.
+            validate (bool): Whether to validate the configs prior to returning them.
+            search_equivalent_names (bool): Whether equivalent names to the given app names should be included in the
+                config location search.
+            profile (Optional[str]): The profile to start with.
+            interpolate (bool): Whether to resolve `${...}` references to other config values.
+            lazy_sources (Sequence[LazyConfigurationSource]): Sources queried per key instead of being read up front.
+            stats (Optional[AutoconfigStats]): Records how long each phase of every call takes.
+
+        Returns:
+            Dict[str, Config]: The configured Config instance of each app name.
+
+        Raises:
+            ValueError: If the given profile doesn't exist for an app, or interpolation is enabled and a config holds a
+                circular reference.
+        """
+        from prosper_shared.omni_config._discovery import (  # noqa: autoimport
+            _shared_discovery,
+        )
+
+        with _shared_discovery():
+            return {
+                app_name: cls.autoconfig(
+                    app_name,
+                    arg_parse,
+                    validate,
+                    search_equivalent_names,
+                    profile=profile,
+                    interpolate=interpolate,
+                    lazy_sources=lazy_sources,
+                    stats=stats,
+                )
+                for app_name in app_names
+            }
+
+    @classmethod
+    def _wrap(
+        cls,
+        config_dict: dict,
+        interpolate: bool = False,
+        lazy_sources: Sequence["LazyConfigurationSource"] = (),
+        lazy_defaults: Optional[dict] = None,
+    ) -> "Config":
+        """Creates a Config that takes ownership of the given dict without copying or validating it."""
+        config = cls()
+        config._config_dict = config_dict
+        config._add_lazy_sources(lazy_sources, lazy_defaults)
+        if interpolate:
+            config._enable_interpolation()
+        return config
+
+    def _add_lazy_sources(
+        self,
+        lazy_sources: Sequence["LazyConfigurationSource"],
+        lazy_defaults: Optional[dict] = None,
+    ) -> None:
+        if lazy_sources:
+            self._lazy_sources = tuple(lazy_sources)
+            self._lazy_defaults = lazy_defaults
+
+    def _enable_interpolation(self) -> None:
+        from prosper_shared.omni_config._interpolate import (  # noqa: autoimport
+            _Interpolator,
+        )
+
+        self._interpolator = _Interpolator(self._config_dict)
+
+
+class _ConfigView(Config):
+    """A read-only Config scoped to a subtree of another config."""
+
+    def __init__(self, parent: Config, prefix: str):
+        """Creates a ConfigView instance.
+
+        Args:
+            parent (Config): The config holding the subtree.
+            prefix (str): The '.' separated path to the subtree.
+        """
+        prefix = prefix.strip(".")
+        if isinstance(parent, _ConfigView):
+            # Nested views look keys up directly in the root config, so lookups cost the same at every depth.
+            prefix = f"{parent._prefix}.{prefix}" if prefix else parent._prefix
+            parent = parent._parent
+        self._parent = parent
+        self._prefix = prefix
+
+    @property
+    def _interpolator(self) -> Optional["Interpolator"]:
+        return self._parent._interpolator
+
+    @property
+    def _config_dict(self) -> Optional[dict]:
+        return (
+            self._parent._get_base(self._prefix)
+            if self._prefix
+            else self._parent._config_dict
+        )
+
+    def get(self, key: str) -> object:
+        """Get the specified config value relative to the prefix.
+
+        Args:
+            key (str): The '.' separated path to the config value within the subtree.
+
+        Returns:
+            object: The stored config value for the given key, or None if it doesn't exist.
+        """
+        return self._parent.get(self._parent_key(key))
+
+    def _get_converted(
+        self, key: str, conversion: Hashable, convert: Callable[[Any], Any]
+    ) -> Any:
+        # Overrides are pushed to the parent, which also keeps the converted values for all of its views.
+        return self._parent._get_converted(self._parent_key(key), conversion, convert)
+
+    def record_access(self, recorder: Optional["AccessRecorder"]) -> None:
+        # Lookups through views are made by the parent, so they're recorded there.
+        self._parent.record_access(recorder)
+
+    def _parent_key(self, key: str) -> str:
+        key = key[1:] if key[:1] == "." else key
+        return f"{self._prefix}.{key}" if self._prefix else key
+
+    def keys(self, prefix: str = "") -> List[str]:
+        # Views query the index of the config they're backed by, which is shared by all of its views.
+        if not self._prefix:
+            return self._parent.keys(prefix)
+        return self._strip_prefix(self._parent.keys(f"{self._prefix}.{prefix}"))
+
+    def find(self, pattern: str) -> List[str]:
+        if not self._prefix:
+            return self._parent.find(pattern)
+        return self._strip_prefix(
+            self._parent.find(f"{self._prefix}.{pattern.strip('.')}")
+        )
+
+    def _strip_prefix(self, keys: List[str]) -> List[str]:
+        return [key[len(self._prefix) + 1 :] for key in keys if key != self._prefix]
+
+    def __reduce_ex__(self, protocol):
+        from prosper_shared.omni_config._transfer import (  # noqa: autoimport
+            _detach_view,
+            _reduce_config,
+        )
+
+        # Other processes receive a plain config holding the subtree, since the parent isn't sent along.
+        return _reduce_config(_detach_view(self), protocol, Config)
+
+
+def _resolve_sources(
+    conf_sources: List[Union[dict, "ConfigurationSource"]],
+    schema: "SchemaType",
+    validate: bool,
+) -> dict:
+    """Reads and merges the given configuration sources in order, validating the result if requested."""
+    from prosper_shared.omni_config._stats import _phase  # noqa: autoimport
+
+    configs = []
+    for source in conf_sources:
+        if isinstance(source, dict):
+            configs.append(source)
+            continue
+        # Phases are named after the public source classes, e.g. `read JsonConfigurationSource`.
+        with _phase(f"read {type(source).__name__.lstrip('_')}") as details:
+            if isinstance(source, omni_config.FileConfigurationSource):
+                details["path"] = source._config_file_path
+            configs.append(source.read())
+
+    with _phase("merge"):
+        config_dict = omni_config.merge_config(configs)
+
+    if validate:
+        with _phase("validation"):
+            config_dict = _validate_config(schema, config_dict, ignore_extra_keys=True)
+
+    return config_dict
+
+
+def _validate_config(
+    schema: "SchemaType", config_dict: dict, ignore_extra_keys: bool
+) -> dict:
+    """Validates the config dict against the schema, checking lazy values by the value they load.
+
+    Lazy values are kept in the validated config wherever the schema accepts their loaded value as is, so they're still
+    reloaded as usual afterwards, e.g. rotated secrets. Values the schema converts are replaced by the converted value.
+    """
+    from schema import Schema  # noqa: autoimport
+
+    lazy_values: List[Tuple[tuple, _LazyValue, Any]] = []
+    validated = Schema(schema, ignore_extra_keys=ignore_extra_keys).validate(
+        _load_lazy_values(config_dict, (), lazy_values)
+    )
+
+    for path, lazy_value, loaded_value in lazy_values:
+        parent = validated
+        try:
+            for segment in path[:-1]:
+                parent = parent[segment]
+            if parent[path[-1]] is loaded_value:
+                parent[path[-1]] = lazy_value
+        except (KeyError, IndexError, TypeError):
+            # The schema restructured the value, so its loaded value is kept.
+            continue
+    return validated
+
+
+def _load_lazy_values(
+    value: Any, path: tuple, lazy_values: List[Tuple[tuple, _LazyValue, Any]]
+) -> Any:
+    """Copies the tree, with the lazy values within it loaded, noting the path, lazy value, and loaded value of each."""
+    if isinstance(value, dict):
+        return {
+            key: _load_lazy_values(item, path + (key,), lazy_values)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [
+            _load_lazy_values(item, path + (index,), lazy_values)
+            for index, item in enumerate(value)
+        ]
+    if isinstance(value, _LazyValue):
+        loaded_value = value.resolve()
+        lazy_values.append((path, value, loaded_value))
+        return loaded_value
+    return value
+
+
+def _get_layered(
+    value: object,
+    default: object,
+    key: str,
+    lazy_sources: Sequence["LazyConfigurationSource"],
+) -> object:
+    """Layers the value found in the config dict over the values found in the lazy sources, and those over the default.
+
+    Dicts are merged, with the values of higher layers replacing the values of lower layers, lists included.
+    """
+    found = []
+    for layer in chain(
+        (_without_defaults(value, default),),
+        (source.get(key) for source in reversed(lazy_sources)),
+        (default,),
+    ):
+        if layer is None:
+            continue
+        if not isinstance(layer, dict):
+            if not found:
+                return layer
+            break
+        found.append(layer)
+
+    if len(found) <= 1:
+        return found[0] if found else None
+    return reduce(_layer_dicts, reversed(found))
+
+
+def _identify_source(source: "LazyConfigurationSource") -> str:
+    # Sources that can't be fingerprinted are told apart by identity, which isn't stable across processes.
+    return source.fingerprint() or f"{type(source).__qualname__}@{id(source):x}"
+
+
+def _is_default(value: object, default: object) -> bool:
+    return default is not None and type(value) is type(default) and value == default
+
+
+def _without_defaults(value: object, default: object) -> object:
+    """Removes the values equal to their schema default from the value, leaving the values other sources set."""
+    if _is_default(value, default):
+        return None
+    if not isinstance(value, dict) or not isinstance(default, dict):
+        return value
+
+    stripped = {}
+    for key, nested_value in value.items():
+        nested_value = _without_defaults(nested_value, default.get(key))
+        if nested_value is not None:
+            stripped[key] = nested_value
+    return stripped
+
+
+def _layer_dicts(lower: dict, upper: dict) -> dict:
+    layered = dict(lower)
+    for key, value in upper.items():
+        if isinstance(value, dict) and isinstance(layered.get(key), dict):
+            value = _layer_dicts(layered[key], value)
+        layered[key] = value
+    return layered
+
+
+def _realize_schema() -> Tuple["SchemaType", "SchemaType", "SchemaType"]:
+    """Realizes the config, input, and combined schemata, once for every autoconfig call sharing discovery."""
+    from prosper_shared.omni_config._discovery import _memoize  # noqa: autoimport
+
+    def realize() -> Tuple["SchemaType", "SchemaType", "SchemaType"]:
+        merge_config = omni_config.merge_config
+        config_schemata = merge_config(omni_config._realize_config_schemata())
+        input_schemata = merge_config(omni_config._realize_input_schemata())
+        return (
+            config_schemata,
+            input_schemata,
+            merge_config([config_schemata, input_schemata]),
+        )
+
+    return _memoize("schema", realize)
+
+
+def _discover_sources(
+    app_name: str,
+    config_schemata: "SchemaType",
+    input_schemata: "SchemaType",
+    schema: "SchemaType",
+    arg_parse: Optional["argparse.ArgumentParser"],
+    search_equivalent_names: bool,
+) -> List[Union[dict, "ConfigurationSource"]]:
+    """Builds the chain of configuration sources searched by `Config.autoconfig`, starting with the schema defaults."""
+    from os import getcwd  # noqa: autoimport
+    from os.path import join  # noqa: autoimport
+
+    from caseconverter import (  # noqa: autoimport
+        camelcase,
+        kebabcase,
+        macrocase,
+        snakecase,
+    )
+    from platformdirs import user_config_dir  # noqa: autoimport
+
+    JsonConfigurationSource = omni_config.JsonConfigurationSource
+    TomlConfigurationSource = omni_config.TomlConfigurationSource
+    YamlConfigurationSource = omni_config.YamlConfigurationSource
+
+    if search_equivalent_names:
+        file_app_name_dedup = {
+            camelcase(app_name): None,
+            snakecase(app_name): None,
+            kebabcase(app_name): None,
+        }
+        file_app_names = list(file_app_name_dedup.keys())
+    else:
+        file_app_names = [app_name]
+
+    conf_sources: List[Union[dict, "ConfigurationSource"]] = [
+        omni_config._extract_defaults_from_schema(schema)
+    ]
+
+    conf_sources += [
+        JsonConfigurationSource(
+            join(user_config_dir(app_name), "config.json"),
+        )
+        for app_name in file_app_names
+    ]
+    if _has_yaml():
+        conf_sources += [
+            YamlConfigurationSource(
+                join(user_config_dir(app_name), "config.yml"),
+            )
+            for app_name in file_app_names
+        ]
+        conf_sources += [
+            YamlConfigurationSource(
+                join(user_config_dir(app_name), "config.yaml"),
+            )
+            for app_name in file_app_names
+        ]
+
+    if _has_toml():
+        conf_sources += [
+            TomlConfigurationSource(
+                join(user_config_dir(app_name), "config.toml"),
+            )
+            for app_name in file_app_names
+        ]
+
+    conf_sources += [
+        JsonConfigurationSource(
+            join(getcwd(), f".{app_name}.json"),
+        )
+        for app_name in file_app_names
+    ]
+
+    if _has_yaml():
+        conf_sources += [
+            YamlConfigurationSource(
+                join(getcwd(), f".{app_name}.yml"),
+            )
+            for app_name in file_app_names
+        ]
+        conf_sources += [
+            YamlConfigurationSource(
+                join(getcwd(), f".{app_name}.yaml"),
+            )
+            for app_name in file_app_names
+        ]
+
+    if _has_toml():
+        conf_sources += [
+            TomlConfigurationSource(
+                join(getcwd(), f".{app_name}.toml"),
+            )
+            for app_name in file_app_names
+        ]
+        conf_sources += [
+            TomlConfigurationSource(
+                join(getcwd(), ".pyproject.toml"),
+                f"tools.{app_name}",
+                inject_at=kebabcase(app_name),
+            )
+            for app_name in file_app_names
+        ]
+
+    conf_sources += [
+        omni_config.EnvironmentVariableSource(macrocase(app_name), separator="__")
+    ]
+    if not arg_parse:
+        from prosper_shared.omni_config._stats import _phase  # noqa: autoimport
+
+        with _phase("argparse"):
+            arg_parse = omni_config.arg_parse_from_schema(
+                config_schemata, input_schemata, app_name
+            )
+    conf_sources.append(omni_config.ArgParseSource(arg_parse))
+
+    return conf_sources
+
+
+def _get_path(config_dict: Optional[dict], key: str) -> object:
+    """Walks the '.' separated key path directly, only falling back to `dpath` for glob expressions.
+
+    Segments match keys and indices the way `dpath` matches them, so int and bool keys are found by their value, e.g.
+    `1` for `{1: ...}`, bool keys also by name, and list items by negative indices, too.
+    """
+    if _GLOB_CHARACTERS.intersection(key):
+        import dpath  # noqa: autoimport
+
+        return dpath.get(config_dict, key, separator=".", default=None)
+
+    if not key:
+        return config_dict
+
+    value = config_dict
+    for segment in key.lstrip(".").split("."):
+        value = _get_child(value, segment)
+        if value is _MISSING:
+            return None
+    return value
+
+
+def _get_child(node: Any, segment: str) -> Any:
+    """Looks a single path segment up in the node, returning `_MISSING` if it doesn't match any key or index."""
+    if isinstance(node, dict):
+        child = node.get(segment, _MISSING)
+        return _get_non_string_key(node, segment) if child is _MISSING else child
+    if isinstance(node, (list, tuple)):
+        index = _to_index(segment)
+        if index is not None and -len(node) <= index < len(node):
+            return node[index]
+    return _MISSING
+
+
+def _get_non_string_key(node: dict, segment: str) -> Any:
+    """Matches the segment to the int or bool keys of the node, like `dpath` does."""
+    number = _to_index(segment)
+    if number is not None:
+        # Bool keys equal 0 and 1, so they're found by their value as well.
+        return node.get(number, _MISSING)
+    if segment in ("True", "False"):
+        wanted = segment == "True"
+        return next((child for key, child in node.items() if key is wanted), _MISSING)
+    return _MISSING
+
+
+def _to_index(segment: str) -> Optional[int]:
+    try:
+        return int(segment)
+    except ValueError:
+        return None
+
+
+def _replace_path(tree: Any, path: Sequence[str], value: Any = _REMOVED) -> Any:
+    """Returns a copy of the tree with the value at the given path replaced or removed.
+
+    Only the dicts and lists along the path are copied, so readers holding the original tree are never affected. Path
+    segments within lists are item indices, like in lookups.
+    """
+    if not path:
+        return value
+
+    key, rest = path[0], path[1:]
+    index = _to_index(key) if isinstance(tree, list) else None
+    if index is not None:
+        return _replace_item(tree, index, rest, value)
+
+    replaced = dict(tree) if isinstance(tree, dict) else {}
+    if rest:
+        replaced[key] = _replace_path(replaced.get(key), rest, value)
+    elif value is _REMOVED:
+        replaced.pop(key, None)
+    else:
+        replaced[key] = value
+    return replaced
+
+
+def _replace_item(items: list, index: int, rest: Sequence[str], value: Any) -> list:
+    """Returns a copy of the list with the value at the given index, and path within the item, replaced or removed."""
+    if index < -len(items) or (index >= len(items) and value is _REMOVED):
+        # There's no item at the index to remove or to replace before the start of the list.
+        return items
+
+    replaced = list(items)
+    if index >= len(replaced):
+        # Like `dpath`, setting an item past the end pads the list with None.
+        replaced.extend([None] * (index + 1 - len(replaced)))
+    if rest:
+        replaced[index] = _replace_path(replaced[index], rest, value)
+    elif value is _REMOVED:
+        del replaced[index]
+    else:
+        replaced[index] = value
+    return replaced
+
+
+def _has_yaml():
+    """Tests whether a YAML parser backend is available."""
+    from prosper_shared.omni_config._backend import (  # noqa: autoimport
+        _has_parser_backend,
+    )
+
+    return _has_parser_backend("yaml")
+
+
+def _has_toml():
+    """Tests whether a TOML parser backend is available."""
+    from prosper_shared.omni_config._backend import (  # noqa: autoimport
+        _has_parser_backend,
+    )
+
+    return _has_parser_backend("toml")
+
+
+def get_config_help():
+    """Returns a JSON string representing the config values available.
+
+    Returns
+        str: JSON string representing the available config values.
+    """
+    import toml  # noqa: autoimport
+    import yaml  # noqa: autoimport
+
+    merge_config = omni_config.merge_config
+    config_schemata = merge_config(omni_config._realize_config_schemata())
+    input_schemata = merge_config(omni_config._realize_input_schemata())
+    schema = merge_config([config_schemata, input_schemata])
+    help_struct = _build_help_struct(schema)
+
+    return toml.dumps(help_struct)
+
+
+def _build_help_struct(
+    schema: "SchemaType", path: Optional[str] = None, help_struct=None
+):
+    from schema import Optional as SchemaOptional  # noqa: autoimport
+    from schema import Regex  # noqa: autoimport
+
+    from prosper_shared.omni_config._define import _ConfigKey  # noqa: autoimport
+
+    if help_struct is None:
+        help_struct = {}
+    if path is None:
+        path = ""
+    for k, v in schema.items():
+        is_optional = False
+        description = None
+        constraint = None
+        default = None
+        while isinstance(k, (_ConfigKey, SchemaOptional)):
+            if isinstance(k, SchemaOptional):
+                is_optional = True
+            description = k.description if hasattr(k, "description") else description
+            default = k.default if hasattr(k, "default") else default
+            k = k.schema
+
+        if isinstance(v, dict):
+            _build_help_struct(v, f"{path}.{k}" if path else k, help_struct)
+        else:
+            if not description:
+                raise ValueError(f"No description provided for leaf config key {k}")
+            if isinstance(v, Regex):
+                type_name = "str"
+                constraint = v.pattern_str
+            elif callable(v):
+                type_name = v.__name__
+            else:
+                raise ValueError(f"Invalid config value type: {type(v)}")
+            key = f"{path}.{k}"
+            help_struct[key] = {"type": type_name, "optional": is_optional}
+            if default:
+                help_struct[key]["default"] = default
+            if constraint:
+                help_struct[key]["constraint"] = constraint
+            if description:
+                help_struct[key]["description"] = description
+
+    return help_struct
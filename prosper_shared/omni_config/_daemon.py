@@ -0,0 +1,418 @@
+"""Contains a local daemon that resolves the config once per host and pushes every change to the subscribed processes.
+
+The daemon and its subscribers talk over a Unix domain socket using newline-delimited JSON messages. Each message holds
+the new config version, the paths the version removed, and the (path, value) pairs it set. The first message sent to a
+subscriber sets the empty path, i.e. the whole config; every later message only holds the values that changed.
+
+Values JSON can't represent as they are, e.g. tuples, dicts with non-string keys, or TOML dates, are sent as objects
+tagged with their `$type`, so subscribers receive the same types a local autoconfig would hold. Values without a JSON
+representation of their own are pickled, so only subscribe to daemons run by a trusted user.
+
+Run the daemon with `python -m prosper_shared.omni_config._daemon APP_NAME SOCKET_PATH`.
+"""
+
+import argparse
+import base64
+import json
+import logging
+import os
+import pickle
+import selectors
+import socket
+import threading
+import time
+from importlib import import_module
+from typing import Dict, List, Optional, Sequence
+
+from prosper_shared.omni_config._config import (
+    Config,
+    _discover_sources,
+    _realize_schema,
+    _replace_path,
+    _resolve_sources,
+)
+from prosper_shared.omni_config._merge import _Changes, _diff_config
+from prosper_shared.omni_config._reference import (
+    _FileReference,
+    _load_file_references,
+)
+from prosper_shared.omni_config._snapshot import _fingerprint_sources
+
+logger = logging.getLogger(__name__)
+
+
+_TYPE_KEY = "$type"
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+# Subscribers that fall further behind than this are dropped rather than buffering every later version for them.
+_MAX_PENDING_BYTES = 64 * 1024 * 1024
+
+
+def _encode_value(value: object) -> object:
+    """Converts the value to its JSON representation, tagging the values JSON would lose the type of."""
+    # Sidecar file references are sent as declared, so that subscribers only load them on first access too.
+    if isinstance(value, _FileReference):
+        return value.declaration
+    if type(value) in _JSON_SCALARS:
+        return value
+    if type(value) is list:
+        return [_encode_value(item) for item in value]
+    if type(value) is dict:
+        if all(type(key) is str for key in value) and _TYPE_KEY not in value:
+            return {key: _encode_value(item) for key, item in value.items()}
+        return {
+            _TYPE_KEY: "dict",
+            "items": [[_encode_value(k), _encode_value(v)] for k, v in value.items()],
+        }
+    if type(value) is tuple:
+        return {_TYPE_KEY: "tuple", "items": [_encode_value(item) for item in value]}
+    return {
+        _TYPE_KEY: "pickle",
+        "data": base64.b64encode(pickle.dumps(value)).decode("ascii"),
+    }
+
+
+def _decode_value(value: object) -> object:
+    """Restores the value encoded by `_encode_value`."""
+    if isinstance(value, list):
+        return [_decode_value(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    value_type = value.get(_TYPE_KEY)
+    if value_type == "dict":
+        return {_decode_value(k): _decode_value(v) for k, v in value["items"]}
+    if value_type == "tuple":
+        return tuple(_decode_value(item) for item in value["items"])
+    if value_type == "pickle":
+        return pickle.loads(base64.b64decode(value["data"]))
+    return {key: _decode_value(item) for key, item in value.items()}
+
+
+def _encode_message(version: int, changes: _Changes) -> bytes:
+    changed, removed = changes
+    return (
+        json.dumps(
+            {
+                "version": version,
+                "unset": [_encode_value(path) for path in removed],
+                "set": [
+                    [_encode_value(path), _encode_value(value)]
+                    for path, value in changed
+                ],
+            }
+        ).encode()
+        + b"\n"
+    )
+
+
+class _ConfigDaemon:
+    """Resolves the config from the default sources and publishes each new version to its subscribers."""
+
+    def __init__(
+        self,
+        socket_path: str,
+        app_name: str,
+        validate: bool = False,
+        search_equivalent_names: bool = True,
+        poll_interval: float = 1.0,
+    ):
+        """Creates a ConfigDaemon instance.
+
+        Args:
+            socket_path (str): The path of the Unix domain socket to listen on.
+            app_name (str): The app name used to discover the configuration sources, like in `Config.autoconfig`.
+            validate (bool): Whether to validate each version of the config before publishing it.
+            search_equivalent_names (bool): Whether equivalent names to the given app name should be included in the
+                config location search.
+            poll_interval (float): How often to check the sources for changes, in seconds.
+        """
+        config_schemata, input_schemata, self._schema = _realize_schema()
+        # Command-line arguments belong to each subscribing process, so the trailing argparse source is left out.
+        self._sources = _discover_sources(
+            app_name,
+            config_schemata,
+            input_schemata,
+            self._schema,
+            None,
+            search_equivalent_names,
+        )[:-1]
+        self._socket_path = socket_path
+        self._validate = validate
+        self._poll_interval = poll_interval
+        self._version = 0
+        self._config_dict: Optional[dict] = None
+        self._fingerprints: Optional[List[str]] = None
+        # The bytes still to be sent to each subscriber, which are sent as its socket becomes writable.
+        self._subscribers: Dict[socket.socket, bytearray] = {}
+        self._selector = selectors.DefaultSelector()
+        self._stopped = threading.Event()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def refresh(self) -> bool:
+        """Resolves the config again if any source changed, and publishes the values that changed.
+
+        Returns:
+            bool: Whether a new version was published.
+        """
+        # The first source holds the schema defaults, which never change.
+        fingerprints = _fingerprint_sources(self._sources[1:])
+        if fingerprints is not None and fingerprints == self._fingerprints:
+            return False
+        self._fingerprints = fingerprints
+
+        # Resolved like in `Config.autoconfig`, so lazy values, e.g. sidecar file references, are validated the same way.
+        config_dict = _resolve_sources(self._sources, self._schema, self._validate)
+
+        if self._config_dict is None:
+            changes = ([([], config_dict)], [])
+        else:
+            changes = _diff_config(self._config_dict, config_dict)
+            if not any(changes):
+                return False
+
+        self._config_dict = config_dict
+        self._version += 1
+        logger.debug(f"Publishing config version {self._version}")
+
+        message = _encode_message(self._version, changes)
+        for subscriber in list(self._subscribers):
+            self._send(subscriber, message)
+        return True
+
+    def serve_forever(self) -> None:
+        """Listens for subscribers and polls the sources for changes until `shutdown` is called."""
+        if os.path.exists(self._socket_path):
+            os.unlink(self._socket_path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            server.bind(self._socket_path)
+            server.listen()
+            logger.debug(f"Serving config on {self._socket_path}")
+
+            self._selector.register(server, selectors.EVENT_READ)
+            next_poll = time.monotonic()
+            while not self._stopped.is_set():
+                if time.monotonic() >= next_poll:
+                    self.refresh()
+                    next_poll = time.monotonic() + self._poll_interval
+
+                for key, events in self._selector.select(next_poll - time.monotonic()):
+                    if key.fileobj is server:
+                        self._subscribe(server.accept()[0])
+                    elif events & selectors.EVENT_READ:
+                        # Subscribers never send anything, so a readable subscriber has disconnected.
+                        self._disconnect(key.fileobj)
+                    else:
+                        self._flush(key.fileobj)
+        finally:
+            for subscriber in list(self._subscribers):
+                self._disconnect(subscriber)
+            self._selector.close()
+            server.close()
+            os.unlink(self._socket_path)
+
+    def shutdown(self) -> None:
+        """Stops `serve_forever` within one poll interval."""
+        self._stopped.set()
+
+    def _subscribe(self, subscriber: socket.socket) -> None:
+        # Subscribers are sent to without blocking, so a stalled subscriber never holds up the others.
+        subscriber.setblocking(False)
+        self._subscribers[subscriber] = bytearray()
+        self._selector.register(subscriber, selectors.EVENT_READ)
+        self._send(
+            subscriber,
+            _encode_message(self._version, ([([], self._config_dict)], [])),
+        )
+
+    def _send(self, subscriber: socket.socket, message: bytes) -> None:
+        self._subscribers[subscriber] += message
+        self._flush(subscriber)
+
+    def _flush(self, subscriber: socket.socket) -> None:
+        pending = self._subscribers[subscriber]
+        try:
+            del pending[: subscriber.send(pending)]
+        except BlockingIOError:
+            pass
+        except OSError as e:
+            logger.debug(f"Dropping config subscriber: {e}")
+            self._disconnect(subscriber)
+            return
+
+        if len(pending) > _MAX_PENDING_BYTES:
+            logger.debug("Dropping config subscriber that stopped receiving")
+            self._disconnect(subscriber)
+            return
+        # The rest is sent once the subscriber is writable again.
+        self._selector.modify(
+            subscriber,
+            selectors.EVENT_READ | (selectors.EVENT_WRITE if pending else 0),
+        )
+
+    def _disconnect(self, subscriber: socket.socket) -> None:
+        del self._subscribers[subscriber]
+        self._selector.unregister(subscriber)
+        subscriber.close()
+
+
+class _SubscribedConfig(Config):
+    """A read-only Config kept up to date by a config daemon."""
+
+    def __init__(
+        self, socket_path: str, timeout: float = 5.0, interpolate: bool = False
+    ):
+        """Subscribes to the config daemon listening on the given socket, and waits for the current config.
+
+        Args:
+            socket_path (str): The path of the daemon's Unix domain socket.
+            timeout (float): How long to wait for the daemon to come up and send the current config, in seconds.
+            interpolate (bool): Whether to resolve `${...}` references to other config values.
+
+        Raises:
+            OSError: If the daemon didn't accept the subscription within the timeout.
+            ValueError: If interpolation is enabled and the current config holds a circular reference.
+        """
+        super().__init__()
+        self._version = 0
+        self._version_changed = threading.Condition()
+
+        deadline = time.monotonic() + timeout
+        while True:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                self._socket.connect(socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                self._socket.close()
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+
+        self._socket.settimeout(max(deadline - time.monotonic(), 0.001))
+        self._messages = self._socket.makefile("rb")
+        self._apply(self._messages.readline())
+        self._socket.settimeout(None)
+        if interpolate:
+            # Later versions only invalidate the resolved values depending on what they changed.
+            self._enable_interpolation()
+
+        self._listener = threading.Thread(
+            target=self._listen, name=f"config-subscriber-{socket_path}", daemon=True
+        )
+        self._listener.start()
+
+    @property
+    def version(self) -> int:
+        """The version of the config last received from the daemon."""
+        return self._version
+
+    def wait_for_version(self, version: int, timeout: Optional[float] = None) -> bool:
+        """Waits until the daemon has published at least the given config version.
+
+        Args:
+            version (int): The version to wait for.
+            timeout (Optional[float]): How long to wait, in seconds; waits indefinitely if omitted.
+
+        Returns:
+            bool: Whether the version was received within the timeout.
+        """
+        with self._version_changed:
+            return self._version_changed.wait_for(
+                lambda: self._version >= version, timeout
+            )
+
+    def __reduce_ex__(self, protocol):
+        from prosper_shared.omni_config._transfer import (  # noqa: autoimport
+            _reduce_config,
+        )
+
+        # Other processes receive the current version as a plain config, since the subscription can't be shared.
+        return _reduce_config(self, protocol, Config)
+
+    def close(self) -> None:
+        """Unsubscribes from the daemon, keeping the last received config."""
+        self._socket.shutdown(socket.SHUT_RDWR)
+        self._listener.join()
+        self._messages.close()
+        self._socket.close()
+
+    def _listen(self) -> None:
+        for message in self._messages:
+            self._apply(message)
+        logger.debug(f"Config daemon disconnected; keeping version {self._version}")
+
+    def _apply(self, message: bytes) -> None:
+        decoded = json.loads(message)
+        config_dict = self._config_dict
+        for path in decoded["unset"]:
+            config_dict = _replace_path(config_dict, _decode_value(path))
+        for path, value in decoded["set"]:
+            # File references are sent with absolute paths, so they don't depend on the base directory.
+            config_dict = _replace_path(
+                config_dict,
+                _decode_value(path),
+                _load_file_references(_decode_value(value), ""),
+            )
+
+        # Readers keep using the previous tree until it's swapped out here, so they never see a partial update.
+        with self._version_changed:
+            self._config_dict = config_dict
+            self._version = decoded["version"]
+            self._version_changed.notify_all()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Runs a config daemon until it's interrupted.
+
+    Args:
+        argv (Optional[Sequence[str]]): The command-line arguments; defaults to `sys.argv`.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m prosper_shared.omni_config._daemon",
+        description="Resolves an app's config once and publishes every change to the subscribed processes.",
+    )
+    parser.add_argument("app_name", help="The app name used to discover the config.")
+    parser.add_argument("socket_path", help="The Unix domain socket to listen on.")
+    parser.add_argument(
+        "--module",
+        action="append",
+        default=[],
+        help="A module to import before resolving the config, e.g. to register its schema. Can be repeated.",
+    )
+    parser.add_argument("--validate", action="store_true", help="Validate the config.")
+    parser.add_argument(
+        "--exact-name",
+        action="store_true",
+        help="Don't search for config locations with equivalent app names.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="How often to check the sources for changes, in seconds.",
+    )
+    args = parser.parse_args(argv)
+
+    for module in args.module:
+        import_module(module)
+
+    daemon = _ConfigDaemon(
+        args.socket_path,
+        args.app_name,
+        validate=args.validate,
+        search_equivalent_names=not args.exact_name,
+        poll_interval=args.poll_interval,
+    )
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
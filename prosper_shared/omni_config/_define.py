@@ -94,7 +94,7 @@ _config_registry = []
 
 
 def _config_schema(
-    raw_schema_func: Callable[[], _SchemaType]
+    raw_schema_func: Callable[[], _SchemaType],
 ) -> Callable[[], _SchemaType]:
     _config_registry.append(raw_schema_func)
     return raw_schema_func
@@ -113,7 +113,7 @@ _input_registry = []
 
 
 def _input_schema(
-    raw_schema_func: Callable[[], _InputType]
+    raw_schema_func: Callable[[], _InputType],
 ) -> Callable[[], _InputType]:
     _input_registry.append(raw_schema_func)
     return raw_schema_func
@@ -191,11 +191,60 @@ def _key_to_enum_validator(enum):
     return key_to_enum
 
 
+_resolved_type_cache: Dict[str, type] = {}
+_type_resolution_deferred = False
+
+
+def _resolve_type(type_reference: str) -> type:
+    """Resolves a dotted type reference like `package.module.Class` into the referenced class.
+
+    Resolved references are cached for the life of the process, so each module is imported and searched at most once.
+
+    Args:
+        type_reference (str): The fully-qualified dotted path to the class.
+
+    Returns:
+        type: The referenced class.
+    """
+    resolved_type = _resolved_type_cache.get(type_reference)
+    if resolved_type is None:
+        module_name, _, class_name = type_reference.rpartition(".")
+        resolved_type = getattr(import_module(module_name), class_name)
+        _resolved_type_cache[type_reference] = resolved_type
+    return resolved_type
+
+
+def _defer_type_resolution(deferred: bool = True) -> None:
+    """Controls whether type references are imported during validation or only when first read.
+
+    When deferred, validation only checks that the value is a well-formed dotted path, and the referenced module is
+    imported the first time the value is read with `Config.get_as_type`.
+
+    Args:
+        deferred (bool): Whether type resolution should be deferred until first read.
+    """
+    global _type_resolution_deferred
+    _type_resolution_deferred = deferred
+
+
+def _is_type_reference(key: str) -> bool:
+    module_name, _, class_name = key.rpartition(".")
+    return bool(module_name) and all(
+        part.isidentifier() for part in [*module_name.split("."), class_name]
+    )
+
+
 def _key_to_type_validator(in_type):
     def key_to_type(key):
+        if _type_resolution_deferred:
+            if not isinstance(key, str) or not _is_type_reference(key):
+                raise TypeError(
+                    f"Unrecognized type reference for type {in_type}: {key}"
+                )
+            return key
+
         try:
-            module_name, _, class_name = key.rpartition(".")
-            getattr(import_module(module_name), class_name)
+            _resolve_type(key)
             return key
         except Exception as e:
             raise TypeError(f"Unrecognized type reference for type {in_type}: {key}", e)
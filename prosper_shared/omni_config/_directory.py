@@ -0,0 +1,160 @@
+"""Contains a configuration source that reads every config fragment in a directory, e.g. a `config.d` directory.
+
+Fragments are JSON, YAML, or TOML files, recognized by extension, and merged in lexical order of their file names, so
+`20-overrides.yaml` overrides `10-defaults.json`. Each parsed fragment is cached along with its modification time and
+size; reading the directory again only parses the fragments added or changed since, in parallel.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from fnmatch import fnmatchcase
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from prosper_shared.omni_config._backend import _has_parser_backend
+from prosper_shared.omni_config._merge import _merge_config
+from prosper_shared.omni_config._parse import (
+    _ConfigurationSource,
+    _FileConfigurationSource,
+    _JsonConfigurationSource,
+    _TomlConfigurationSource,
+    _YamlConfigurationSource,
+)
+
+logger = logging.getLogger(__name__)
+
+_FRAGMENT_SOURCES = {
+    ".json": _JsonConfigurationSource,
+    ".yaml": _YamlConfigurationSource,
+    ".yml": _YamlConfigurationSource,
+    ".toml": _TomlConfigurationSource,
+}
+
+
+class _Fragment(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+
+
+class _DirectoryConfigurationSource(_ConfigurationSource):
+    """Configuration source that merges the config fragments found in a directory."""
+
+    def __init__(
+        self,
+        directory_path: str,
+        pattern: str = "*",
+        config_root: str = "",
+        inject_at: Optional[str] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Creates a new DirectoryConfigurationSource instance.
+
+        Arguments:
+            directory_path (str): The path to the directory holding the fragments.
+            pattern (str): The glob pattern the fragment file names must match, e.g. `*.yaml`.
+            config_root (str): The '.' separated path to the table holding the config in each fragment.
+            inject_at (str): The '.' separated path at which to place the config in the returned dict.
+            max_workers (Optional[int]): How many fragments to parse at once. Defaults to the `ThreadPoolExecutor`
+                default.
+        """
+        self._directory_path = directory_path
+        self._pattern = pattern
+        self._config_root = config_root
+        self._inject_at = inject_at
+        self._max_workers = max_workers
+        self._parsed: Dict[str, Tuple[_Fragment, dict]] = {}
+        self._lock = threading.Lock()
+
+    def read(self) -> dict:
+        """Reads the fragments, parsing only the ones that changed since the last read, and merges them.
+
+        Returns:
+            dict: The configuration values.
+        """
+        fragments = self._scan()
+
+        with self._lock:
+            changed = [
+                f
+                for f in fragments
+                if f.path not in self._parsed or self._parsed[f.path][0] != f
+            ]
+            if len(changed) > 1:
+                with ThreadPoolExecutor(self._max_workers) as executor:
+                    # Each fragment is parsed in a copy of the current context, so the autoconfig stats and discovery
+                    # cache active in it apply to the parsing threads.
+                    futures = [
+                        executor.submit(copy_context().run, self._parse_fragment, f)
+                        for f in changed
+                    ]
+                    configs = [future.result() for future in futures]
+            else:
+                configs = [self._parse_fragment(f) for f in changed]
+
+            # Fragments removed since the last read are dropped from the cache.
+            unchanged = set(fragments).difference(changed)
+            parsed = {f.path: self._parsed[f.path] for f in unchanged}
+            parsed.update((f.path, (f, c)) for f, c in zip(changed, configs))
+            self._parsed = parsed
+
+            return _merge_config([parsed[f.path][1] for f in fragments])
+
+    def fingerprint(self) -> Optional[str]:
+        """Identifies the directory by path and by the names, modification times, and sizes of its fragments.
+
+        Returns:
+            Optional[str]: The directory fingerprint.
+        """
+        fragments = self._scan()
+        if fragments:
+            directory_state = hashlib.sha256(
+                "\n".join(f"{f.path}:{f.mtime_ns}:{f.size}" for f in fragments).encode()
+            ).hexdigest()
+        else:
+            directory_state = "absent"
+
+        return f"{type(self).__name__}:{self._directory_path}:{self._pattern}:{self._config_root}:{self._inject_at}:{directory_state}"
+
+    def _scan(self) -> List[_Fragment]:
+        fragments = []
+        try:
+            with os.scandir(self._directory_path) as entries:
+                for entry in entries:
+                    extension = os.path.splitext(entry.name)[1].lower()
+                    if (
+                        entry.name.startswith(".")
+                        or extension not in _FRAGMENT_SOURCES
+                        or not fnmatchcase(entry.name, self._pattern)
+                        or not entry.is_file()
+                    ):
+                        continue
+                    if not _has_parser_backend(
+                        _FRAGMENT_SOURCES[extension]._file_format
+                    ):
+                        logger.warning(
+                            f"No parser backend is installed for {entry.path}; skipping..."
+                        )
+                        continue
+
+                    stat = entry.stat()
+                    fragments.append(
+                        _Fragment(entry.path, stat.st_mtime_ns, stat.st_size)
+                    )
+        except FileNotFoundError:
+            logger.debug(
+                f"Config directory not found: {self._directory_path}; skipping..."
+            )
+
+        # The fragments share the directory, so sorting by path sorts them by file name.
+        return sorted(fragments)
+
+    def _parse_fragment(self, fragment: _Fragment) -> dict:
+        extension = os.path.splitext(fragment.path)[1].lower()
+        source: _FileConfigurationSource = _FRAGMENT_SOURCES[extension](
+            fragment.path, self._config_root, self._inject_at
+        )
+        return source.read()
@@ -0,0 +1,74 @@
+"""Contains a cache sharing the discovery work between several `Config.autoconfig` calls, e.g. by `autoconfig_many`.
+
+While a cache is active in the current context, autoconfig calls share the realized schema, a single snapshot of the
+environment variables, the parsed command-line arguments of each argument parser, the directory listings searched for
+profiles, and the parsed content of each config file. Files are keyed by path, modification time, and size, so a file
+shared between apps, like `.pyproject.toml`, is only parsed once. The cache is dropped when the batch ends, so later
+reads, e.g. when switching profiles, see the current state of every source again.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, TypeVar
+
+_T = TypeVar("_T")
+
+_active_cache: ContextVar[Optional["_DiscoveryCache"]] = ContextVar(
+    "omni_config_discovery_cache", default=None
+)
+
+
+class _DiscoveryCache:
+    """Holds the intermediate results of the autoconfig calls made while the cache is active."""
+
+    def __init__(self):
+        """Creates an empty DiscoveryCache instance."""
+        self._results: Dict[Hashable, Any] = {}
+
+    def memoize(self, key: Hashable, compute: Callable[[], _T]) -> _T:
+        """Computes the result for the given key on the first call, and returns the same result on every later call.
+
+        Args:
+            key (Hashable): Identifies the result.
+            compute (Callable[[], _T]): Computes the result.
+
+        Returns:
+            _T: The result, which callers must not modify.
+        """
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+
+def _memoize(key: Hashable, compute: Callable[[], _T]) -> _T:
+    """Computes the result through the active discovery cache, if any.
+
+    Args:
+        key (Hashable): Identifies the result.
+        compute (Callable[[], _T]): Computes the result.
+
+    Returns:
+        _T: The result, which callers must not modify if a cache is active.
+    """
+    cache = _active_cache.get()
+    return compute() if cache is None else cache.memoize(key, compute)
+
+
+@contextmanager
+def _shared_discovery() -> Iterator[_DiscoveryCache]:
+    """Activates a discovery cache for the current context, or reuses the active one.
+
+    Yields:
+        _DiscoveryCache: The active cache.
+    """
+    cache = _active_cache.get()
+    if cache is not None:
+        yield cache
+        return
+
+    cache = _DiscoveryCache()
+    token = _active_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _active_cache.reset(token)
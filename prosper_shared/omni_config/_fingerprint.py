@@ -0,0 +1,93 @@
+"""Contains utility methods for computing structural fingerprints of config trees.
+
+A fingerprint only depends on the content of a tree: dict entries are combined in a canonical order, and every value
+is identified by its type and representation, so equal trees have equal fingerprints in every process.
+
+Fingerprints are computed incrementally. Each call returns a digest tree mirroring the config tree, and passing it to
+the next call reuses the digests of every subtree that is still the same object, so hashing a new version that shares
+its unchanged subtrees with the previous one, like the versions published by a config daemon, only hashes the changed
+paths. A reused digest is stale if its subtree was modified in place in the meantime, which is why the values returned
+by `Config.get` must not be modified in place.
+"""
+
+from hashlib import blake2b
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+# A config value, its digest, and the digest trees of its items, if it's a dict or a list.
+_DigestTree = Tuple[
+    Any, bytes, Union[Dict[Any, "_DigestTree"], List["_DigestTree"], None]
+]
+
+_DIGEST_SIZE = 16
+
+
+def _digest_value(value: Any) -> bytes:
+    value_type = type(value)
+    return blake2b(
+        f"{value_type.__module__}.{value_type.__qualname__}:{value!r}".encode(),
+        digest_size=_DIGEST_SIZE,
+    ).digest()
+
+
+def _fingerprint_tree(tree: Any, previous: Optional[_DigestTree] = None) -> _DigestTree:
+    """Computes the digest tree of the given config tree.
+
+    Args:
+        tree (Any): The config tree.
+        previous (Optional[_DigestTree]): The digest tree of a previous version of the config tree.
+
+    Returns:
+        _DigestTree: The digest tree, whose digest is the fingerprint of the whole config tree.
+    """
+    if previous is not None and previous[0] is tree:
+        return previous
+
+    if isinstance(tree, dict):
+        previous_items = (
+            previous[2] if previous and isinstance(previous[2], dict) else {}
+        )
+        items = {
+            key: _fingerprint_tree(value, previous_items.get(key))
+            for key, value in tree.items()
+        }
+        digest = blake2b(b"M", digest_size=_DIGEST_SIZE)
+        for key_digest, value_digest in sorted(
+            (_digest_value(key), item[1]) for key, item in items.items()
+        ):
+            digest.update(key_digest)
+            digest.update(value_digest)
+        return tree, digest.digest(), items
+
+    if isinstance(tree, list):
+        previous_items = (
+            previous[2] if previous and isinstance(previous[2], list) else []
+        )
+        items = [
+            _fingerprint_tree(
+                value, previous_items[i] if i < len(previous_items) else None
+            )
+            for i, value in enumerate(tree)
+        ]
+        digest = blake2b(b"L", digest_size=_DIGEST_SIZE)
+        for item in items:
+            digest.update(item[1])
+        return tree, digest.digest(), items
+
+    return tree, _digest_value(tree), None
+
+
+def _fingerprint_config(digest_tree: _DigestTree, **settings: Any) -> str:
+    """Computes the fingerprint of a config from its digest tree and the settings changing how its values are resolved.
+
+    Args:
+        digest_tree (_DigestTree): The digest tree of the config tree, computed by `_fingerprint_tree`.
+        **settings (Any): The settings, e.g. whether interpolation is enabled, as JSON-like values.
+
+    Returns:
+        str: The hex digest identifying the config.
+    """
+    digest = blake2b(digest_tree[1], digest_size=_DIGEST_SIZE)
+    for name, value in sorted(settings.items()):
+        digest.update(_digest_value(name))
+        digest.update(_fingerprint_tree(value)[1])
+    return digest.hexdigest()
@@ -0,0 +1,106 @@
+"""Contains the immutable Config created by `Config.freeze`, which can be hashed and used as a cache key.
+
+A frozen config owns a private copy of the config tree. `get` returns the dicts within it as read-only
+`MappingProxyType` instances and the lists as tuples, so nothing outside the config can modify the tree in place, and
+the fingerprint computed on first use stays valid for the lifetime of the config.
+"""
+
+from copy import deepcopy
+from functools import cached_property
+from types import MappingProxyType
+from typing import Any, Dict, Optional
+
+from prosper_shared.omni_config._config import Config, _ConfigView
+
+
+def _freeze_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType(
+            {key: _freeze_value(item) for key, item in value.items()}
+        )
+    if isinstance(value, list):
+        return tuple(_freeze_value(item) for item in value)
+    return value
+
+
+def _freeze_config(config: Config) -> Config:
+    """Creates a frozen copy of the config, holding its current values.
+
+    Args:
+        config (Config): The config to freeze.
+
+    Returns:
+        Config: The frozen config.
+
+    Raises:
+        ValueError: If the config has lazy sources.
+    """
+    if isinstance(config, _ConfigView):
+        # Views keep looking values up through their parent, so the parent is frozen instead.
+        return _freeze_config(config._parent).view(config._prefix)
+    if config._lazy_sources:
+        raise ValueError(
+            "Configs with lazy sources can't be frozen, since their values can change at any time"
+        )
+
+    frozen_config = _FrozenConfig._wrap(
+        deepcopy(config._config_dict), config._interpolator is not None
+    )
+    # The selected profile changes how the values were resolved, so it's kept as part of the config's identity.
+    frozen_config._profile = config._profile
+    return frozen_config
+
+
+class _FrozenConfig(Config):
+    """An immutable Config, which is hashable and compared by content."""
+
+    # The frozen values already returned by `get`, by key.
+    _frozen_values: Optional[Dict[str, Any]] = None
+
+    def get(self, key: str) -> object:
+        """Get the specified config value, with dicts returned as read-only mappings and lists returned as tuples.
+
+        Args:
+            key (str): The '.' separated path to the config value.
+
+        Returns:
+            object: The stored config value for the given key, or None if it doesn't exist.
+
+        Raises:
+            ValueError: If interpolation is enabled and a reference within the value can't be resolved.
+        """
+        # Overridden values only apply to the current context, so they're frozen on every lookup.
+        if self._overlays is not None and self._overlays.get():
+            return _freeze_value(super().get(key))
+
+        if self._frozen_values is None:
+            self._frozen_values = {}
+        if key not in self._frozen_values:
+            self._frozen_values[key] = _freeze_value(super().get(key))
+        elif self._access_recorder is not None:
+            self._access_recorder.record(key)
+        return self._frozen_values[key]
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """A digest identifying the config, computed once since the config tree never changes.
+
+        Returns:
+            str: The hex digest of the config values and the settings they're resolved with.
+        """
+        return super().fingerprint
+
+    def __eq__(self, other: object) -> bool:
+        """Compares the frozen configs by fingerprint."""
+        if not isinstance(other, _FrozenConfig):
+            return NotImplemented
+
+        return self.fingerprint == other.fingerprint
+
+    def __hash__(self) -> int:
+        """Hashes the config by fingerprint, so it can be used as a cache key."""
+        return hash(self.fingerprint)
+
+    def freeze(self) -> "Config":
+        """Returns the config itself, since it's already frozen."""
+        return self
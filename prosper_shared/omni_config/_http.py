@@ -0,0 +1,283 @@
+"""Contains a configuration source that reads a JSON config from an HTTP config service.
+
+The source keeps a single persistent connection to the service, and revalidates its copy of the config with conditional
+requests (`If-None-Match`/`If-Modified-Since`), so polling an unchanged config costs an empty `304 Not Modified`
+response. The last good payload is stored on disk along with its validators. Once the copy is older than `max_age`,
+`read` keeps returning it while a background thread revalidates it; a new process serves the copy stored on disk the
+same way, and only the very first read, without any copy, waits for the service.
+"""
+
+import hashlib
+import http.client
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+import platformdirs
+
+from prosper_shared.omni_config._backend import _select_parser_backend
+from prosper_shared.omni_config._parse import _ConfigurationSource
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_AGE = 30.0
+_DEFAULT_TIMEOUT = 5.0
+
+# Raised when the service closed a kept-alive connection between two requests.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    BrokenPipeError,
+    ConnectionResetError,
+)
+
+
+class _Payload(NamedTuple):
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class _HttpConfigurationSource(_ConfigurationSource):
+    """Configuration source that reads a JSON config from an HTTP config service."""
+
+    def __init__(
+        self,
+        url: str,
+        cache_path: Optional[str] = None,
+        max_age: float = _DEFAULT_MAX_AGE,
+        timeout: float = _DEFAULT_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+        parser_backend: Optional[str] = None,
+    ):
+        """Creates a new HttpConfigurationSource instance.
+
+        Arguments:
+            url (str): The `http` or `https` URL of the config.
+            cache_path (Optional[str]): The file to store the last good payload in. Defaults to a file named after the
+                URL in the user cache directory.
+            max_age (float): How many seconds a payload is served without revalidating it.
+            timeout (float): How many seconds to wait for the service.
+            headers (Optional[Dict[str, str]]): Additional headers to send, e.g. `Authorization`.
+            parser_backend (Optional[str]): The name of the JSON parser backend to use instead of the fastest
+                available one.
+
+        Raises:
+            ValueError: If the URL isn't an `http` or `https` URL.
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"Expected an http or https URL; got {url}")
+
+        self._url = url
+        self._scheme = parts.scheme
+        self._netloc = parts.netloc
+        self._path = (
+            f"{parts.path or '/'}?{parts.query}" if parts.query else parts.path or "/"
+        )
+        self._cache_path = cache_path or os.path.join(
+            platformdirs.user_cache_dir("omni-config"),
+            f"{hashlib.sha256(url.encode()).hexdigest()}.json",
+        )
+        self._max_age = max_age
+        self._timeout = timeout
+        self._headers = headers or {}
+        self._parser_backend = parser_backend
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._connection_lock = threading.Lock()
+        self._payload: Optional[_Payload] = None
+        self._payload_lock = threading.Lock()
+        self._parsed: Optional[Tuple[str, dict]] = None
+        self._revalidation: Optional[threading.Thread] = None
+        self._attempted_at = 0.0
+
+    def read(self) -> dict:
+        """Reads the config, from the service only if there's no copy to serve yet.
+
+        The payload is only parsed once, so reads return the same dict until the config changes; don't modify it.
+
+        Returns:
+            dict: The configuration values, or an empty dict if the service can't be reached and there's no copy.
+        """
+        payload = self._current_payload()
+        if payload is None:
+            return {}
+
+        parsed = self._parsed
+        if parsed is None or parsed[0] is not payload.body:
+            parsed = self._parsed = (payload.body, self._parse(payload.body))
+        return parsed[1]
+
+    def fingerprint(self) -> Optional[str]:
+        """Identifies the URL and the payload `read` currently returns, starting a revalidation if it's stale.
+
+        Returns:
+            Optional[str]: The source fingerprint.
+        """
+        payload = self._current_payload()
+        if payload is None:
+            payload_state = "absent"
+        else:
+            payload_state = hashlib.sha256(payload.body.encode()).hexdigest()
+
+        return f"{type(self).__name__}:{self._url}:{payload_state}"
+
+    def close(self) -> None:
+        """Waits for a running revalidation and closes the connection, which is opened again by the next request."""
+        revalidation = self._revalidation
+        if revalidation is not None:
+            revalidation.join()
+
+        with self._connection_lock:
+            self._close_connection()
+
+    def _current_payload(self) -> Optional[_Payload]:
+        with self._payload_lock:
+            if self._payload is None:
+                self._payload = self._read_cache_file()
+                if self._payload is None:
+                    # Nothing to serve while revalidating, so the first fetch is made in the foreground.
+                    self._revalidate()
+                    return self._payload
+
+            # An unreachable service is retried as often as a reachable one is revalidated.
+            last_checked_at = max(self._payload.fetched_at, self._attempted_at)
+            if time.time() - last_checked_at >= self._max_age:
+                self._start_revalidation()
+            return self._payload
+
+    def _start_revalidation(self) -> None:
+        if self._revalidation is None or not self._revalidation.is_alive():
+            self._revalidation = threading.Thread(
+                target=self._revalidate,
+                name=f"omni-config-revalidate-{self._url}",
+                daemon=True,
+            )
+            self._revalidation.start()
+
+    def _revalidate(self) -> None:
+        self._attempted_at = time.time()
+        payload = self._payload
+        headers = dict(self._headers, Accept="application/json")
+        if payload is not None:
+            if payload.etag:
+                headers["If-None-Match"] = payload.etag
+            if payload.last_modified:
+                headers["If-Modified-Since"] = payload.last_modified
+
+        try:
+            status, response_headers, body = self._request(headers)
+        except (OSError, http.client.HTTPException) as e:
+            logger.warning(f"Couldn't fetch config from {self._url}: {e}")
+            return
+
+        if status == http.HTTPStatus.NOT_MODIFIED and payload is not None:
+            logger.debug(f"Config at {self._url} is unchanged")
+            payload = payload._replace(fetched_at=time.time())
+        elif status == http.HTTPStatus.OK:
+            logger.debug(f"Fetched config from {self._url}")
+            try:
+                text = body.decode("utf-8")
+                self._parsed = (text, self._parse(text))
+            except ValueError as e:
+                logger.warning(f"Received a malformed config from {self._url}: {e}")
+                return
+            payload = _Payload(
+                text,
+                response_headers.get("ETag"),
+                response_headers.get("Last-Modified"),
+                time.time(),
+            )
+        else:
+            logger.warning(f"Couldn't fetch config from {self._url}: HTTP {status}")
+            return
+
+        self._payload = payload
+        self._write_cache_file(payload)
+
+    def _request(
+        self, headers: Dict[str, str]
+    ) -> Tuple[int, http.client.HTTPMessage, bytes]:
+        with self._connection_lock:
+            reused = self._connection is not None
+            while True:
+                if self._connection is None:
+                    connection_class = (
+                        http.client.HTTPSConnection
+                        if self._scheme == "https"
+                        else http.client.HTTPConnection
+                    )
+                    self._connection = connection_class(
+                        self._netloc, timeout=self._timeout
+                    )
+
+                try:
+                    self._connection.request("GET", self._path, headers=headers)
+                    response = self._connection.getresponse()
+                    body = response.read()
+                except _STALE_CONNECTION_ERRORS:
+                    self._close_connection()
+                    if not reused:
+                        raise
+                    # Retry once on a new connection.
+                    reused = False
+                    continue
+                except BaseException:
+                    self._close_connection()
+                    raise
+
+                if response.will_close:
+                    self._close_connection()
+                return response.status, response.headers, body
+
+    def _close_connection(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _parse(self, body: str) -> dict:
+        config = _select_parser_backend("json", self._parser_backend).loads(body)
+        if not isinstance(config, dict):
+            raise ValueError(f"Expected a JSON object; found {type(config)} instead.")
+        return config
+
+    def _read_cache_file(self) -> Optional[_Payload]:
+        try:
+            with open(self._cache_path, encoding="utf-8") as cache_file:
+                payload = _Payload(**json.load(cache_file))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable config cache {self._cache_path}: {e}")
+            return None
+
+        logger.debug(f"Serving the config cached in {self._cache_path}")
+        return payload
+
+    def _write_cache_file(self, payload: _Payload) -> None:
+        temporary_path = f"{self._cache_path}.{os.getpid()}.{threading.get_ident()}"
+        try:
+            os.makedirs(
+                os.path.dirname(os.path.abspath(self._cache_path)), exist_ok=True
+            )
+            with open(temporary_path, "w", encoding="utf-8") as cache_file:
+                json.dump(payload._asdict(), cache_file)
+            # Replacing the file atomically means readers never see a partial payload.
+            os.replace(temporary_path, self._cache_path)
+        except OSError as e:
+            logger.warning(f"Couldn't write config cache {self._cache_path}: {e}")
+
+    def __reduce__(self):
+        # Other processes open their own connection, starting from the payload stored on disk.
+        return type(self), (
+            self._url,
+            self._cache_path,
+            self._max_age,
+            self._timeout,
+            self._headers,
+            self._parser_backend,
+        )
@@ -0,0 +1,116 @@
+"""Contains utility methods and classes for listing config keys by prefix and by glob pattern.
+
+The index holds the '.' separated path of every leaf value in sorted order, and a trie of the path segments. Both are
+built on the first query against a config tree and reused until the config holds a different tree. Listing the keys
+under a prefix bisects the sorted paths, and finding the keys matching a pattern walks the trie, following literal
+segments directly. Neither visits keys outside the matches, except for the siblings compared against a wildcard segment.
+"""
+
+from bisect import bisect_left
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional, Sequence
+
+from prosper_shared.omni_config._config import _GLOB_CHARACTERS, Config
+
+_Trie = Dict[str, Any]
+
+
+def _join(path: str, segment: str) -> str:
+    return f"{path}.{segment}" if path else segment
+
+
+class _KeyIndex:
+    """A sorted list and a trie of the paths within a config tree."""
+
+    def __init__(self, config_dict: Optional[dict]):
+        """Creates a KeyIndex instance, walking the given tree once.
+
+        Args:
+            config_dict (Optional[dict]): The config tree. Dicts and lists are walked into, like `Config.get` does; every
+                other value, as well as empty dicts and lists, is a leaf.
+        """
+        self._keys: List[str] = []
+        self._trie: _Trie = {}
+        if isinstance(config_dict, dict):
+            for key, value in config_dict.items():
+                self._add(value, str(key), self._trie.setdefault(str(key), {}))
+        self._keys.sort()
+
+    def _add(self, value: Any, path: str, node: _Trie) -> None:
+        if isinstance(value, dict) and value:
+            items = value.items()
+        elif isinstance(value, list) and value:
+            items = enumerate(value)
+        else:
+            self._keys.append(path)
+            return
+
+        for key, nested in items:
+            segment = str(key)
+            self._add(nested, _join(path, segment), node.setdefault(segment, {}))
+
+    def keys(self, prefix: str = "") -> List[str]:
+        """Lists the paths of the leaf values at or below the given prefix.
+
+        Args:
+            prefix (str): The '.' separated path to list the keys under; lists every key if empty.
+
+        Returns:
+            List[str]: The matching paths, in sorted order.
+        """
+        prefix = prefix.strip(".")
+        if not prefix:
+            return list(self._keys)
+
+        # '/' sorts right after '.', so the paths below the prefix are the ones between `prefix.` and `prefix/`.
+        start = bisect_left(self._keys, f"{prefix}.")
+        matches = self._keys[start : bisect_left(self._keys, f"{prefix}/", start)]
+        index = bisect_left(self._keys, prefix)
+        if index < len(self._keys) and self._keys[index] == prefix:
+            matches.insert(0, prefix)
+        return matches
+
+    def find(self, pattern: str) -> List[str]:
+        """Finds the paths matching the given glob pattern.
+
+        Args:
+            pattern (str): A '.' separated glob pattern. Each segment is matched with `fnmatch`, except `**`, which
+                matches any number of segments, like in `dpath`.
+
+        Returns:
+            List[str]: The matching paths, including those of dicts and lists, in sorted order.
+        """
+        pattern = pattern.strip(".")
+        matches: List[str] = []
+        self._match(self._trie, pattern.split(".") if pattern else [], "", matches)
+        return sorted(set(matches))
+
+    def _match(
+        self, node: _Trie, segments: Sequence[str], path: str, matches: List[str]
+    ) -> None:
+        if not segments:
+            if path:
+                matches.append(path)
+            return
+
+        segment, rest = segments[0], segments[1:]
+        if segment == "**":
+            self._match(node, rest, path, matches)
+            for name, child in node.items():
+                self._match(child, segments, _join(path, name), matches)
+        elif _GLOB_CHARACTERS.intersection(segment):
+            for name, child in node.items():
+                if fnmatchcase(name, segment):
+                    self._match(child, rest, _join(path, name), matches)
+        elif segment in node:
+            self._match(node[segment], rest, _join(path, segment), matches)
+
+
+def _get_key_index(config: Config) -> _KeyIndex:
+    """Gets the index of the config's current tree, only building it on the first query against the tree."""
+    config_dict = config._config_dict
+    key_index = getattr(config, "_key_index", None)
+    if key_index is None or key_index[0] is not config_dict:
+        key_index = (config_dict, _KeyIndex(config_dict))
+        config._key_index = key_index
+    return key_index[1]
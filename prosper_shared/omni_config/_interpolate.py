@@ -0,0 +1,325 @@
+"""Contains utility methods and classes for interpolating references to other config values, e.g. `${app.url}/v1`.
+
+A string value references another value by its '.' separated path from the root of the config. A string made of a single
+reference takes the referenced value as is, whatever its type, while references within longer strings are replaced by
+the referenced value formatted as a string. Write `$${` for a literal `${`.
+
+References are resolved when a value is first looked up, and the result is kept until the config holds a different tree.
+The references between values form a dependency graph, which is built when the config is loaded so that circular
+references are rejected up front. When the config is reloaded, e.g. after a config daemon published an update or another
+profile was selected, only the resolved values depending on a changed value, directly or through other references, are
+dropped.
+"""
+
+import re
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from prosper_shared.omni_config._config import _GLOB_CHARACTERS, Config, _get_path
+from prosper_shared.omni_config._merge import _diff_config
+
+_Path = Tuple[str, ...]
+
+_REFERENCE_PATTERN = re.compile(r"\$(\$?)\{([^{}]*)\}")
+
+_UNRESOLVED = object()
+
+# The references being resolved by each thread, to report circular references introduced by overrides.
+_resolving = threading.local()
+
+
+def _to_path(key: str) -> _Path:
+    key = key.strip(".")
+    return tuple(key.split(".")) if key else ()
+
+
+class _PathIndex:
+    """A trie of paths, holding the items added at each path.
+
+    Looking up the items at or below a path, or overlapping it, only walks the nodes along the path and below it, so the
+    dependency graph is built, and stale values are found, without comparing every pair of paths.
+    """
+
+    def __init__(self):
+        self._root: Tuple[Dict[str, Any], List[Any]] = ({}, [])
+
+    def add(self, path: _Path, item: Any) -> None:
+        node = self._root
+        for segment in path:
+            node = node[0].setdefault(segment, ({}, []))
+        node[1].append(item)
+
+    def below(self, path: _Path) -> Iterator[Any]:
+        """Yields the items added at the path or at any path below it."""
+        node = self._root
+        for segment in path:
+            node = node[0].get(segment)
+            if node is None:
+                return
+        yield from self._walk(node)
+
+    def overlapping(self, path: _Path) -> Iterator[Any]:
+        """Yields the items added at the path, at any of its ancestors, or at any path below it."""
+        node = self._root
+        for segment in path:
+            yield from node[1]
+            node = node[0].get(segment)
+            if node is None:
+                return
+        yield from self._walk(node)
+
+    @staticmethod
+    def _walk(node: Tuple[Dict[str, Any], List[Any]]) -> Iterator[Any]:
+        stack = [node]
+        while stack:
+            children, items = stack.pop()
+            yield from items
+            stack.extend(children.values())
+
+
+def _find_references(
+    value: Any, path: _Path = ()
+) -> Iterator[Tuple[_Path, Tuple[_Path, ...]]]:
+    """Finds the strings holding references, or escaped references, within the value.
+
+    Args:
+        value (Any): The config value to search.
+        path (_Path): The path of the value.
+
+    Returns:
+        Iterator[Tuple[_Path, Tuple[_Path, ...]]]: The path of each string holding references, and the paths it
+            references.
+    """
+    if isinstance(value, str):
+        matches = list(_REFERENCE_PATTERN.finditer(value)) if "${" in value else []
+        if matches:
+            # Strings only holding escaped references still need resolving, but don't depend on anything.
+            yield path, tuple(
+                _to_path(match.group(2)) for match in matches if not match.group(1)
+            )
+    elif isinstance(value, dict):
+        for key, nested in value.items():
+            yield from _find_references(nested, path + (str(key),))
+    elif isinstance(value, list):
+        for index, nested in enumerate(value):
+            yield from _find_references(nested, path + (str(index),))
+
+
+def _check_cycles(references: Dict[_Path, Tuple[_Path, ...]]) -> None:
+    """Walks the dependency graph between the strings holding references, and rejects any circular reference.
+
+    A string depends on every string at or below each path it references. The strings are indexed by path, so each
+    dependency is found without comparing every pair of strings, and the graph is walked depth first without recursion.
+
+    Args:
+        references (Dict[_Path, Tuple[_Path, ...]]): The paths referenced by each string holding references.
+
+    Raises:
+        ValueError: If a string depends on itself, directly or through other references.
+    """
+    index = _PathIndex()
+    for path in references:
+        index.add(path, path)
+
+    def _dependencies(path: _Path) -> Iterator[_Path]:
+        for target in references[path]:
+            yield from index.below(target)
+
+    checked: Set[_Path] = set()
+    for start in references:
+        if start in checked:
+            continue
+        trail = [start]
+        on_trail = {start}
+        stack = [_dependencies(start)]
+        while stack:
+            dependency = next(stack[-1], None)
+            if dependency is None:
+                stack.pop()
+                path = trail.pop()
+                on_trail.discard(path)
+                checked.add(path)
+                continue
+            if dependency in on_trail:
+                cycle = trail[trail.index(dependency) :] + [dependency]
+                raise ValueError(
+                    f"Circular config reference: {' -> '.join('.'.join(p) for p in cycle)}"
+                )
+            if dependency not in checked:
+                trail.append(dependency)
+                on_trail.add(dependency)
+                stack.append(_dependencies(dependency))
+
+
+def _has_ancestor_in(path: _Path, paths: Set[_Path]) -> bool:
+    """Whether the path, or any of its ancestors, is one of the given paths."""
+    return any(path[:length] in paths for length in range(len(path) + 1))
+
+
+def _ancestors(paths: Sequence[_Path]) -> Set[_Path]:
+    return {path[:length] for path in paths for length in range(len(path) + 1)}
+
+
+class _Interpolator:
+    """Resolves the references within the values of a config, and memoizes the results for the current tree."""
+
+    def __init__(self, config_dict: Optional[dict]):
+        """Creates an Interpolator instance, building the dependency graph of the given tree.
+
+        Args:
+            config_dict (Optional[dict]): The config tree.
+
+        Raises:
+            ValueError: If the tree holds a circular reference.
+        """
+        self._tree = config_dict
+        self._references = dict(_find_references(config_dict))
+        _check_cycles(self._references)
+        # Only values holding references at or below them need resolving; the others are returned as they are.
+        self._interpolated_paths = _ancestors(list(self._references))
+        self._resolved: Dict[_Path, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, config: Config, key: str) -> Any:
+        """Gets the config value with its references resolved, reusing the result of any previous lookup.
+
+        Args:
+            config (Config): The config holding the tree.
+            key (str): The '.' separated path to the config value.
+
+        Returns:
+            Any: The resolved value, or None if it doesn't exist.
+
+        Raises:
+            ValueError: If a reference can't be resolved.
+        """
+        tree = config._config_dict
+        if tree is not self._tree:
+            self._reload(tree)
+
+        if _GLOB_CHARACTERS.intersection(key):
+            return self.interpolate(config, _get_path(tree, key))
+
+        path = _to_path(key)
+        resolved = self._resolved.get(path, _UNRESOLVED)
+        if resolved is not _UNRESOLVED:
+            return resolved
+
+        if path not in self._interpolated_paths:
+            for length in range(len(path) - 1, 0, -1):
+                if path[:length] in self._references:
+                    # The key points into a referenced value, e.g. `client.api.url` with `client.api: ${api}`.
+                    return _get_path(
+                        self.get(config, ".".join(path[:length])),
+                        ".".join(path[length:]),
+                    )
+            return config._get_base(key)
+
+        resolved = self.interpolate(config, config._get_base(key))
+        with self._lock:
+            # The tree may have been reloaded while resolving, in which case the result is already outdated.
+            if self._tree is tree:
+                self._resolved[path] = resolved
+        return resolved
+
+    def interpolate(self, config: Config, value: Any) -> Any:
+        """Resolves the references within the value, without memoizing the result.
+
+        Args:
+            config (Config): The config to look the references up in.
+            value (Any): The value to resolve.
+
+        Returns:
+            Any: The resolved value.
+
+        Raises:
+            ValueError: If a reference can't be resolved.
+        """
+        if isinstance(value, str):
+            return self._interpolate_string(config, value) if "${" in value else value
+        if isinstance(value, dict):
+            return {
+                key: self.interpolate(config, nested) for key, nested in value.items()
+            }
+        if isinstance(value, list):
+            return [self.interpolate(config, nested) for nested in value]
+        return value
+
+    def _interpolate_string(self, config: Config, value: str) -> Any:
+        match = _REFERENCE_PATTERN.fullmatch(value)
+        if match and not match.group(1):
+            return self._lookup(config, match.group(2))
+
+        return _REFERENCE_PATTERN.sub(
+            lambda m: (
+                f"${{{m.group(2)}}}"
+                if m.group(1)
+                else str(self._lookup(config, m.group(2)))
+            ),
+            value,
+        )
+
+    def _lookup(self, config: Config, key: str) -> Any:
+        key = key.strip(".")
+        trail = _resolving.__dict__.setdefault("trail", [])
+        if key in trail:
+            raise ValueError(f"Circular config reference: {' -> '.join(trail + [key])}")
+
+        trail.append(key)
+        try:
+            value = config.get(key)
+        finally:
+            trail.pop()
+
+        if value is None:
+            raise ValueError(f"Unresolved config reference ${{{key}}}")
+        return value
+
+    def _reload(self, tree: Optional[dict]) -> None:
+        """Updates the dependency graph for the new tree, and drops the resolved values depending on a changed value.
+
+        Args:
+            tree (Optional[dict]): The new config tree.
+
+        Raises:
+            ValueError: If the new tree holds a circular reference.
+        """
+        with self._lock:
+            changed, removed = _diff_config(self._tree or {}, tree or {})
+            stale = [tuple(str(key) for key in path) for path, _ in changed] + [
+                tuple(str(key) for key in path) for path in removed
+            ]
+            stale_paths = set(stale)
+
+            references = {
+                path: targets
+                for path, targets in self._references.items()
+                if not _has_ancestor_in(path, stale_paths)
+            }
+            for path, value in changed:
+                references.update(
+                    _find_references(value, tuple(str(key) for key in path))
+                )
+            _check_cycles(references)
+
+            # Strings referencing a stale value are stale themselves, up to the strings depending on nothing stale.
+            referencing = _PathIndex()
+            for path, targets in references.items():
+                for target in targets:
+                    referencing.add(target, path)
+            for other in stale:
+                for path in referencing.overlapping(other):
+                    if path not in stale_paths:
+                        stale_paths.add(path)
+                        stale.append(path)
+
+            stale_ancestors = _ancestors(stale)
+            self._resolved = {
+                path: value
+                for path, value in self._resolved.items()
+                if path not in stale_ancestors
+                and not _has_ancestor_in(path, stale_paths)
+            }
+            self._references = references
+            self._interpolated_paths = _ancestors(list(references))
+            self._tree = tree
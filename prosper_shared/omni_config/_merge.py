@@ -1,10 +1,12 @@
 """Contains utility methods and classes for merging multiple configs."""
 
 from copy import deepcopy
-from typing import List
+from typing import Any, List, Optional, Tuple
 
 from deepmerge import always_merger
 
+_Changes = Tuple[List[Tuple[List[str], Any]], List[List[str]]]
+
 
 def _merge_config(configs: List[dict]) -> dict:
     """Compiles all the config sources into a single config.
@@ -21,3 +23,34 @@ def _merge_config(configs: List[dict]) -> dict:
         always_merger.merge(conf, deepcopy(partial_conf))
 
     return conf
+
+
+def _diff_config(old: dict, new: dict, path: Optional[List[str]] = None) -> _Changes:
+    """Finds the values set and the paths removed by going from the old to the new config.
+
+    Args:
+        old (dict): The previous config.
+        new (dict): The current config.
+        path (Optional[List[str]]): The path of the compared subtrees.
+
+    Returns:
+        _Changes: The (path, value) pairs that were set and the paths that were removed.
+    """
+    path = path or []
+    changed = []
+    removed = [path + [key] for key in old if key not in new]
+
+    for key, value in new.items():
+        if key not in old:
+            changed.append((path + [key], value))
+        elif value is old[key]:
+            # Reloads reuse unchanged subtrees, which don't need to be compared.
+            continue
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested_changed, nested_removed = _diff_config(old[key], value, path + [key])
+            changed += nested_changed
+            removed += nested_removed
+        elif value != old[key] or type(value) is not type(old[key]):
+            changed.append((path + [key], value))
+
+    return changed, removed
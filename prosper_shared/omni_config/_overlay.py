@@ -0,0 +1,105 @@
+"""Contains utility methods for overriding config values within the current context, e.g. a request or a task.
+
+Each config keeps its stack of overlay layers in its own `ContextVar`, so overrides pushed in one thread or asyncio task
+are never visible in another one. A layer holds the overridden (path, value) pairs in the order they were given, and
+lookups apply the layers on top of the value found in the config itself. Neither pushing a layer nor looking a value up
+copies the config tree.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Tuple
+
+from prosper_shared.omni_config._config import (
+    _GLOB_CHARACTERS,
+    Config,
+    _ConfigView,
+    _get_path,
+    _replace_path,
+    _to_index,
+)
+
+_OverlayLayer = Tuple[Tuple[Tuple[str, ...], Any], ...]
+
+_overlays_lock = threading.Lock()
+
+
+def _flatten_overrides(overrides: dict, prefix: Tuple[str, ...] = ()) -> _OverlayLayer:
+    """Turns nested overrides into (path, value) pairs, splitting '.' separated keys into their path segments."""
+    entries = []
+    for key, value in overrides.items():
+        path = prefix + tuple(str(key).strip(".").split("."))
+        if isinstance(value, dict) and value:
+            entries += _flatten_overrides(value, path)
+        else:
+            entries.append((path, value))
+    return tuple(entries)
+
+
+def _get_overlays(config: Config) -> ContextVar:
+    if config._overlays is None:
+        with _overlays_lock:
+            if config._overlays is None:
+                config._overlays = ContextVar(
+                    f"config_overlays_{id(config)}", default=()
+                )
+    return config._overlays
+
+
+@contextmanager
+def _override(config: Config, overrides: dict) -> Iterator[Config]:
+    # Views push their overrides to the config they're backed by, which is where their lookups are made.
+    root, prefix = config, ()
+    if isinstance(config, _ConfigView):
+        root = config._parent
+        prefix = tuple(config._prefix.split(".")) if config._prefix else ()
+
+    overlays = _get_overlays(root)
+    token = overlays.set(overlays.get() + (_flatten_overrides(overrides, prefix),))
+    try:
+        yield config
+    finally:
+        overlays.reset(token)
+
+
+def _get_overlaid(
+    config: Config, key: str, layers: Tuple[_OverlayLayer, ...]
+) -> object:
+    """Looks the key up in the config, then applies every overlay layer to the value found, oldest first."""
+    path = tuple(key.lstrip(".").split("."))
+    # Glob expressions can match anywhere, and list indices written differently, e.g. `-1` and `1`, can refer to the
+    # same item, so those lookups are evaluated against the tree with every override applied.
+    if _GLOB_CHARACTERS.intersection(key) or any(
+        _may_alias(path, override_path)
+        for layer in layers
+        for override_path, _ in layer
+    ):
+        tree = config._config_dict
+        for layer in layers:
+            for override_path, override_value in layer:
+                tree = _replace_path(tree, override_path, override_value)
+        return _get_path(tree, key)
+
+    value = config._get_base(key)
+    for layer in layers:
+        for override_path, override_value in layer:
+            if override_path[: len(path)] == path:
+                value = _replace_path(value, override_path[len(path) :], override_value)
+            elif path[: len(override_path)] == override_path:
+                value = _get_path(override_value, ".".join(path[len(override_path) :]))
+    return value
+
+
+def _may_alias(path: Tuple[str, ...], override_path: Tuple[str, ...]) -> bool:
+    """Tests whether the paths can lead to the same value through different spellings of the same list index."""
+    for segment, override_segment in zip(path, override_path):
+        if segment == override_segment:
+            continue
+        index, override_index = _to_index(segment), _to_index(override_segment)
+        return (
+            index is not None
+            and override_index is not None
+            and (index == override_index or (index < 0) != (override_index < 0))
+        )
+    return False
@@ -3,13 +3,18 @@
 import argparse
 import logging
 import os
+import re
 from abc import abstractmethod
-from typing import Dict, List, Optional, Union
+from typing import Dict, Hashable, List, Optional, Union
 
 import dpath
 from schema import Optional as SchemaOptional
 
+from prosper_shared.omni_config._backend import _select_parser_backend
 from prosper_shared.omni_config._define import _ConfigKey, _SchemaType
+from prosper_shared.omni_config._discovery import _memoize
+from prosper_shared.omni_config._reference import _load_file_references
+from prosper_shared.omni_config._stats import _phase
 
 logger = logging.getLogger(__file__)
 
@@ -25,12 +30,45 @@ class _ConfigurationSource:
             dict: The configuration values.
         """
 
+    def fingerprint(self) -> Optional[str]:
+        """Identifies the current state of the source without reading it.
+
+        Returns:
+            Optional[str]: A value that changes whenever `read` could return a different result, or None if the source
+                can't be fingerprinted.
+        """
+        return None
+
+
+class _LazyConfigurationSource(_ConfigurationSource):
+    """A configuration source that's queried per key instead of being read as a whole, e.g. a large database.
+
+    Pass lazy sources to `Config.autoconfig` through `lazy_sources`, so lookups only query the values they need. `read`
+    still returns the whole config, e.g. for merging the source with `merge_config`.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> object:
+        """Looks a single config value up.
+
+        Args:
+            key (str): The '.' separated path to the config value.
+
+        Returns:
+            object: The config value, a nested dict for a path holding several values, or None if it doesn't exist.
+        """
+
 
 class _FileConfigurationSource(_ConfigurationSource):
-    def __init__(self, config_file_path, config_root="", inject_at=None):
+    _file_format: Optional[str] = None
+
+    def __init__(
+        self, config_file_path, config_root="", inject_at=None, parser_backend=None
+    ):
         self._config_file_path = config_file_path
         self._config_root = config_root
         self._inject_at = inject_at
+        self._parser_backend = parser_backend
 
     def read(self) -> dict:
         """Reads the given file and extracts the contents into a dict. It returns the subtree rooted at `config_root`.
@@ -52,14 +90,13 @@ class _FileConfigurationSource(_ConfigurationSource):
         config = self._read_file(self._config_file_path)
 
         if self._config_root:
-            # Find first value matching given root path and replace the config with that value. A little bit hacky,
-            # since it relies on `dpath` always returning the root obj before all the children.
-            _, v = next(
-                dpath.search(
-                    config, self._config_root + ".**", separator=".", yielded=True
-                )
-            )
-            config = v
+            for key in self._config_root.split("."):
+                if not isinstance(config, dict) or key not in config:
+                    logger.debug(
+                        f"Config root {self._config_root} not found in {self._config_file_path}; skipping..."
+                    )
+                    return {}
+                config = config[key]
 
             if not isinstance(config, dict):
                 raise ValueError(
@@ -73,47 +110,130 @@ class _FileConfigurationSource(_ConfigurationSource):
 
         return config
 
-    @abstractmethod
+    def fingerprint(self) -> Optional[str]:
+        """Identifies the file by path and, if it exists, by modification time and size.
+
+        Returns:
+            Optional[str]: The file fingerprint.
+        """
+        try:
+            stat = os.stat(self._config_file_path)
+            file_state = f"{stat.st_mtime_ns}:{stat.st_size}"
+        except FileNotFoundError:
+            file_state = "absent"
+
+        return f"{type(self).__name__}:{self._config_file_path}:{self._config_root}:{self._inject_at}:{file_state}"
+
     def _read_file(self, file_path: str) -> dict:
-        """Reads the given file and extracts the contents into a dict.
+        """Reads the given file and extracts the contents into a dict, parsing it in the source's file format.
+
+        Sources without a file format override this to read their files.
+
+        Args:
+            file_path (str): The path to the config file.
+
+        Returns:
+            dict: The configuration values, or None if the source has no file format.
+        """
+        if self._file_format is None:
+            return None
+        return self._parse_file(file_path)
+
+    def _parse_file(self, file_path: str) -> dict:
+        """Parses the given file with the selected parser backend for this source's file format.
+
+        Values declared like `{"$file": "blocklist.bin"}` reference sidecar files relative to the config file, which are
+        only loaded when the values are looked up.
 
         Args:
             file_path (str): The path to the config file.
 
         Returns:
             dict: The configuration values.
+
+        Raises:
+            ValueError: If a sidecar file reference is malformed.
         """
-        pass
+        # Sources sharing discovery, e.g. the apps configured by `autoconfig_many`, parse each version of a file once.
+        stat = os.stat(file_path)
+        return _memoize(
+            (self._parse_variant(), file_path, stat.st_mtime_ns, stat.st_size),
+            lambda: self._parse_file_content(file_path),
+        )
+
+    def _parse_variant(self) -> Hashable:
+        """Identifies how this source parses its files, which sources parsing the same way can share results for."""
+        return type(self), self._parser_backend
+
+    def _parse_file_content(self, file_path: str) -> dict:
+        logger.debug(f"Parsing {file_path}...")
+
+        with _phase("parse", path=file_path, format=self._file_format) as details:
+            with open(file_path, encoding="utf-8") as config_file:
+                content = config_file.read()
+                details["bytes"] = os.fstat(config_file.fileno()).st_size
+            config = self._parse_content(content)
+
+            # Only configs mentioning `$file` can hold references, which spares walking every other config.
+            if "$file" in content:
+                config = _load_file_references(
+                    config, os.path.dirname(os.path.abspath(file_path))
+                )
+        return config
+
+    def _parse_content(self, content: str) -> dict:
+        backend = _select_parser_backend(self._file_format, self._parser_backend)
+        logger.debug(f"Using the {backend.name} parser backend")
+
+        return backend.loads(content)
 
 
 class _TomlConfigurationSource(_FileConfigurationSource):
     """Configuration source that can read TOML files."""
 
-    def _read_file(self, file_path) -> dict:
-        import toml  # noqa: autoimport
+    _file_format = "toml"
+
+    def __init__(
+        self,
+        config_file_path,
+        config_root="",
+        inject_at=None,
+        parser_backend=None,
+        streaming=False,
+    ):
+        """Creates a new TomlConfigurationSource instance.
+
+        Arguments:
+            config_file_path (str): The path to the TOML file.
+            config_root (str): The '.' separated path to the table holding the config, e.g. `tool.app-name`.
+            inject_at (str): The '.' separated path at which to place the config in the returned dict.
+            parser_backend (str): The name of the parser backend to use instead of the fastest available one.
+            streaming (bool): Only parse the tables overlapping `config_root` and skip the rest of the file, which is
+                much faster for large files like a monorepo `pyproject.toml`.
+        """
+        super().__init__(config_file_path, config_root, inject_at, parser_backend)
+        self._streaming = streaming
 
-        with open(self._config_file_path) as config_file:
-            return toml.load(config_file)
+    def _parse_variant(self) -> Hashable:
+        return super()._parse_variant(), self._streaming and self._config_root
+
+    def _parse_content(self, content: str) -> dict:
+        if self._streaming and self._config_root:
+            content = _extract_toml_tables(content, self._config_root.split("."))
+
+        return super()._parse_content(content)
 
 
 class _JsonConfigurationSource(_FileConfigurationSource):
     """Configuration source that can read JSON files."""
 
-    def _read_file(self, file_path) -> dict:
-        import json  # noqa: autoimport
-
-        with open(self._config_file_path) as config_file:
-            return json.load(config_file)
+    _file_format = "json"
 
 
 class _YamlConfigurationSource(_FileConfigurationSource):
     """Configuration source that can read YAML files."""
 
-    def _read_file(self, file_path) -> dict:
-        import yaml  # noqa: autoimport
-
-        with open(self._config_file_path) as config_file:
-            return yaml.safe_load(config_file)
+    _file_format = "yaml"
 
 
 class _ArgParseSource(_ConfigurationSource):
@@ -133,7 +253,9 @@ class _ArgParseSource(_ConfigurationSource):
         Returns:
             dict: The args parsed into a nested dict.
         """
-        raw_namespace = self._argument_parser.parse_args()
+        raw_namespace = _memoize(
+            ("argparse", self._argument_parser), self._argument_parser.parse_args
+        )
         nested_config = {}
 
         for key, val in raw_namespace.__dict__.items():
@@ -154,6 +276,48 @@ class _ArgParseSource(_ConfigurationSource):
 
         return nested_config
 
+    def fingerprint(self) -> Optional[str]:
+        """Identifies the command line the arguments are parsed from, and the arguments the parser defines.
+
+        Returns:
+            Optional[str]: A digest of the command line arguments and the parser's actions, or None if arguments can
+                be read from files.
+        """
+        import hashlib  # noqa: autoimport
+        import json  # noqa: autoimport
+        import sys  # noqa: autoimport
+
+        from prosper_shared.omni_config._snapshot import (  # noqa: autoimport
+            _canonicalize_schema,
+        )
+
+        # Arguments read from files change along with the files, which aren't tracked.
+        if self._argument_parser.fromfile_prefix_chars:
+            return None
+
+        actions = [
+            _canonicalize_schema(
+                [
+                    type(action),
+                    action.option_strings,
+                    action.dest,
+                    action.nargs,
+                    action.const,
+                    action.default,
+                    action.type,
+                    action.choices,
+                    action.required,
+                ]
+            )
+            for action in self._argument_parser._actions
+        ]
+        parser_state = json.dumps(
+            [sys.argv, self._argument_parser.prefix_chars, actions]
+        )
+        return (
+            f"{type(self).__name__}:{hashlib.sha256(parser_state.encode()).hexdigest()}"
+        )
+
 
 class _EnvironmentVariableSource(_ConfigurationSource):
     """A configuration source for environment variables."""
@@ -202,9 +366,24 @@ class _EnvironmentVariableSource(_ConfigurationSource):
 
         return result
 
+    def fingerprint(self) -> Optional[str]:
+        """Identifies the environment variables matching the prefix.
+
+        Returns:
+            Optional[str]: A digest of the matching environment variables.
+        """
+        import hashlib  # noqa: autoimport
+
+        matching_variables = sorted(
+            (key, value)
+            for key, value in _EnvironmentVariableSource.__get_value_map().items()
+            if key.startswith(self.__prefix)
+        )
+        return f"{type(self).__name__}:{self.__prefix}:{hashlib.sha256(repr(matching_variables).encode()).hexdigest()}"
+
     @staticmethod
     def __get_value_map() -> Dict[str, str]:
-        return os.environ.copy()
+        return _memoize("environ", os.environ.copy)
 
     def __sanitize_key(self, key: str) -> List[str]:
         return key[len(self.__prefix) + 1 :].split(self.__separator)
@@ -216,6 +395,82 @@ class _EnvironmentVariableSource(_ConfigurationSource):
         return value
 
 
+_TOML_TABLE_HEADER = re.compile(r"\s*\[\[?([^\[\]]+)\]\]?\s*(?:#.*)?")
+_TOML_KEY_PART = re.compile(
+    r"""\s*(?:"((?:[^"\\]|\\.)*)"|'([^']*)'|([A-Za-z0-9_-]+))\s*(?:\.|$)"""
+)
+_TOML_TOKEN = re.compile(r""""{3}|'{3}|"(?:[^"\\]|\\.)*"|'[^']*'|#|[\[\]{}]""")
+_TOML_SPECIAL_CHARACTERS = re.compile(r"""["'#\[\]{}]""")
+
+
+def _parse_toml_table_header(header: str) -> Optional[List[str]]:
+    path = []
+    position = 0
+    while position < len(header):
+        match = _TOML_KEY_PART.match(header, position)
+        if not match:
+            return None
+        path.append(next(g for g in match.groups() if g is not None))
+        position = match.end()
+    return path
+
+
+def _extract_toml_tables(content: str, root: List[str]) -> str:
+    """Drops every TOML table that can't contribute to the subtree at the given root path.
+
+    Only table headers are interpreted; the other lines are scanned just enough to skip over multi-line strings and
+    arrays. Tables with headers that can't be interpreted are kept, so the result always yields the same subtree.
+
+    Args:
+        content (str): The TOML document.
+        root (List[str]): The path to the table holding the config.
+
+    Returns:
+        str: A TOML document with the top-level values and the tables on, above, or below the root path.
+    """
+    kept_lines = []
+    keep = True
+    open_string = None
+    depth = 0
+
+    for line in content.splitlines():
+        remainder = line
+        if open_string:
+            end = line.find(open_string)
+            if end >= 0:
+                remainder = line[end + 3 :]
+                open_string = None
+        elif depth == 0:
+            header = _TOML_TABLE_HEADER.fullmatch(line)
+            if header:
+                path = _parse_toml_table_header(header.group(1))
+                keep = path is None or path[: len(root)] == root[: len(path)]
+
+        if keep:
+            kept_lines.append(line)
+
+        if open_string or not _TOML_SPECIAL_CHARACTERS.search(remainder):
+            continue
+
+        position = 0
+        token = _TOML_TOKEN.search(remainder, position)
+        while token and token.group() != "#":
+            position = token.end()
+            if token.group() in ('"""', "'''"):
+                end = remainder.find(token.group(), position)
+                if end < 0:
+                    open_string = token.group()
+                    break
+                position = end + 3
+            elif token.group() in ("[", "{"):
+                depth += 1
+            elif token.group() in ("]", "}"):
+                depth -= 1
+            token = _TOML_TOKEN.search(remainder, position)
+
+    return "\n".join(kept_lines)
+
+
 def _extract_defaults_from_schema(
     schema: _SchemaType, defaults: Optional[dict] = None
 ) -> dict:
@@ -0,0 +1,148 @@
+"""Contains utility methods and classes for discovering config profiles and switching between them.
+
+A profile is a set of config files named after the files `Config.autoconfig` already searches, with the profile name
+inserted before the extension, e.g. `config.prod.yml` next to `config.yml`, or `.app-name.staging.json` next to
+`.app-name.json`. Profile files override every other config file, while environment variables and command-line
+arguments still override the profile.
+"""
+
+import os
+from copy import copy
+from typing import Dict, List, Optional, Set, Union
+
+from prosper_shared.omni_config._config import _resolve_sources
+from prosper_shared.omni_config._define import _SchemaType
+from prosper_shared.omni_config._discovery import _memoize
+from prosper_shared.omni_config._parse import (
+    _ConfigurationSource,
+    _FileConfigurationSource,
+)
+
+# The environment variable and argparse sources always stay at the end of the chain.
+_TRAILING_SOURCE_COUNT = 2
+
+
+def _list_directory(directory: str) -> Set[str]:
+    def list_files() -> Set[str]:
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name for entry in entries if entry.is_file()}
+        except OSError:
+            return set()
+
+    # The apps configured by `autoconfig_many` mostly search the same directories.
+    return _memoize(("listing", directory), list_files)
+
+
+def _discover_profile_sources(
+    conf_sources: List[Union[dict, _ConfigurationSource]],
+) -> Dict[str, List[_ConfigurationSource]]:
+    """Finds the profile files next to each config file in the chain, listing each directory once.
+
+    Args:
+        conf_sources (List[Union[dict, _ConfigurationSource]]): The configuration sources searched by `autoconfig`.
+
+    Returns:
+        Dict[str, List[_ConfigurationSource]]: The sources of each profile, in the order of the files they're named after.
+    """
+    listings: Dict[str, Set[str]] = {}
+    profile_sources: Dict[str, List[_ConfigurationSource]] = {}
+
+    for source in conf_sources:
+        if not isinstance(source, _FileConfigurationSource):
+            continue
+
+        directory, file_name = os.path.split(source._config_file_path)
+        if directory not in listings:
+            listings[directory] = _list_directory(directory)
+        stem, extension = os.path.splitext(file_name)
+
+        for name in sorted(listings[directory]):
+            profile = name[len(stem) + 1 : len(name) - len(extension)]
+            if (
+                name.startswith(f"{stem}.")
+                and name.endswith(extension)
+                and profile
+                and "." not in profile
+            ):
+                profile_source = copy(source)
+                profile_source._config_file_path = os.path.join(directory, name)
+                profile_sources.setdefault(profile, []).append(profile_source)
+
+    return profile_sources
+
+
+class _Profiles:
+    """Resolves the config for each profile on first use, and keeps the result for switching back to it."""
+
+    def __init__(
+        self,
+        conf_sources: List[Union[dict, _ConfigurationSource]],
+        schema: _SchemaType,
+        validate: bool,
+    ):
+        """Creates a Profiles instance, discovering the available profiles.
+
+        Args:
+            conf_sources (List[Union[dict, _ConfigurationSource]]): The configuration sources searched by `autoconfig`.
+            schema (_SchemaType): The realized schema.
+            validate (bool): Whether to validate the config of each profile.
+        """
+        self._conf_sources = conf_sources
+        self._profile_sources = _discover_profile_sources(conf_sources)
+        self._schema = schema
+        self._validate = validate
+        self._resolved: Dict[Optional[str], dict] = {}
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self._profile_sources)
+
+    def sources(
+        self, profile: Optional[str]
+    ) -> List[Union[dict, _ConfigurationSource]]:
+        """Builds the chain of configuration sources for the given profile.
+
+        Args:
+            profile (Optional[str]): The profile name, or None for no profile.
+
+        Returns:
+            List[Union[dict, _ConfigurationSource]]: The configuration sources, with the profile files placed after the
+                other config files.
+
+        Raises:
+            ValueError: If the profile doesn't exist.
+        """
+        if profile is None:
+            return self._conf_sources
+        if profile not in self._profile_sources:
+            raise ValueError(
+                f"Unknown config profile {profile}; available profiles are {self.names}"
+            )
+
+        return [
+            *self._conf_sources[:-_TRAILING_SOURCE_COUNT],
+            *self._profile_sources[profile],
+            *self._conf_sources[-_TRAILING_SOURCE_COUNT:],
+        ]
+
+    def remember(self, profile: Optional[str], config_dict: dict) -> None:
+        self._resolved[profile] = config_dict
+
+    def resolve(self, profile: Optional[str]) -> dict:
+        """Resolves the config for the given profile, reusing the result of any previous call.
+
+        Args:
+            profile (Optional[str]): The profile name, or None for no profile.
+
+        Returns:
+            dict: The resolved config.
+
+        Raises:
+            ValueError: If the profile doesn't exist.
+        """
+        if profile not in self._resolved:
+            self._resolved[profile] = _resolve_sources(
+                self.sources(profile), self._schema, self._validate
+            )
+        return self._resolved[profile]
@@ -0,0 +1,148 @@
+"""Contains utility methods and classes for referencing sidecar files from config values, e.g. large datasets.
+
+A config file declares a reference as a dict holding the path of the sidecar file under `$file`, relative to the config
+file. The referenced file is memory-mapped on first access, and returned as:
+- a read-only `memoryview` of its bytes by default;
+- a `memoryview` cast to the given `array` type code with `$typecode`, e.g. `{"$file": "ids.bin", "$typecode": "q"}`;
+- a string decoded with the given encoding with `$encoding`, e.g. `{"$file": "notes.txt", "$encoding": "utf-8"}`.
+
+Config files stay small and fast to parse, and processes never load the sidecar files they don't look up.
+"""
+
+import mmap
+import os
+import threading
+from typing import Any, Optional
+
+from prosper_shared.omni_config._config import _LazyValue
+
+_FILE_KEY = "$file"
+_TYPECODE_KEY = "$typecode"
+_ENCODING_KEY = "$encoding"
+
+_REFERENCE_KEYS = frozenset({_FILE_KEY, _TYPECODE_KEY, _ENCODING_KEY})
+
+_UNLOADED = object()
+
+
+class _FileReference(_LazyValue):
+    """A reference to a sidecar file, which is memory-mapped and decoded on first access."""
+
+    def __init__(
+        self,
+        file_path: str,
+        typecode: Optional[str] = None,
+        encoding: Optional[str] = None,
+    ):
+        """Creates a FileReference instance.
+
+        Args:
+            file_path (str): The absolute path to the sidecar file.
+            typecode (Optional[str]): The `array` type code to cast the file content to.
+            encoding (Optional[str]): The encoding to decode the file content with.
+        """
+        self._file_path = file_path
+        self._typecode = typecode
+        self._encoding = encoding
+        self._value = _UNLOADED
+        self._lock = threading.Lock()
+
+    @property
+    def declaration(self) -> dict:
+        """The reference as declared in a config file, with the absolute file path."""
+        declaration = {_FILE_KEY: self._file_path}
+        if self._typecode:
+            declaration[_TYPECODE_KEY] = self._typecode
+        if self._encoding:
+            declaration[_ENCODING_KEY] = self._encoding
+        return declaration
+
+    def resolve(self) -> Any:
+        """Maps and decodes the file on the first call, and returns the same value on every later call.
+
+        Returns:
+            Any: The file content, as described by the reference.
+
+        Raises:
+            OSError: If the file can't be read.
+            TypeError: If the file size isn't a multiple of the item size of the type code.
+        """
+        if self._value is _UNLOADED:
+            with self._lock:
+                if self._value is _UNLOADED:
+                    self._value = self._load()
+        return self._value
+
+    def _load(self) -> Any:
+        with open(self._file_path, "rb") as file:
+            # Empty files can't be mapped.
+            if os.fstat(file.fileno()).st_size:
+                content = memoryview(
+                    mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                )
+            else:
+                content = memoryview(b"")
+
+        if self._encoding:
+            return str(content, self._encoding)
+        if self._typecode:
+            return content.cast(self._typecode)
+        return content
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, _FileReference):
+            return NotImplemented
+        return self.declaration == other.declaration
+
+    def __hash__(self) -> int:
+        return hash((self._file_path, self._typecode, self._encoding))
+
+    def __repr__(self) -> str:
+        return f"_FileReference({self._file_path!r}, typecode={self._typecode!r}, encoding={self._encoding!r})"
+
+    def __deepcopy__(self, memo: dict) -> "_FileReference":
+        # References are immutable, so configs merged from the same source share them along with the loaded content.
+        return self
+
+    def __reduce__(self):
+        # Other processes map the file again on first access instead of receiving its content.
+        return _FileReference, (self._file_path, self._typecode, self._encoding)
+
+
+def _load_file_references(value: Any, base_directory: str) -> Any:
+    """Replaces the sidecar file references declared within the value by `_FileReference` instances.
+
+    Args:
+        value (Any): The parsed config value, which is updated in place.
+        base_directory (str): The directory relative file paths are resolved against, i.e. the config file's directory.
+
+    Returns:
+        Any: The value with its references replaced.
+
+    Raises:
+        ValueError: If a reference holds keys other than `$file`, `$typecode`, and `$encoding`, or holds both of the
+            latter.
+    """
+    if isinstance(value, dict):
+        if _FILE_KEY in value:
+            unexpected_keys = set(value) - _REFERENCE_KEYS
+            if unexpected_keys:
+                raise ValueError(
+                    f"Unexpected keys {sorted(unexpected_keys)} in file reference {value}"
+                )
+            if _TYPECODE_KEY in value and _ENCODING_KEY in value:
+                raise ValueError(
+                    f"File reference {value} can't have both a type code and an encoding"
+                )
+            return _FileReference(
+                os.path.normpath(os.path.join(base_directory, value[_FILE_KEY])),
+                value.get(_TYPECODE_KEY),
+                value.get(_ENCODING_KEY),
+            )
+
+        for key, nested in value.items():
+            value[key] = _load_file_references(nested, base_directory)
+    elif isinstance(value, list):
+        for index, nested in enumerate(value):
+            value[index] = _load_file_references(nested, base_directory)
+    return value
@@ -0,0 +1,172 @@
+"""Contains a configuration source mapping a directory of mounted secrets onto config paths, e.g. `/run/secrets`.
+
+Secret stores mount one file per value, so the directory `/run/secrets/prosper-api/` holding the file `client-secret`
+maps onto the config path `prosper-api.client-secret`. Reading the source walks the directory once without opening any
+file. Each secret is read on first access, and read again once it's older than the TTL, so rotated secrets are picked up
+without re-reading the others. Validating the config against a schema reads every secret to check its value.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterator, Optional, Tuple
+
+import dpath
+
+from prosper_shared.omni_config._config import _LazyValue
+from prosper_shared.omni_config._parse import _ConfigurationSource
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TTL = 60.0
+
+
+class _SecretFile(_LazyValue):
+    """A mounted secret, which is read on first access and read again once it's older than the TTL."""
+
+    def __init__(self, file_path: str, ttl: Optional[float] = _DEFAULT_TTL):
+        """Creates a SecretFile instance.
+
+        Args:
+            file_path (str): The absolute path to the secret file.
+            ttl (Optional[float]): How many seconds to serve the secret before reading it again, or None to read it
+                only once.
+        """
+        self._file_path = file_path
+        self._ttl = ttl
+        self._value: Optional[str] = None
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> str:
+        """Reads the secret if it wasn't read yet or expired, and returns it without trailing line breaks.
+
+        Returns:
+            str: The secret.
+
+        Raises:
+            OSError: If the file can't be read.
+        """
+        if self._is_expired():
+            with self._lock:
+                if self._is_expired():
+                    with open(self._file_path, encoding="utf-8") as secret_file:
+                        self._value = secret_file.read().rstrip("\r\n")
+                    self._loaded_at = time.monotonic()
+                    self.version += 1
+        return self._value
+
+    def _is_expired(self) -> bool:
+        return self._loaded_at is None or (
+            self._ttl is not None and time.monotonic() - self._loaded_at >= self._ttl
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, _SecretFile):
+            return NotImplemented
+        return (self._file_path, self._ttl) == (other._file_path, other._ttl)
+
+    def __hash__(self) -> int:
+        return hash((self._file_path, self._ttl))
+
+    def __repr__(self) -> str:
+        # Never includes the secret, so it can't leak into logs or fingerprints.
+        return f"_SecretFile({self._file_path!r}, ttl={self._ttl!r})"
+
+    def __deepcopy__(self, memo: dict) -> "_SecretFile":
+        # Configs merged from the same source share the secret along with its cached value.
+        return self
+
+    def __reduce__(self):
+        # Other processes read the secret themselves instead of receiving it.
+        return _SecretFile, (self._file_path, self._ttl)
+
+
+class _SecretsDirectoryConfigurationSource(_ConfigurationSource):
+    """Configuration source that maps the files in a secrets directory onto config paths."""
+
+    def __init__(
+        self,
+        directory_path: str,
+        inject_at: Optional[str] = None,
+        ttl: Optional[float] = _DEFAULT_TTL,
+    ):
+        """Creates a new SecretsDirectoryConfigurationSource instance.
+
+        Arguments:
+            directory_path (str): The path to the secrets directory.
+            inject_at (str): The '.' separated path at which to place the secrets in the returned dict.
+            ttl (Optional[float]): How many seconds to serve a secret before reading it again, or None to read each
+                secret only once.
+        """
+        self._directory_path = directory_path
+        self._inject_at = inject_at
+        self._ttl = ttl
+        self._secrets: Dict[str, _SecretFile] = {}
+        self._lock = threading.Lock()
+
+    def read(self) -> dict:
+        """Walks the secrets directory, without reading any secret.
+
+        Returns:
+            dict: The config tree, holding a lazily read secret for each file.
+        """
+        config: dict = {}
+        with self._lock:
+            secrets: Dict[str, _SecretFile] = {}
+            for key_path, file_path in _scan_secrets(self._directory_path):
+                # Secrets found again keep their cached value; removed secrets are dropped.
+                secret = self._secrets.get(file_path) or _SecretFile(
+                    file_path, self._ttl
+                )
+                secrets[file_path] = secret
+
+                node = config
+                for key in key_path[:-1]:
+                    node = node.setdefault(key, {})
+                node[key_path[-1]] = secret
+            self._secrets = secrets
+
+        if self._inject_at and config:
+            injected: dict = {}
+            dpath.new(injected, self._inject_at, config, separator=".")
+            config = injected
+
+        return config
+
+    def fingerprint(self) -> Optional[str]:
+        """Identifies the directory by path and by the paths of its secrets.
+
+        Rotating a secret doesn't change what `read` returns, so it doesn't change the fingerprint either; the new value
+        is picked up once the cached one expires.
+
+        Returns:
+            Optional[str]: The directory fingerprint.
+        """
+        file_paths = sorted(path for _, path in _scan_secrets(self._directory_path))
+        if file_paths:
+            directory_state = hashlib.sha256("\n".join(file_paths).encode()).hexdigest()
+        else:
+            directory_state = "absent"
+
+        return f"{type(self).__name__}:{self._directory_path}:{self._inject_at}:{self._ttl}:{directory_state}"
+
+
+def _scan_secrets(
+    directory_path: str, key_path: Tuple[str, ...] = ()
+) -> Iterator[Tuple[Tuple[str, ...], str]]:
+    """Walks the secrets directory with `os.scandir`, yielding the config key path and the file path of each secret."""
+    try:
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                # Skips hidden files, along with the `..data` links Kubernetes mounts secrets through.
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir():
+                    yield from _scan_secrets(entry.path, key_path + (entry.name,))
+                elif entry.is_file():
+                    yield key_path + (entry.name,), entry.path
+    except FileNotFoundError:
+        logger.debug(f"Secrets directory not found: {directory_path}; skipping...")
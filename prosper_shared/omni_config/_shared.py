@@ -0,0 +1,283 @@
+"""Contains utility methods and classes for sharing a resolved config between processes through shared memory.
+
+The config is serialized once into a compact, offset-indexed layout. Each node starts with a one-byte tag:
+
+- `N`, `T`, `F`: None, True, and False.
+- `I`, `D`: A 64-bit signed int or a 64-bit float.
+- `S`: A UTF-8 string, prefixed by its length.
+- `L`: A list, stored as the item count followed by the offset of each item.
+- `M`: A dict with string keys, stored as the entry count, the (key offset, value offset) of each entry in insertion
+  order, and the entry indices sorted by key so lookups can binary search them.
+- `P`: Any other value, pickled and prefixed by its length.
+
+The header holds the offset of the root node, and whether the config resolves `${...}` references. Attached processes
+look values up directly in the buffer and only decode the nodes they return.
+"""
+
+import pickle
+import struct
+import sys
+from functools import cached_property
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Optional, Set
+
+from prosper_shared.omni_config._config import (
+    _GLOB_CHARACTERS,
+    Config,
+    _get_path,
+    _to_index,
+)
+
+_SHARED_MAGIC = b"OMNISHM2"
+_HEADER = struct.Struct("<8sI?")
+_U32 = struct.Struct("<I")
+_I64 = struct.Struct("<q")
+_F64 = struct.Struct("<d")
+_ENTRY = struct.Struct("<II")
+
+_I64_RANGE = range(-(2**63), 2**63)
+
+# Names of the segments created by this process, which stay registered with its resource tracker until unlinked.
+_created_segment_names: Set[str] = set()
+
+
+class _SharedConfigEncoder:
+    """Serializes a config dict into the shared layout."""
+
+    def __init__(self):
+        self._buffer = bytearray(_HEADER.size)
+
+    def encode(self, config_dict: dict, interpolate: bool = False) -> bytes:
+        root_offset = self._encode(config_dict)
+        _HEADER.pack_into(self._buffer, 0, _SHARED_MAGIC, root_offset, interpolate)
+        return bytes(self._buffer)
+
+    def _append(self, *chunks: bytes) -> int:
+        offset = len(self._buffer)
+        for chunk in chunks:
+            self._buffer += chunk
+        return offset
+
+    def _encode(self, value: object) -> int:
+        if isinstance(value, dict) and all(isinstance(k, str) for k in value):
+            keys = [k.encode() for k in value]
+            entries = [
+                (self._append(_U32.pack(len(k)), k), self._encode(v))
+                for k, v in zip(keys, value.values())
+            ]
+            sorted_indices = sorted(range(len(keys)), key=keys.__getitem__)
+            return self._append(
+                b"M",
+                _U32.pack(len(entries)),
+                *(_ENTRY.pack(*e) for e in entries),
+                *(_U32.pack(i) for i in sorted_indices),
+            )
+        if isinstance(value, list):
+            item_offsets = [self._encode(v) for v in value]
+            return self._append(
+                b"L", _U32.pack(len(value)), *(_U32.pack(o) for o in item_offsets)
+            )
+        if value is None:
+            return self._append(b"N")
+        if isinstance(value, bool):
+            return self._append(b"T" if value else b"F")
+        if type(value) is int and value in _I64_RANGE:
+            return self._append(b"I", _I64.pack(value))
+        if type(value) is float:
+            return self._append(b"D", _F64.pack(value))
+        if type(value) is str:
+            encoded = value.encode()
+            return self._append(b"S", _U32.pack(len(encoded)), encoded)
+
+        pickled = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        return self._append(b"P", _U32.pack(len(pickled)), pickled)
+
+
+class _SharedConfigReader:
+    """Looks up and decodes values in a buffer holding the shared layout."""
+
+    def __init__(self, buffer: memoryview):
+        magic, self._root_offset, self.interpolate = _HEADER.unpack_from(buffer)
+        if magic != _SHARED_MAGIC:
+            raise ValueError("Buffer doesn't hold a shared config")
+        self._buffer = buffer
+
+    def get(self, path: List[str]) -> object:
+        offset = self._root_offset
+        for depth, segment in enumerate(path):
+            child_offset = self._find_child(offset, segment)
+            if child_offset is None:
+                if self._buffer[offset : offset + 1] == b"P":
+                    # Dicts with non-string keys are pickled, so they're searched once decoded.
+                    return _get_path(self.decode(offset), ".".join(path[depth:]))
+                return None
+            offset = child_offset
+        return self.decode(offset)
+
+    def _find_child(self, offset: int, segment: str) -> Optional[int]:
+        buffer = self._buffer
+        tag = buffer[offset : offset + 1].tobytes()
+        if tag == b"M":
+            count = _U32.unpack_from(buffer, offset + 1)[0]
+            entries_offset = offset + 1 + _U32.size
+            sorted_indices_offset = entries_offset + count * _ENTRY.size
+            wanted_key = segment.encode()
+            low, high = 0, count
+            while low < high:
+                middle = (low + high) // 2
+                index = _U32.unpack_from(
+                    buffer, sorted_indices_offset + middle * _U32.size
+                )[0]
+                key_offset, value_offset = _ENTRY.unpack_from(
+                    buffer, entries_offset + index * _ENTRY.size
+                )
+                key = self._read_bytes(key_offset)
+                if key == wanted_key:
+                    return value_offset
+                if key < wanted_key:
+                    low = middle + 1
+                else:
+                    high = middle
+        elif tag == b"L":
+            count = _U32.unpack_from(buffer, offset + 1)[0]
+            index = _to_index(segment)
+            if index is not None and -count <= index < count:
+                return _U32.unpack_from(
+                    buffer, offset + 1 + _U32.size * (1 + index % count)
+                )[0]
+        return None
+
+    def _read_bytes(self, offset: int) -> bytes:
+        length = _U32.unpack_from(self._buffer, offset)[0]
+        start = offset + _U32.size
+        return self._buffer[start : start + length].tobytes()
+
+    def decode(self, offset: Optional[int] = None) -> object:
+        buffer = self._buffer
+        offset = self._root_offset if offset is None else offset
+        tag = buffer[offset : offset + 1].tobytes()
+        if tag == b"M":
+            count = _U32.unpack_from(buffer, offset + 1)[0]
+            entries_offset = offset + 1 + _U32.size
+            return {
+                self._read_bytes(key_offset).decode(): self.decode(value_offset)
+                for key_offset, value_offset in (
+                    _ENTRY.unpack_from(buffer, entries_offset + i * _ENTRY.size)
+                    for i in range(count)
+                )
+            }
+        if tag == b"L":
+            count = _U32.unpack_from(buffer, offset + 1)[0]
+            return [
+                self.decode(_U32.unpack_from(buffer, offset + 1 + _U32.size * i)[0])
+                for i in range(1, count + 1)
+            ]
+        if tag == b"I":
+            return _I64.unpack_from(buffer, offset + 1)[0]
+        if tag == b"D":
+            return _F64.unpack_from(buffer, offset + 1)[0]
+        if tag == b"S":
+            return self._read_bytes(offset + 1).decode()
+        if tag == b"P":
+            return pickle.loads(self._read_bytes(offset + 1))
+        return {b"N": None, b"T": True, b"F": False}[tag]
+
+    def release(self) -> None:
+        self._buffer.release()
+
+
+def _share_config(
+    config_dict: dict, name: Optional[str] = None, interpolate: bool = False
+) -> SharedMemory:
+    """Serializes the config into a new shared memory segment.
+
+    Args:
+        config_dict (dict): The resolved config.
+        name (Optional[str]): The name of the segment; a unique name is generated if omitted.
+        interpolate (bool): Whether attached configs resolve `${...}` references to other config values.
+
+    Returns:
+        SharedMemory: The segment, owned by the caller.
+    """
+    return _create_segment(
+        _SharedConfigEncoder().encode(config_dict, interpolate), name
+    )
+
+
+def _create_segment(content: bytes, name: Optional[str] = None) -> SharedMemory:
+    """Copies the given content into a new shared memory segment.
+
+    Args:
+        content (bytes): The content of the segment.
+        name (Optional[str]): The name of the segment; a unique name is generated if omitted.
+
+    Returns:
+        SharedMemory: The segment, owned by the caller.
+    """
+    segment = SharedMemory(name=name, create=True, size=len(content))
+    segment.buf[: len(content)] = content
+    _created_segment_names.add(segment.name)
+    return segment
+
+
+def _attach_segment(name: str) -> SharedMemory:
+    """Attaches to a shared memory segment created by another process, without taking ownership of it.
+
+    Args:
+        name (str): The name of the segment.
+
+    Returns:
+        SharedMemory: The attached segment, which the caller must close but never unlink.
+    """
+    if sys.version_info >= (3, 13):  # pragma: no cover
+        return SharedMemory(name=name, track=False)
+
+    segment = SharedMemory(name=name)
+    # Attaching registers the segment with the resource tracker, which unlinks every segment still registered once the
+    # processes sharing the tracker exit, e.g. an unrelated process along with the workers it spawned. Only the
+    # creating process owns the segment, so every other process unregisters it right away. Workers sharing the
+    # creator's tracker drop its registration too, so the creator's tracker may report the segment as unknown when
+    # it's unlinked.
+    if name not in _created_segment_names:
+        resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+class _SharedMemoryConfig(Config):
+    """A read-only Config served directly from a shared memory segment created by `Config.share`."""
+
+    def __init__(self, name: str):
+        """Attaches to the shared memory segment with the given name.
+
+        Args:
+            name (str): The name of the shared memory segment.
+        """
+        super().__init__()
+        # Decoded lazily by the `_config_dict` property, only for operations that need the whole tree.
+        del self._config_dict
+        self._segment = _attach_segment(name)
+        self._reader = _SharedConfigReader(self._segment.buf.toreadonly())
+        if self._reader.interpolate:
+            # References can point anywhere in the tree, so interpolating configs decode it once on attach.
+            self._enable_interpolation()
+
+    @cached_property
+    def _config_dict(self) -> dict:
+        return self._reader.decode()
+
+    def _get_base(self, key: str) -> object:
+        """Looks the key up directly in the shared buffer, only decoding the value itself."""
+        if not key or _GLOB_CHARACTERS.intersection(key):
+            return _get_path(self._config_dict, key)
+
+        return self._reader.get(key.lstrip(".").split("."))
+
+    def __reduce_ex__(self, protocol):
+        # Other processes attach to the same segment instead of receiving a copy of the config.
+        return Config.attach, (self._segment.name,)
+
+    def close(self) -> None:
+        """Detaches from the shared memory segment."""
+        self._reader.release()
+        self._segment.close()
@@ -0,0 +1,217 @@
+"""Contains utility methods for saving resolved configs as snapshots and loading them without re-resolving them.
+
+A snapshot file consists of a fixed-size header, a JSON metadata block holding the fingerprints the config was resolved
+with, and the pickled config dict. Snapshots are only meant to be shared between processes of the same deployment, so
+they must only ever be loaded from trusted locations.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import struct
+import sys
+from enum import Enum
+from types import CodeType
+from typing import Any, Iterable, List, Optional
+
+from schema import Optional as SchemaOptional
+from schema import Regex
+
+from prosper_shared.omni_config._define import _ConfigKey, _SchemaType
+from prosper_shared.omni_config._parse import _ConfigurationSource
+
+logger = logging.getLogger(__name__)
+
+_SNAPSHOT_MAGIC = b"OMNICONF"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_HEADER = struct.Struct("<8sHI")
+
+
+def _canonicalize_schema(schema: Any) -> Any:
+    """Converts a schema into plain values with a stable representation across processes."""
+    if isinstance(schema, dict):
+        return sorted(
+            (
+                [_canonicalize_schema(k), _canonicalize_schema(v)]
+                for k, v in schema.items()
+            ),
+            key=json.dumps,
+        )
+    if isinstance(schema, (list, tuple)):
+        return [_canonicalize_schema(s) for s in schema]
+    if isinstance(schema, (set, frozenset)):
+        return sorted((_canonicalize_schema(s) for s in schema), key=json.dumps)
+    if isinstance(schema, _ConfigKey):
+        return [
+            "ConfigKey",
+            schema.schema,
+            schema.description,
+            _canonicalize_schema(schema.default),
+        ]
+    if isinstance(schema, SchemaOptional):
+        return [
+            "Optional",
+            _canonicalize_schema(schema.schema),
+            _canonicalize_schema(getattr(schema, "default", None)),
+        ]
+    if isinstance(schema, Regex):
+        return ["Regex", schema.pattern_str]
+    if isinstance(schema, Enum):
+        return ["Enum", type(schema).__qualname__, schema.name]
+    if isinstance(schema, (str, int, float, bool)) or schema is None:
+        return schema
+    if hasattr(schema, "__code__"):
+        # Lambdas all share a qualified name, so functions are also identified by their code and the values they
+        # capture.
+        return [
+            getattr(schema, "__module__", None),
+            schema.__qualname__,
+            _canonicalize_code(schema.__code__),
+            _canonicalize_schema(schema.__defaults__),
+            [
+                _canonicalize_schema(cell.cell_contents)
+                for cell in schema.__closure__ or ()
+            ],
+        ]
+    if hasattr(schema, "__qualname__"):
+        return [getattr(schema, "__module__", None), schema.__qualname__]
+    # Remaining values, e.g. `typing` constructs and schema combinators, are identified by their representation.
+    return repr(schema)
+
+
+def _canonicalize_code(code: CodeType) -> Any:
+    """Converts the code of a function into plain values, including the code of the functions defined within it."""
+    return [
+        code.co_code.hex(),
+        list(code.co_names),
+        [
+            (
+                _canonicalize_code(const)
+                if isinstance(const, CodeType)
+                else _canonicalize_schema(const)
+            )
+            for const in code.co_consts
+        ],
+    ]
+
+
+def _fingerprint_schema(schema: _SchemaType, validate: bool) -> str:
+    """Identifies the schema the config is resolved and validated with.
+
+    Args:
+        schema (_SchemaType): The realized schema.
+        validate (bool): Whether the config is validated against the schema.
+
+    Returns:
+        str: A digest of the schema.
+    """
+    canonical_schema = json.dumps([_canonicalize_schema(schema), validate])
+    return hashlib.sha256(canonical_schema.encode()).hexdigest()
+
+
+def _fingerprint_sources(
+    sources: Iterable[_ConfigurationSource],
+) -> Optional[List[str]]:
+    """Identifies the current state of each given source.
+
+    Args:
+        sources (Iterable[_ConfigurationSource]): The configuration sources.
+
+    Returns:
+        Optional[List[str]]: The source fingerprints in order, or None if any source can't be fingerprinted.
+    """
+    fingerprints = []
+    for source in sources:
+        fingerprint = source.fingerprint()
+        if fingerprint is None:
+            return None
+        fingerprints.append(fingerprint)
+    return fingerprints
+
+
+def _write_snapshot(
+    path: str,
+    config_dict: dict,
+    schema_fingerprint: str,
+    source_fingerprints: Optional[List[str]],
+) -> None:
+    """Saves the resolved config, replacing the snapshot at the given path atomically.
+
+    Args:
+        path (str): Where to write the snapshot.
+        config_dict (dict): The resolved config.
+        schema_fingerprint (str): The fingerprint of the schema the config was resolved with.
+        source_fingerprints (Optional[List[str]]): The fingerprints of the sources the config was resolved from.
+    """
+    if source_fingerprints is None:
+        logger.debug(f"Not writing config snapshot {path}; not all sources support it")
+        return
+
+    metadata = json.dumps(
+        {
+            "python": list(sys.version_info[:2]),
+            "schema": schema_fingerprint,
+            "sources": source_fingerprints,
+        }
+    ).encode()
+    payload = pickle.dumps(config_dict, protocol=pickle.HIGHEST_PROTOCOL)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.write(
+            _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, len(metadata))
+        )
+        snapshot_file.write(metadata)
+        snapshot_file.write(payload)
+    os.replace(temp_path, path)
+    logger.debug(f"Wrote config snapshot {path}")
+
+
+def _read_snapshot(
+    path: str, schema_fingerprint: str, source_fingerprints: Optional[List[str]]
+) -> Optional[dict]:
+    """Loads the resolved config from the snapshot at the given path if it still matches the given fingerprints.
+
+    Args:
+        path (str): Where to read the snapshot from.
+        schema_fingerprint (str): The fingerprint of the current schema.
+        source_fingerprints (Optional[List[str]]): The fingerprints of the current sources.
+
+    Returns:
+        Optional[dict]: The resolved config, or None if the snapshot is missing, unreadable, or stale.
+    """
+    if source_fingerprints is None:
+        return None
+
+    try:
+        with open(path, "rb") as snapshot_file:
+            snapshot = snapshot_file.read()
+    except OSError:
+        logger.debug(f"Config snapshot {path} not found")
+        return None
+
+    try:
+        magic, version, metadata_length = _SNAPSHOT_HEADER.unpack_from(snapshot)
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            logger.debug(f"Config snapshot {path} has an unsupported format")
+            return None
+
+        metadata_end = _SNAPSHOT_HEADER.size + metadata_length
+        metadata = json.loads(snapshot[_SNAPSHOT_HEADER.size : metadata_end])
+        if metadata != {
+            "python": list(sys.version_info[:2]),
+            "schema": schema_fingerprint,
+            "sources": source_fingerprints,
+        }:
+            logger.debug(f"Config snapshot {path} is stale")
+            return None
+
+        config_dict = pickle.loads(memoryview(snapshot)[metadata_end:])
+    except Exception as e:
+        logger.debug(f"Config snapshot {path} is corrupt: {e}")
+        return None
+
+    logger.debug(f"Loaded config snapshot {path}")
+    return config_dict
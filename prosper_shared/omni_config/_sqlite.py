@@ -0,0 +1,204 @@
+"""Contains a configuration source backed by a local SQLite database, for configs too large to load up front.
+
+The database holds one row per leaf value, keyed by its '.' separated path, with the value encoded as JSON. The path is
+the primary key of the table, so looking a value up is a single indexed query, and looking a subtree up is a single range
+scan over the paths below it. A bounded LRU cache in front of the database serves repeated lookups; it assumes the
+database doesn't change while the source is in use.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+from prosper_shared.omni_config._parse import _LazyConfigurationSource
+
+logger = logging.getLogger(__name__)
+
+_TABLE_NAME_PATTERN = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+_DEFAULT_CACHE_SIZE = 4096
+
+
+def _flatten_leaves(value: dict, path: str = "") -> Iterable[Tuple[str, str]]:
+    for key, nested in value.items():
+        nested_path = f"{path}.{key}" if path else str(key)
+        if isinstance(nested, dict) and nested:
+            yield from _flatten_leaves(nested, nested_path)
+        else:
+            # Values JSON can't represent, e.g. TOML dates, are stored as strings like environment variables are.
+            yield nested_path, json.dumps(nested, default=str)
+
+
+def _build_tree(rows: Iterable[Tuple[str, str]], prefix_length: int) -> Optional[dict]:
+    tree: dict = {}
+    for path, value in rows:
+        node = tree
+        *parents, leaf = path[prefix_length:].split(".")
+        for segment in parents:
+            node = node.setdefault(segment, {})
+        node[leaf] = json.loads(value)
+    return tree or None
+
+
+class _SqliteConfigurationSource(_LazyConfigurationSource):
+    """Configuration source that looks values up in a SQLite database keyed by '.' separated path."""
+
+    def __init__(
+        self,
+        database_path: str,
+        table: str = "config",
+        cache_size: int = _DEFAULT_CACHE_SIZE,
+    ):
+        """Creates a new SqliteConfigurationSource instance.
+
+        Arguments:
+            database_path (str): The path to the SQLite database, as written by `write`.
+            table (str): The table holding the config values.
+            cache_size (int): How many lookups to keep the result of.
+
+        Raises:
+            ValueError: If the table name isn't a valid identifier.
+        """
+        if not _TABLE_NAME_PATTERN.fullmatch(table):
+            raise ValueError(f"Invalid table name {table}")
+
+        self._database_path = database_path
+        self._table = table
+        self._cache_size = cache_size
+        self._connection: Optional[sqlite3.Connection] = None
+        self._cache: "OrderedDict[str, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def write(
+        cls, database_path: str, config_dict: dict, table: str = "config"
+    ) -> None:
+        """Writes the given config to a SQLite database, replacing any config previously written to the same table.
+
+        Args:
+            database_path (str): The path to the SQLite database, which is created if it doesn't exist.
+            config_dict (dict): The config to write.
+            table (str): The table to hold the config values.
+
+        Raises:
+            ValueError: If the table name isn't a valid identifier.
+        """
+        if not _TABLE_NAME_PATTERN.fullmatch(table):
+            raise ValueError(f"Invalid table name {table}")
+
+        connection = sqlite3.connect(database_path)
+        try:
+            with connection:
+                connection.execute(f"DROP TABLE IF EXISTS {table}")
+                connection.execute(
+                    f"CREATE TABLE {table} (path TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+                )
+                connection.executemany(
+                    f"INSERT INTO {table} (path, value) VALUES (?, ?)",
+                    _flatten_leaves(config_dict),
+                )
+        finally:
+            connection.close()
+
+    def read(self) -> dict:
+        """Reads every config value from the database.
+
+        Returns:
+            dict: The configuration values.
+        """
+        with self._lock:
+            return self._query("") or {}
+
+    def get(self, key: str) -> object:
+        """Looks a single config value up, querying the database only if the key isn't cached.
+
+        Args:
+            key (str): The '.' separated path to the config value.
+
+        Returns:
+            object: The config value, a nested dict for a path holding several values, or None if it doesn't exist.
+        """
+        key = key.strip(".")
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+            value = self._query(key)
+            self._cache[key] = value
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return value
+
+    def fingerprint(self) -> Optional[str]:
+        """Identifies the database by path and, if it exists, by modification time and size.
+
+        Returns:
+            Optional[str]: The database fingerprint.
+        """
+        try:
+            stat = os.stat(self._database_path)
+            file_state = f"{stat.st_mtime_ns}:{stat.st_size}"
+        except FileNotFoundError:
+            file_state = "absent"
+
+        return f"{type(self).__name__}:{self._database_path}:{self._table}:{file_state}"
+
+    def close(self) -> None:
+        """Closes the database connection, which is opened again by the next lookup."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _query(self, key: str) -> Optional[object]:
+        connection = self._connect()
+        if connection is None:
+            return None
+
+        if not key:
+            return _build_tree(
+                connection.execute(f"SELECT path, value FROM {self._table}"), 0
+            )
+
+        row = connection.execute(
+            f"SELECT value FROM {self._table} WHERE path = ?", (key,)
+        ).fetchone()
+        if row is not None:
+            return json.loads(row[0])
+
+        # '/' sorts right after '.', so the paths below the key are the ones between `key.` and `key/`.
+        return _build_tree(
+            connection.execute(
+                f"SELECT path, value FROM {self._table} WHERE path >= ? AND path < ?",
+                (f"{key}.", f"{key}/"),
+            ),
+            len(key) + 1,
+        )
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if self._connection is None:
+            if not os.path.exists(self._database_path):
+                logger.debug(
+                    f"Config database not found: {self._database_path}; skipping..."
+                )
+                return None
+
+            logger.debug(f"Opening config database {self._database_path}...")
+            # The connection is shared between threads behind the lock, and never writes.
+            self._connection = sqlite3.connect(
+                f"{Path(self._database_path).absolute().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+            )
+        return self._connection
+
+    def __reduce__(self):
+        # Other processes open their own connection to the database, starting with an empty cache.
+        return type(self), (self._database_path, self._table, self._cache_size)
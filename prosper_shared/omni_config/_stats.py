@@ -0,0 +1,158 @@
+"""Contains utility methods and classes for timing the phases of `Config.autoconfig`.
+
+Pass an `AutoconfigStats` instance to `autoconfig` to record how long realizing the schema, discovering the sources,
+reading each source, parsing each file, merging, validating, and building the argument parser take. Phases are recorded
+through a context variable, so the code paths shared with uninstrumented calls only pay for looking it up.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+_active_stats: ContextVar[Optional["_AutoconfigStats"]] = ContextVar(
+    "omni_config_autoconfig_stats", default=None
+)
+
+
+class _Phase(NamedTuple):
+    name: str
+    started_at: float
+    duration: float
+    thread_id: int
+    details: Dict[str, Any]
+
+
+class _AutoconfigStats:
+    """Records the duration of each phase of the `Config.autoconfig` calls it's passed to."""
+
+    def __init__(self):
+        """Creates an empty AutoconfigStats instance."""
+        self.phases: List[_Phase] = []
+        self._lock = threading.Lock()
+
+    def durations(self) -> Dict[str, float]:
+        """Sums up the duration of the phases by name.
+
+        Returns:
+            Dict[str, float]: The total duration of each phase in seconds, in the order the phases ended.
+        """
+        durations: Dict[str, float] = {}
+        for phase in self.phases:
+            durations[phase.name] = durations.get(phase.name, 0.0) + phase.duration
+        return durations
+
+    def log(
+        self, target: Optional[logging.Logger] = None, level: int = logging.INFO
+    ) -> None:
+        """Emits a log record for each phase, with the phase, duration, and details under `omni_config` in `extra`.
+
+        Args:
+            target (Optional[logging.Logger]): The logger to emit the records to. Defaults to this module's logger.
+            level (int): The level of the records.
+        """
+        target = target or logger
+        for phase in self.phases:
+            duration_ms = phase.duration * 1000
+            target.log(
+                level,
+                f"autoconfig phase {phase.name} took {duration_ms:.3f} ms",
+                extra={
+                    "omni_config": {
+                        "phase": phase.name,
+                        "duration_ms": duration_ms,
+                        **phase.details,
+                    }
+                },
+            )
+
+    def to_chrome_trace(self) -> dict:
+        """Converts the phases to the Chrome trace event format, e.g. for `chrome://tracing` or Perfetto.
+
+        Returns:
+            dict: The trace, holding a complete event for each phase.
+        """
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": phase.name,
+                    "cat": "omni_config",
+                    "ph": "X",
+                    "ts": phase.started_at * 1_000_000,
+                    "dur": phase.duration * 1_000_000,
+                    "pid": pid,
+                    "tid": phase.thread_id,
+                    "args": {key: str(value) for key, value in phase.details.items()},
+                }
+                for phase in self.phases
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, path: str) -> None:
+        """Writes the phases to a Chrome trace JSON file.
+
+        Args:
+            path (str): Where to write the trace.
+        """
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+
+    def _record(self, name: str, started_at: float, details: Dict[str, Any]) -> None:
+        phase = _Phase(
+            name,
+            started_at,
+            time.perf_counter() - started_at,
+            threading.get_ident(),
+            details,
+        )
+        with self._lock:
+            self.phases.append(phase)
+
+
+@contextmanager
+def _recording(stats: Optional[_AutoconfigStats]) -> Iterator[None]:
+    """Records the phases run in the current context to the given stats, if any.
+
+    Args:
+        stats (Optional[_AutoconfigStats]): The stats to record to.
+    """
+    if stats is None:
+        yield
+        return
+
+    token = _active_stats.set(stats)
+    try:
+        yield
+    finally:
+        _active_stats.reset(token)
+
+
+@contextmanager
+def _phase(name: str, **details: Any) -> Iterator[Dict[str, Any]]:
+    """Times the enclosed code as a phase of the stats recording in the current context, if any.
+
+    Args:
+        name (str): The phase name.
+        **details (Any): Details describing the phase, e.g. the path of the file read.
+
+    Yields:
+        Dict[str, Any]: The details, which the enclosed code can add to, e.g. the number of bytes read.
+    """
+    stats = _active_stats.get()
+    if stats is None:
+        yield details
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield details
+    finally:
+        stats._record(name, started_at, details)
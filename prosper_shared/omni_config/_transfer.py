@@ -0,0 +1,166 @@
+"""Contains utility methods and classes for sending configs to other processes, e.g. process pool workers.
+
+A config is pickled as its config dict and the settings it's resolved with, so the dict is serialized straight into the
+pickle stream.
+
+Handles go further for fan-out jobs: they are pickled as the digest of the serialized dict plus the name of a shared
+memory segment holding it. Each process resolves a digest once, then serves it from a per-process cache.
+"""
+
+import hashlib
+import logging
+import pickle
+from collections import OrderedDict
+from typing import Optional, Type
+
+from prosper_shared.omni_config._config import Config, _ConfigView
+from prosper_shared.omni_config._shared import _attach_segment, _create_segment
+
+logger = logging.getLogger(__name__)
+
+_MAX_CACHED_CONFIGS = 32
+
+_cached_configs: "OrderedDict[str, Config]" = OrderedDict()
+
+
+def _restore_config(
+    cls: Type[Config],
+    config_dict: dict,
+    interpolate: bool = False,
+    lazy_sources: tuple = (),
+    lazy_defaults: Optional[dict] = None,
+) -> Config:
+    return cls._wrap(config_dict, interpolate, lazy_sources, lazy_defaults)
+
+
+def _detach_view(config: Config) -> Config:
+    """Returns a config holding the same values that other processes can resolve without the parent of a view.
+
+    References are relative to the parent, so views of an interpolating config are replaced by a plain config holding
+    the resolved subtree.
+    """
+    if (
+        isinstance(config, _ConfigView)
+        and config._prefix
+        and config._interpolator is not None
+    ):
+        return Config._wrap(config._parent.get(config._prefix))
+    return config
+
+
+def _reduce_config(
+    config: Config, protocol: int, cls: Optional[Type[Config]] = None
+) -> tuple:
+    cls = cls if cls else type(config)
+    interpolate = config._interpolator is not None
+    # Lazy sources are sent along, and reopened by the receiving process on first lookup.
+    return _restore_config, (
+        cls,
+        config._config_dict,
+        interpolate,
+        config._lazy_sources,
+        config._lazy_defaults,
+    )
+
+
+def _cache_config(digest: str, config: Config) -> None:
+    _cached_configs[digest] = config
+    _cached_configs.move_to_end(digest)
+    while len(_cached_configs) > _MAX_CACHED_CONFIGS:
+        _cached_configs.popitem(last=False)
+
+
+def _resolve_config_handle(
+    digest: str,
+    segment_name: str,
+    size: int,
+    interpolate: bool = False,
+    lazy_sources: tuple = (),
+    lazy_defaults: Optional[dict] = None,
+) -> Config:
+    """Looks the config up in the per-process cache, only reading it from shared memory on the first miss."""
+    config = _cached_configs.get(digest)
+    if config is not None:
+        _cached_configs.move_to_end(digest)
+        return config
+
+    logger.debug(f"Loading config {digest} from shared memory segment {segment_name}")
+    segment = _attach_segment(segment_name)
+    try:
+        with segment.buf[:size] as payload:
+            config = _restore_config(
+                Config, pickle.loads(payload), interpolate, lazy_sources, lazy_defaults
+            )
+    finally:
+        segment.close()
+
+    _cache_config(digest, config)
+    return config
+
+
+class _ConfigHandle:
+    """A content-addressed reference to a config that's pickled as a digest instead of the config itself.
+
+    Unpickling a handle produces the referenced `Config`. The handle owns a shared memory segment holding the
+    serialized config, which every process without a cached copy reads once; close the handle once no process needs
+    to resolve it anymore.
+    """
+
+    def __init__(self, config: Config):
+        """Creates a ConfigHandle instance.
+
+        Args:
+            config (Config): The config to reference.
+        """
+        config = _detach_view(config)
+        payload = pickle.dumps(config._config_dict, protocol=pickle.HIGHEST_PROTOCOL)
+        self._interpolate = config._interpolator is not None
+        self._lazy_sources = config._lazy_sources
+        self._lazy_defaults = config._lazy_defaults
+        digest = hashlib.sha256(payload)
+        # The same tree resolves to different values with interpolation enabled or with lazy sources, so it's cached
+        # separately.
+        if self._interpolate:
+            digest.update(b"interpolate")
+        if self._lazy_sources:
+            digest.update(pickle.dumps((self._lazy_sources, self._lazy_defaults)))
+        self._digest = digest.hexdigest()
+        self._size = len(payload)
+        self._segment = _create_segment(payload)
+        # Forked workers inherit the cache, so they never have to read the segment. The cached config holds the
+        # current tree, in case the given config is updated later.
+        _cache_config(
+            self._digest,
+            Config._wrap(
+                config._config_dict,
+                self._interpolate,
+                self._lazy_sources,
+                self._lazy_defaults,
+            ),
+        )
+
+    @property
+    def digest(self) -> str:
+        """The digest identifying the referenced config."""
+        return self._digest
+
+    def close(self) -> None:
+        """Releases the shared memory segment holding the serialized config."""
+        self._segment.close()
+        self._segment.unlink()
+
+    def __enter__(self) -> "_ConfigHandle":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __reduce__(self):
+        return _resolve_config_handle, (
+            self._digest,
+            self._segment.name,
+            self._size,
+            self._interpolate,
+            self._lazy_sources,
+            self._lazy_defaults,
+        )
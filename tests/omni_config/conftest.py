@@ -0,0 +1,51 @@
+"""Provides the app directory the tests run `Config.autoconfig` in, for the app named by the test module's `APP_NAME`."""
+
+import json
+from typing import Dict
+
+import pytest
+
+from prosper_shared.omni_config import ConfigKey
+
+
+@pytest.fixture
+def app_name(request) -> str:
+    return request.module.APP_NAME
+
+
+@pytest.fixture
+def app_schema(app_name) -> dict:
+    return {app_name: {ConfigKey("key", "key desc", default="default"): str}}
+
+
+@pytest.fixture
+def app_config_files() -> Dict[str, dict]:
+    """The JSON config files to write to the app directory, by file name."""
+    return {}
+
+
+@pytest.fixture
+def realize_config_schemata(mocker, app_schema):
+    return mocker.patch(
+        "prosper_shared.omni_config._realize_config_schemata",
+        return_value=[app_schema],
+    )
+
+
+@pytest.fixture
+def app_dir(
+    mocker, monkeypatch, tmp_path, app_name, app_config_files, realize_config_schemata
+):
+    """Runs the test from a directory holding the app's config files, with the app schema as the only schema.
+
+    The user config directory is placed within it, and the command line holds no arguments.
+    """
+    monkeypatch.chdir(tmp_path)
+    mocker.patch("sys.argv", [app_name])
+    mocker.patch(
+        "platformdirs.user_config_dir", lambda app: str(tmp_path / "config" / app)
+    )
+    mocker.patch("prosper_shared.omni_config._realize_input_schemata", return_value=[])
+    for file_name, config in app_config_files.items():
+        (tmp_path / file_name).write_text(json.dumps(config))
+    return tmp_path
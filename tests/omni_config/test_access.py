@@ -0,0 +1,230 @@
+import pytest
+from schema import Optional as SchemaOptional
+from schema import Regex
+
+from prosper_shared.omni_config import AccessRecorder, Config, ConfigKey
+from prosper_shared.omni_config._access import _AccessReport
+
+CONFIG = {
+    "app": {
+        "url": "https://example.com",
+        "timeout": "5",
+        "retries": {"count": "3", "backoff": "1.5"},
+        "debug": "false",
+        "hosts": ["a", "b"],
+        "ports": [80, 443],
+    },
+    "other": "value",
+}
+
+SCHEMA = {
+    "app": {
+        ConfigKey("url", "The URL."): str,
+        SchemaOptional("timeout"): str,
+        "retries": {"count": str, ConfigKey("backoff", "The backoff."): str},
+        "debug": str,
+        "hosts": [str],
+        "ports": [int],
+        "empty": {},
+    },
+    Regex("^extra_"): str,
+    "other": str,
+}
+
+
+class TestAccess:
+    @pytest.fixture
+    def recorder(self):
+        return AccessRecorder(sample_every=1)
+
+    @pytest.fixture
+    def config(self, recorder):
+        config = Config(CONFIG)
+        config.record_access(recorder)
+        return config
+
+    def test_get_is_counted(self, config, recorder):
+        config.get("app.url")
+        config.get("app.url")
+        config.get(".app.url")
+        config.get("missing")
+
+        report = recorder.report(SCHEMA)
+
+        assert report.hot_keys == [("app.url", 3), ("missing", 1)]
+
+    def test_get_as_accessors_are_counted(self, config, recorder):
+        for _ in range(3):
+            assert config.get_as_decimal("app.timeout") == 5
+            assert config.get_as_bool("app.debug") is False
+            assert config.get_as_frozenset("app.hosts") == {"a", "b"}
+            assert list(config.get_as_array("app.ports", "q")) == [80, 443]
+
+        report = recorder.report(SCHEMA)
+
+        assert dict(report.hot_keys) == {
+            "app.timeout": 3,
+            "app.debug": 3,
+            "app.hosts": 3,
+            "app.ports": 3,
+        }
+
+    def test_overridden_get_as_accessors_are_counted(self, config, recorder):
+        with config.override({"app": {"timeout": "10"}}):
+            assert config.get_as_frozenset("app.hosts") == {"a", "b"}
+            assert config.get_as_frozenset("app.hosts") == {"a", "b"}
+
+        assert recorder.report(SCHEMA).hot_keys == [("app.hosts", 2)]
+
+    def test_never_read(self, config, recorder):
+        config.get("app.url")
+        config.get("app.retries")
+
+        report = recorder.report(SCHEMA)
+
+        assert report.never_read == [
+            "app.timeout",
+            "app.debug",
+            "app.hosts",
+            "app.ports",
+            "app.empty",
+            "other",
+        ]
+
+    def test_reading_root_reads_everything(self, config, recorder):
+        config.get("app")
+        config.get("other")
+
+        assert recorder.report(SCHEMA).never_read == []
+
+    def test_globs_dont_mark_keys_read(self, config, recorder):
+        config.get("app.u*")
+
+        assert "app.url" in recorder.report(SCHEMA).never_read
+
+    def test_default_schema(self, config, recorder, mocker):
+        mocker.patch(
+            "prosper_shared.omni_config._realize_input_schemata", return_value=[]
+        )
+        mocker.patch(
+            "prosper_shared.omni_config._realize_config_schemata",
+            return_value=[{"app": {ConfigKey("url", "The URL."): str}}],
+        )
+
+        assert recorder.report().never_read == ["app.url"]
+        config.get("app.url")
+        assert recorder.report().never_read == []
+
+    def test_top(self, config, recorder):
+        for count, key in enumerate(["a", "b", "c"], start=1):
+            for _ in range(count):
+                config.get(key)
+
+        assert recorder.report({}, top=2).hot_keys == [("c", 3), ("b", 2)]
+        assert len(recorder.report({}, top=None).hot_keys) == 3
+
+    def test_call_sites(self, config, recorder):
+        config.get("app.url")
+        config.get_as_str("app.url")
+
+        report = recorder.report(SCHEMA)
+
+        call_sites = report.call_sites["app.url"]
+        assert len(call_sites) == 2
+        for call_site, count in call_sites:
+            assert call_site.startswith(f"{__file__}:")
+            assert call_site.endswith(" in test_call_sites")
+            assert count == 1
+
+    def test_sampling(self, mocker):
+        recorder = AccessRecorder(sample_every=3)
+        sample_spy = mocker.spy(recorder, "_sample")
+        config = Config(CONFIG)
+        config.record_access(recorder)
+
+        for _ in range(7):
+            config.get("app.url")
+
+        assert sample_spy.call_count == 2
+        report = recorder.report(SCHEMA)
+        assert report.hot_keys == [("app.url", 7)]
+        assert sum(count for _, count in report.call_sites["app.url"]) == 2
+
+    def test_capture_stacks(self):
+        recorder = AccessRecorder(sample_every=1, capture_stacks=True, stack_limit=2)
+        config = Config(CONFIG)
+        config.record_access(recorder)
+
+        config.get("app.url")
+
+        ((stack, _),) = recorder.report(SCHEMA).call_sites["app.url"]
+        assert stack.count('  File "') == 2
+        assert "in test_capture_stacks" in stack
+        assert "config.get" in stack
+
+    def test_calls_from_within_package_are_skipped(self, recorder, mocker):
+        # Every frame is within the package.
+        mocker.patch("prosper_shared.omni_config._access._PACKAGE_DIRECTORY", "")
+        config = Config(CONFIG)
+        config.record_access(recorder)
+
+        config.get("app.url")
+
+        report = recorder.report(SCHEMA)
+        assert report.hot_keys == [("app.url", 1)]
+        assert report.call_sites == {}
+
+    def test_views(self, config, recorder):
+        view = config.view("app")
+        nested_view = view.view("retries")
+
+        view.get("url")
+        view.get_as_frozenset("hosts")
+        view.get_as_frozenset("hosts")
+        nested_view.get_as_decimal("count")
+
+        assert dict(recorder.report(SCHEMA).hot_keys) == {
+            "app.url": 1,
+            "app.hosts": 2,
+            "app.retries.count": 1,
+        }
+
+    def test_views_attach_to_parent(self, recorder):
+        config = Config(CONFIG)
+
+        config.view("app").record_access(recorder)
+        config.get("other")
+
+        assert recorder.report(SCHEMA).hot_keys == [("other", 1)]
+
+    def test_detach(self, config, recorder):
+        config.get("app.url")
+        config.record_access(None)
+        config.get("app.url")
+
+        assert recorder.report(SCHEMA).hot_keys == [("app.url", 1)]
+
+    def test_unrecorded_configs(self, recorder):
+        config = Config(CONFIG)
+
+        config.get("app.url")
+
+        assert recorder.report(SCHEMA) == _AccessReport([], list(_flat_keys()), {})
+
+    def test_invalid_sampling_interval(self):
+        with pytest.raises(ValueError, match="positive sampling interval"):
+            AccessRecorder(sample_every=0)
+
+
+def _flat_keys():
+    return [
+        "app.url",
+        "app.timeout",
+        "app.retries.count",
+        "app.retries.backoff",
+        "app.debug",
+        "app.hosts",
+        "app.ports",
+        "app.empty",
+        "other",
+    ]
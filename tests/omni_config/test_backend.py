@@ -0,0 +1,180 @@
+import json
+import subprocess
+import sys
+from os.path import dirname, join
+
+import pytest
+
+from prosper_shared.omni_config import (
+    JsonConfigurationSource,
+    ParserBackend,
+    TomlConfigurationSource,
+    YamlConfigurationSource,
+    _backend,
+    register_parser_backend,
+)
+from prosper_shared.omni_config._backend import (
+    _find_spec_without_importing,
+    _has_parser_backend,
+    _loads_with_module,
+    _select_parser_backend,
+)
+
+EXPECTED_CONFIG = {
+    "section1": {
+        "float_config": 123.456,
+        "int_config": 123,
+        "list_config": ["asdf", "qwer"],
+        "string_config": "string value",
+    }
+}
+
+SOURCES_BY_FORMAT = {
+    "json": (JsonConfigurationSource, "test_parse.json"),
+    "toml": (TomlConfigurationSource, "test_parse.toml"),
+    "yaml": (YamlConfigurationSource, "test_parse.yaml"),
+}
+
+
+def _all_backends(*file_formats):
+    return [
+        pytest.param(file_format, backend, id=f"{file_format}-{backend.name}")
+        for file_format, backends in _backend._parser_backends.items()
+        for backend in backends
+        if not file_formats or file_format in file_formats
+    ]
+
+
+class TestBackend:
+    @pytest.fixture(autouse=True)
+    def reset_backend_registry(self, mocker):
+        mocker.patch.object(
+            _backend,
+            "_parser_backends",
+            {k: list(v) for k, v in _backend._parser_backends.items()},
+        )
+        mocker.patch.object(_backend, "_selected_parser_backends", {})
+
+    @pytest.mark.parametrize(["file_format", "backend"], _all_backends())
+    def test_backend_parity(self, file_format, backend):
+        if not backend.is_available():
+            pytest.skip(f"{backend.name} is not installed")
+        source_type, file_name = SOURCES_BY_FORMAT[file_format]
+
+        config = source_type(
+            join(dirname(__file__), "data", file_name), parser_backend=backend.name
+        ).read()
+
+        assert config == EXPECTED_CONFIG
+
+    @pytest.mark.parametrize(["file_format", "backend"], _all_backends("toml"))
+    def test_backend_parity_with_config_root(self, file_format, backend):
+        if not backend.is_available():
+            pytest.skip(f"{backend.name} is not installed")
+
+        config = TomlConfigurationSource(
+            join(dirname(__file__), "data", "test_parse_config.toml"),
+            "tool.lib-name",
+            parser_backend=backend.name,
+        ).read()
+
+        assert config == EXPECTED_CONFIG
+
+    def test_select_fastest_available(self):
+        register_parser_backend(
+            "json",
+            ParserBackend("missing", "nonexistent_json_module", _loads_with_module),
+            prefer=True,
+        )
+
+        assert _select_parser_backend("json").name in {"orjson", "json"}
+
+    def test_select_preferred_backend(self):
+        preferred_backend = ParserBackend("preferred", "json", _loads_with_module)
+
+        assert _select_parser_backend("json").name != "preferred"
+        register_parser_backend("json", preferred_backend, prefer=True)
+
+        assert _select_parser_backend("json") is preferred_backend
+
+    def test_select_logs_selection(self, caplog):
+        with caplog.at_level("DEBUG", logger=_backend.logger.name):
+            _select_parser_backend("json")
+
+        assert "parser backend for json files" in caplog.text
+
+    def test_register_new_format(self):
+        backend = ParserBackend("ini", "configparser", _loads_with_module)
+        register_parser_backend("ini", backend)
+
+        assert _select_parser_backend("ini") is backend
+        assert repr(backend) == "ParserBackend(name=ini,module_name=configparser)"
+
+    def test_select_no_backend_installed(self):
+        assert not _has_parser_backend("unknown-format")
+        with pytest.raises(ImportError):
+            _select_parser_backend("unknown-format")
+
+    def test_select_unknown_backend(self):
+        with pytest.raises(ValueError):
+            _select_parser_backend("json", "unknown")
+
+    def test_select_uninstalled_backend(self):
+        register_parser_backend(
+            "json",
+            ParserBackend("missing", "nonexistent.json_module", _loads_with_module),
+        )
+
+        with pytest.raises(ImportError):
+            _select_parser_backend("json", "missing")
+
+    @pytest.mark.parametrize(["file_format", "backend"], _all_backends("json"))
+    @pytest.mark.parametrize(
+        "content",
+        [
+            '{"nan": NaN, "infinity": Infinity, "negative_infinity": -Infinity}',
+            '{"overflow": 1e400}',
+            '{"big_int": 18446744073709551616, "small_int": -9223372036854775809}',
+            '{"max_int": 9223372036854775807, "string": "1234567890123456789"}',
+            '{"surrogate": "\\ud800"}',
+        ],
+    )
+    def test_json_backend_semantics_match_json(self, file_format, backend, content):
+        if not backend.is_available():
+            pytest.skip(f"{backend.name} is not installed")
+
+        config = backend.loads(content)
+
+        # NaN doesn't equal itself, so the values are compared by their repr.
+        assert repr(config) == repr(json.loads(content))
+
+    @pytest.mark.parametrize(["file_format", "backend"], _all_backends("json"))
+    def test_json_backend_rejects_invalid_json(self, file_format, backend):
+        if not backend.is_available():
+            pytest.skip(f"{backend.name} is not installed")
+
+        with pytest.raises(ValueError):
+            backend.loads('{"invalid": }')
+
+    def test_availability_check_does_not_import_backends(self):
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys; from prosper_shared.omni_config._backend import _has_parser_backend; "
+                "_has_parser_backend('yaml'); _has_parser_backend('json'); "
+                "print(sorted({'yaml', 'orjson'} & set(sys.modules)))",
+            ],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
+
+    def test_find_spec_without_importing(self):
+        assert _find_spec_without_importing("json.decoder") is not None
+        assert _find_spec_without_importing("json.nonexistent") is None
+        assert _find_spec_without_importing("nonexistent_package.module") is None
+        # Plain modules can't contain submodules.
+        assert _find_spec_without_importing("subprocess.module") is None
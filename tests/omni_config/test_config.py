@@ -1,4 +1,5 @@
 import enum
+from array import array
 from decimal import Decimal
 from enum import Enum
 from os import getcwd
@@ -11,7 +12,14 @@ from platformdirs import user_config_dir
 from schema import Optional as SchemaOptional
 from schema import Regex, SchemaError
 
-from prosper_shared.omni_config import Config, ConfigKey, config_schema, get_config_help
+from prosper_shared.omni_config import (
+    Config,
+    ConfigKey,
+    _define,
+    config_schema,
+    get_config_help,
+)
+from prosper_shared.omni_config._secrets import _SecretFile
 
 TEST_CONFIG = {
     "testSection": {
@@ -113,6 +121,85 @@ class TestConfig:
             "testSection.testDecimalNotFound", Decimal("0")
         ) == Decimal("0")
 
+    def test_get_as_array(self):
+        config = Config({"grid": [1.5, 2.5], "ids": list(range(1000)), "bad": [2**64]})
+
+        ids = config.get_as_array("ids", "q")
+
+        assert ids == array("q", range(1000))
+        assert config.get_as_array("ids", "q") is ids
+        assert config.get_as_array("ids", "l") is not ids
+        assert config.get_as_array("grid", "d") == array("d", [1.5, 2.5])
+        assert config.get_as_array("missing", "q") is None
+        assert config.get_as_array("missing", "q", array("q")) == array("q")
+        with pytest.raises(OverflowError):
+            config.get_as_array("bad", "q")
+        with pytest.raises(TypeError):
+            config.get_as_array("grid", "q")
+
+    def test_get_as_frozenset(self):
+        config = Config({"ids": [1, 2, 2, 3], "nested": {"ids": [4]}})
+
+        ids = config.get_as_frozenset("ids")
+
+        assert ids == frozenset({1, 2, 3})
+        assert config.get_as_frozenset("ids") is ids
+        assert config.get_as_frozenset("missing") is None
+        assert config.get_as_frozenset("missing", frozenset()) == frozenset()
+        assert config.view("nested").get_as_frozenset("ids") is (
+            config.get_as_frozenset("nested.ids")
+        )
+
+    def test_converted_values_are_dropped_on_update(self):
+        config = Config({"ids": [1, 2]})
+        ids = config.get_as_frozenset("ids")
+
+        config._config_dict = {"ids": [3]}
+
+        assert config.get_as_frozenset("ids") == frozenset({3})
+        config._config_dict = {"ids": [1, 2]}
+        assert config.get_as_frozenset("ids") is not ids
+
+    def test_converted_values_follow_reloaded_lazy_values(self, tmp_path):
+        secret_path = tmp_path / "secret"
+        secret_path.write_text("ab")
+        config = Config({"secret": _SecretFile(str(secret_path), ttl=0)})
+
+        assert config.get_as_frozenset("secret") == frozenset("ab")
+        secret_path.write_text("cd")
+
+        assert config.get_as_frozenset("secret") == frozenset("cd")
+
+    def test_converted_values_from_lazy_values_are_reused(self, tmp_path):
+        secret_path = tmp_path / "secret"
+        secret_path.write_text("ab")
+        config = Config({"secret": _SecretFile(str(secret_path), ttl=None)})
+
+        secret = config.get_as_frozenset("secret")
+
+        assert config.get_as_frozenset("secret") is secret
+
+    def test_converted_values_are_not_cached_with_lazy_sources(self, mocker):
+        source = mocker.Mock(**{"get.return_value": [1, 2]})
+        config = Config({}, lazy_sources=[source])
+
+        assert config.get_as_frozenset("ids") == frozenset({1, 2})
+        source.get.return_value = [3]
+        assert config.get_as_frozenset("ids") == frozenset({3})
+
+    def test_converted_values_are_not_cached_while_overridden(self):
+        config = Config({"ids": [1, 2], "nested": {"ids": [4]}})
+        ids = config.get_as_frozenset("ids")
+
+        with config.override({"ids": [3], "nested.ids": [5]}):
+            assert config.get_as_frozenset("ids") == frozenset({3})
+            assert config.get_as_array("ids", "q") == array("q", [3])
+            assert config.view("nested").get_as_frozenset("ids") == frozenset({5})
+            assert config.get_as_frozenset("missing") is None
+
+        assert config.get_as_frozenset("ids") is ids
+        assert config.view("nested").get_as_frozenset("ids") == frozenset({4})
+
     @pytest.mark.parametrize(
         ["config_value", "given_default", "expected_value"],
         [
@@ -142,6 +229,216 @@ class TestConfig:
             config.get_as_type("testSection.nonexistentTypeKey", enum.Enum) == enum.Enum
         )
 
+    def test_get_as_type_uses_resolved_type_cache(self, mocker):
+        mocker.patch.object(_define, "_resolved_type_cache", {"my.Type": ContrivedEnum})
+        config = Config(config_dict={"type_config": "my.Type"})
+
+        assert config.get_as_type("type_config") is ContrivedEnum
+
+    def test_fingerprint(self):
+        config = Config(config_dict={"a": {"b": 1, "c": [1, 2]}, "d": "value"})
+
+        assert config.fingerprint == config.fingerprint
+        assert (
+            config.fingerprint
+            == Config(
+                config_dict={"d": "value", "a": {"c": [1, 2], "b": 1}}
+            ).fingerprint
+        )
+        assert (
+            config.fingerprint
+            != Config(
+                config_dict={"a": {"b": 1, "c": [2, 1]}, "d": "value"}
+            ).fingerprint
+        )
+        assert (
+            config.fingerprint
+            != Config(
+                config_dict={"a": {"b": 1.0, "c": [1, 2]}, "d": "value"}
+            ).fingerprint
+        )
+
+    def test_fingerprint_reuses_unchanged_subtrees(self):
+        config = Config(config_dict={"a": {"b": 1}, "c": {"d": [1, 2]}})
+        fingerprint = config.fingerprint
+        digest_tree = config._digest_tree
+
+        assert config.fingerprint == fingerprint
+        assert config._digest_tree is digest_tree
+
+        config._config_dict = {**config._config_dict, "a": {"b": 2}}
+
+        assert config.fingerprint != fingerprint
+        assert config.fingerprint == Config(config._config_dict).fingerprint
+        assert config._digest_tree[2]["c"] is digest_tree[2]["c"]
+
+    def test_eq_and_hash(self):
+        config = Config(config_dict={"a": {"b": 1}})
+
+        assert config == config
+        assert config != Config(config_dict={"a": {"b": 1}})
+        assert config != config.freeze()
+        assert len({config, Config(config_dict={"a": {"b": 1}})}) == 2
+
+    def test_frozen_eq_and_hash(self):
+        config = Config(config_dict={"a": {"b": 1}}).freeze()
+        equal_config = Config(config_dict={"a": {"b": 1}}).freeze()
+
+        assert config == equal_config
+        assert hash(config) == hash(equal_config)
+        assert config != Config(config_dict={"a": {"b": 2}}).freeze()
+        assert config != Config(config_dict={"a": {"b": 1}})
+        assert config != {"a": {"b": 1}}
+        assert len({config, equal_config}) == 1
+
+    def test_frozen_eq_includes_interpolation(self):
+        config_dict = {"a": "${b}", "b": "value"}
+
+        assert (
+            Config(config_dict, interpolate=True).freeze()
+            != Config(config_dict).freeze()
+        )
+        assert (
+            Config(config_dict, interpolate=True).freeze()
+            == Config(config_dict, interpolate=True).freeze()
+        )
+
+    def test_fingerprint_includes_lazy_sources(self, mocker):
+        source = mocker.Mock(**{"fingerprint.return_value": "source"})
+        unfingerprinted_source = mocker.Mock(**{"fingerprint.return_value": None})
+        other_unfingerprinted_source = mocker.Mock(**{"fingerprint.return_value": None})
+
+        fingerprints = {
+            Config({}).fingerprint,
+            Config({}, lazy_sources=[source]).fingerprint,
+            Config({}, lazy_sources=[unfingerprinted_source]).fingerprint,
+            Config({}, lazy_sources=[other_unfingerprinted_source]).fingerprint,
+        }
+
+        assert len(fingerprints) == 4
+        assert (
+            Config({}, lazy_sources=[source]).fingerprint
+            == Config({}, lazy_sources=[source]).fingerprint
+        )
+
+    @pytest.mark.parametrize(
+        ["key", "expected_value"],
+        [
+            ("section.list.1.key", "second"),
+            ("section.list.2.key", None),
+            ("section.list.key", None),
+            ("section.string.0", None),
+            (".section.string", "value"),
+            ("section.*.1.key", "second"),
+            ("section.str?ng", "value"),
+        ],
+    )
+    def test_get_path(self, key, expected_value):
+        config = Config(
+            config_dict={
+                "section": {
+                    "list": [{"key": "first"}, {"key": "second"}],
+                    "string": "value",
+                }
+            }
+        )
+
+        assert config.get(key) == expected_value
+
+    @pytest.mark.parametrize(
+        ["config_dict", "key"],
+        [
+            ({"m": {1: "one"}}, "m.1"),
+            ({"m": {1: "one"}}, "m.01"),
+            ({"m": {1: "one"}}, "m.2"),
+            ({"t": {True: "yes", False: "no"}}, "t.True"),
+            ({"t": {True: "yes", False: "no"}}, "t.False"),
+            ({"t": {True: "yes", False: "no"}}, "t.1"),
+            ({"t": {True: "yes"}}, "t.true"),
+            ({"n": {None: "none"}}, "n.None"),
+            ({"a": [1, 2, 3]}, "a.-1"),
+            ({"a": [1, 2, 3]}, "a.-3"),
+            ({"a": [1, 2, 3]}, "a.-4"),
+            ({"a": [1, 2, 3]}, "a.3"),
+            ({"a": [1, 2, 3]}, "a.x"),
+            ({"a": (1, 2, 3)}, "a.1"),
+            ({"a": {"b": None}}, "a.b"),
+            ({"a": {"b": None}}, "a.b.c"),
+            ({"a": {"b": "c"}}, "..a.b"),
+            ({"a": {"b": "c"}}, "a.b.0"),
+        ],
+    )
+    def test_get_path_matches_dpath(self, config_dict, key):
+        import dpath
+
+        assert Config(config_dict=config_dict).get(key) == dpath.get(
+            config_dict, key, separator=".", default=None
+        )
+
+    def test_get_empty_path(self):
+        config = Config(config_dict={"a": 1})
+
+        assert config.get("") == {"a": 1}
+
+    @pytest.mark.parametrize(
+        ["prefix", "key", "expected_value"],
+        [
+            ("section", "string", "value"),
+            ("section", ".string", "value"),
+            (".section.", "list.1.key", "second"),
+            ("section.list", "0.key", "first"),
+            ("section", "*.1.key", "second"),
+            ("", "section.string", "value"),
+            ("missing", "string", None),
+        ],
+    )
+    def test_view(self, prefix, key, expected_value):
+        config = Config(
+            config_dict={
+                "section": {
+                    "list": [{"key": "first"}, {"key": "second"}],
+                    "string": "value",
+                }
+            }
+        )
+
+        assert config.view(prefix).get(key) == expected_value
+
+    def test_view_shares_parent_storage(self):
+        config = Config(config_dict=TEST_CONFIG)
+
+        view = config.view("testSection")
+
+        assert view._config_dict is config._config_dict["testSection"]
+        assert view.get_as_str("testString") == "stringValue"
+        assert view.get_as_bool("testBoolTrue") is True
+        assert (
+            view.fingerprint
+            == Config(config_dict=TEST_CONFIG["testSection"]).fingerprint
+        )
+        assert config.view("")._config_dict is config._config_dict
+        config._config_dict = {"testSection": {"testString": "reloaded"}}
+        assert view.get("testString") == "reloaded"
+
+    def test_nested_view(self):
+        config = Config(config_dict={"a": {"b": {"c": "value"}}})
+
+        view = config.view("a").view("b")
+
+        assert view._parent is config
+        assert view.get("c") == "value"
+        assert config.view("a").view("")._prefix == "a"
+        assert config.view("").view("a.b").get("c") == "value"
+
+    def test_view_eq_and_hash(self):
+        config = Config(config_dict=TEST_CONFIG)
+        view = config.view("testSection")
+
+        assert view == view
+        assert view != config.view("testSection")
+        assert len({view, config.view("testSection")}) == 2
+        assert view.fingerprint == config.view("testSection").fingerprint
+
     def test_get_invalid_key(self):
         config = Config(config_dict=TEST_CONFIG)
 
@@ -293,6 +590,32 @@ class TestConfig:
             any_order=False,
         )
 
+    @pytest.mark.parametrize(
+        ["default_value", "expected_exception"], [("value", None), (123, SchemaError)]
+    )
+    def test_autoconfig_validate(self, mocker, default_value, expected_exception):
+        mocker.patch("sys.argv", ["validated-app"])
+        mocker.patch(
+            "prosper_shared.omni_config._realize_config_schemata",
+            return_value=[
+                {
+                    "validated-app": {
+                        ConfigKey("key", "key desc", default=default_value): str
+                    }
+                }
+            ],
+        )
+        mocker.patch(
+            "prosper_shared.omni_config._realize_input_schemata", return_value=[]
+        )
+
+        if expected_exception:
+            with pytest.raises(expected_exception):
+                Config.autoconfig("validated-app", validate=True)
+        else:
+            config = Config.autoconfig("validated-app", validate=True)
+            assert config.get("validated-app.key") == default_value
+
     def test_get_config_help(self, mocker, snapshot):
         test_config_schema = {
             ConfigKey("key1", description="key1 desc"): str,
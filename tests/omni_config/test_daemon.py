@@ -0,0 +1,416 @@
+import json
+import os
+import pickle
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import threading
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from prosper_shared.omni_config import Config
+from prosper_shared.omni_config._config import _replace_path
+from prosper_shared.omni_config._daemon import (
+    _ConfigDaemon,
+    _decode_value,
+    _encode_message,
+    main,
+)
+
+APP_NAME = "daemon-app"
+CONFIG_FILE = f".{APP_NAME}.json"
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets are not supported"
+)
+
+
+class TestDaemon:
+    @pytest.fixture
+    def app_config_files(self):
+        return {CONFIG_FILE: {APP_NAME: {"other": "value", "nested": {"a": 1, "b": 2}}}}
+
+    @pytest.fixture
+    def daemon(self, app_dir):
+        daemon = _ConfigDaemon(
+            str(app_dir / "daemon.sock"), APP_NAME, poll_interval=0.01
+        )
+        thread = threading.Thread(target=daemon.serve_forever)
+        thread.start()
+        yield daemon
+        daemon.shutdown()
+        thread.join()
+
+    def _update_config_file(self, config):
+        # The app directory is the working directory.
+        config_file = Path(CONFIG_FILE)
+        stat = config_file.stat()
+        # Replaces the file at once, so the daemon never reads a partially written file.
+        new_config_file = config_file.with_suffix(".new")
+        new_config_file.write_text(json.dumps(config))
+        os.replace(new_config_file, config_file)
+        # Make sure the change is visible even on file systems with a coarse modification time.
+        os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def test_subscribe(self, daemon, app_dir):
+        config = Config.subscribe(str(app_dir / "daemon.sock"))
+        try:
+            assert config.version == 1
+            assert config.get(f"{APP_NAME}.key") == "default"
+            assert config.get(f"{APP_NAME}.other") == "value"
+            previous_tree = config._config_dict
+
+            self._update_config_file(
+                {APP_NAME: {"key": "from file", "nested": {"a": 1, "c": 3}}}
+            )
+
+            previous_fingerprint = config.fingerprint
+
+            assert config.wait_for_version(2, timeout=5)
+            assert config.fingerprint != previous_fingerprint
+            assert config.get(APP_NAME) == {
+                "key": "from file",
+                "nested": {"a": 1, "c": 3},
+            }
+            assert previous_tree[APP_NAME]["other"] == "value"
+        finally:
+            config.close()
+
+        assert config.get(f"{APP_NAME}.key") == "from file"
+        unpickled = pickle.loads(pickle.dumps(config))
+        assert type(unpickled) is Config
+        assert unpickled._config_dict == config._config_dict
+
+    def test_subscribe_with_interpolation(self, daemon, app_dir):
+        config = Config.subscribe(str(app_dir / "daemon.sock"), interpolate=True)
+        try:
+            self._update_config_file({APP_NAME: {"other": "${%s.key}/path" % APP_NAME}})
+            assert config.wait_for_version(2, timeout=5)
+            assert config.get(f"{APP_NAME}.other") == "default/path"
+
+            self._update_config_file(
+                {APP_NAME: {"key": "changed", "other": "${%s.key}/path" % APP_NAME}}
+            )
+
+            assert config.wait_for_version(3, timeout=5)
+            assert config.get(f"{APP_NAME}.other") == "changed/path"
+        finally:
+            config.close()
+
+    def test_subscribe_with_file_reference(self, daemon, app_dir):
+        (app_dir / "notes.txt").write_text("sidecar")
+        config = Config.subscribe(str(app_dir / "daemon.sock"))
+        try:
+            self._update_config_file(
+                {
+                    APP_NAME: {
+                        "notes": {"$file": "notes.txt", "$encoding": "utf-8"},
+                    }
+                }
+            )
+            assert config.wait_for_version(2, timeout=5)
+
+            assert config.get(f"{APP_NAME}.notes") == "sidecar"
+        finally:
+            config.close()
+
+    def test_refresh_without_changes(self, app_dir):
+        daemon = _ConfigDaemon(str(app_dir / "daemon.sock"), APP_NAME)
+
+        assert daemon.refresh()
+        assert not daemon.refresh()
+        self._update_config_file(
+            {APP_NAME: {"other": "value", "nested": {"b": 2, "a": 1}}}
+        )
+        assert not daemon.refresh()
+        assert daemon.version == 1
+
+    def test_refresh_with_unfingerprinted_source(self, mocker, app_dir):
+        mocker.patch(
+            "prosper_shared.omni_config._parse._EnvironmentVariableSource.fingerprint",
+            return_value=None,
+        )
+        daemon = _ConfigDaemon(str(app_dir / "daemon.sock"), APP_NAME)
+
+        assert daemon.refresh()
+        assert not daemon.refresh()
+
+    def test_refresh_with_validation(self, app_dir):
+        daemon = _ConfigDaemon(str(app_dir / "daemon.sock"), APP_NAME, validate=True)
+
+        daemon.refresh()
+
+        assert daemon._config_dict == {APP_NAME: {"key": "default"}}
+
+    def test_refresh_with_validation_of_file_reference(self, app_dir):
+        (app_dir / "notes.txt").write_text("sidecar")
+        self._update_config_file(
+            {APP_NAME: {"key": {"$file": "notes.txt", "$encoding": "utf-8"}}}
+        )
+        daemon = _ConfigDaemon(str(app_dir / "daemon.sock"), APP_NAME, validate=True)
+
+        daemon.refresh()
+
+        assert daemon._config_dict[APP_NAME]["key"].resolve() == "sidecar"
+
+    def test_disconnected_subscribers_are_dropped(self, daemon, app_dir):
+        config = Config.subscribe(str(app_dir / "daemon.sock"))
+        config.close()
+
+        self._update_config_file({APP_NAME: {"other": "changed"}})
+        other_config = Config.subscribe(str(app_dir / "daemon.sock"))
+        try:
+            assert other_config.wait_for_version(2, timeout=5)
+            assert len(daemon._subscribers) == 1
+        finally:
+            other_config.close()
+
+    def test_broken_subscribers_are_dropped(self, app_dir):
+        daemon = _ConfigDaemon(str(app_dir / "daemon.sock"), APP_NAME)
+        daemon.refresh()
+        subscriber, peer = socket.socketpair()
+        peer.close()
+
+        daemon._subscribe(subscriber)
+
+        assert subscriber not in daemon._subscribers
+        assert subscriber.fileno() == -1
+
+    def test_stalled_subscribers_dont_block_the_others(self, mocker, app_dir):
+        mocker.patch("prosper_shared.omni_config._daemon._MAX_PENDING_BYTES", 1 << 20)
+        daemon = _ConfigDaemon(str(app_dir / "daemon.sock"), APP_NAME)
+        daemon.refresh()
+        stalled, stalled_peer = socket.socketpair()
+        active, active_peer = socket.socketpair()
+        daemon._subscribe(stalled)
+        daemon._subscribe(active)
+
+        message = b"x" * (64 * 1024)
+        sent_messages = 0
+        while stalled in daemon._subscribers:
+            daemon._send(stalled, message)
+            sent_messages += 1
+            daemon._send(active, b"\n")
+            active_peer.recv(1 << 20)
+
+        assert sent_messages > 1
+        assert active in daemon._subscribers
+        assert stalled.fileno() == -1
+        stalled_peer.close()
+        active_peer.close()
+
+    def test_slow_subscriber_receives_pending_messages(self, daemon, app_dir):
+        # Waits for the daemon to listen.
+        Config.subscribe(str(app_dir / "daemon.sock")).close()
+        subscriber = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        subscriber.connect(str(app_dir / "daemon.sock"))
+        messages = subscriber.makefile("rb")
+        assert json.loads(messages.readline())["version"] == 1
+
+        large_value = "x" * (8 << 20)
+        self._update_config_file({APP_NAME: {"other": large_value}})
+        subscriber.settimeout(5)
+        message = json.loads(messages.readline())
+
+        assert message["version"] == 2
+        assert message["set"] == [[[APP_NAME, "other"], large_value]]
+        messages.close()
+        subscriber.close()
+
+    def test_pending_messages_are_sent_once_writable(self, app_dir):
+        daemon = _ConfigDaemon(str(app_dir / "daemon.sock"), APP_NAME)
+        daemon.refresh()
+        subscriber, peer = socket.socketpair()
+        daemon._subscribe(subscriber)
+        message = b"x" * (1 << 20)
+
+        daemon._send(subscriber, message)
+        assert daemon._subscribers[subscriber]
+        assert daemon._selector.get_key(subscriber).events & selectors.EVENT_WRITE
+
+        peer.setblocking(False)
+        received = b""
+        while daemon._subscribers[subscriber]:
+            try:
+                received += peer.recv(1 << 20)
+            except BlockingIOError:
+                pass
+            daemon._flush(subscriber)
+        received += peer.recv(1 << 20)
+
+        assert received.endswith(message)
+        assert daemon._selector.get_key(subscriber).events == selectors.EVENT_READ
+        daemon._disconnect(subscriber)
+        peer.close()
+
+    def test_subscribe_waits_for_daemon(self, app_dir):
+        stale_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale_socket.bind(str(app_dir / "daemon.sock"))
+        stale_socket.close()
+        daemon = _ConfigDaemon(str(app_dir / "daemon.sock"), APP_NAME)
+        timer = threading.Timer(0.2, daemon.serve_forever)
+        timer.start()
+        try:
+            config = Config.subscribe(str(app_dir / "daemon.sock"))
+            assert config.get(f"{APP_NAME}.other") == "value"
+            config.close()
+        finally:
+            daemon.shutdown()
+            timer.join()
+
+    def test_subscribe_timeout(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            Config.subscribe(str(tmp_path / "missing.sock"), timeout=0.1)
+
+    def test_daemon_subprocess(self, tmp_path):
+        (tmp_path / f".{APP_NAME}.json").write_text(
+            json.dumps({APP_NAME: {"key": "value"}})
+        )
+        socket_path = str(tmp_path / "daemon.sock")
+        env = dict(os.environ, PYTHONPATH=os.getcwd())
+        process = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "prosper_shared.omni_config._daemon",
+                APP_NAME,
+                socket_path,
+                "--poll-interval",
+                "0.05",
+            ],
+            cwd=tmp_path,
+            env=env,
+        )
+        try:
+            config = Config.subscribe(socket_path, timeout=30)
+            assert config.get(f"{APP_NAME}.key") == "value"
+            config.close()
+        finally:
+            process.send_signal(signal.SIGINT)
+            process.wait(timeout=30)
+
+        assert not os.path.exists(socket_path)
+
+    def test_main(self, mocker):
+        daemon_mock = mocker.patch("prosper_shared.omni_config._daemon._ConfigDaemon")
+        import_module_mock = mocker.patch(
+            "prosper_shared.omni_config._daemon.import_module"
+        )
+        daemon_mock.return_value.serve_forever.side_effect = KeyboardInterrupt
+
+        main(
+            [
+                APP_NAME,
+                "daemon.sock",
+                "--module",
+                "some.module",
+                "--validate",
+                "--exact-name",
+            ]
+        )
+
+        import_module_mock.assert_called_once_with("some.module")
+        daemon_mock.assert_called_once_with(
+            "daemon.sock",
+            APP_NAME,
+            validate=True,
+            search_equivalent_names=False,
+            poll_interval=1.0,
+        )
+
+    @pytest.mark.parametrize(
+        ["tree", "path", "value", "expected"],
+        [
+            ({"a": 1}, [], {"b": 2}, {"b": 2}),
+            ({"a": 1}, ["b"], 2, {"a": 1, "b": 2}),
+            ({"a": {"b": 1}}, ["a", "b"], 2, {"a": {"b": 2}}),
+            ({"a": 1}, ["b", "c"], 2, {"a": 1, "b": {"c": 2}}),
+            ({"a": [1, 2]}, ["a", "-1"], 3, {"a": [1, 3]}),
+            ({"a": [{"b": 1}]}, ["a", "0", "b"], 2, {"a": [{"b": 2}]}),
+        ],
+    )
+    def test_replace_path(self, tree, path, value, expected):
+        assert _replace_path(tree, path, value) == expected
+        assert tree != expected
+
+    def test_replace_path_removes(self):
+        tree = {"a": {"b": 1, "c": 2}}
+
+        assert _replace_path(tree, ["a", "b"]) == {"a": {"c": 2}}
+        assert _replace_path(tree, ["a", "missing"]) == tree
+        assert tree == {"a": {"b": 1, "c": 2}}
+
+    def test_replace_path_removes_list_items(self):
+        tree = {"a": [1, 2, 3]}
+
+        assert _replace_path(tree, ["a", "1"]) == {"a": [1, 3]}
+        assert _replace_path(tree, ["a", "3"]) == tree
+        assert tree == {"a": [1, 2, 3]}
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "value",
+            1,
+            2**70,
+            1.5,
+            True,
+            None,
+            [1, [2, 3]],
+            {"a": {"b": 1}},
+            (1, (2, "3")),
+            {2: "two", True: "yes", None: "none", (1, 2): "tuple"},
+            {"$type": "pickle", "data": "not base64"},
+            date(2024, 1, 2),
+            datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+            time(3, 4, 5),
+            Decimal("1.5"),
+            {"dates": [date(2024, 1, 2)]},
+        ],
+    )
+    def test_encode_message_keeps_types(self, value):
+        message = json.loads(_encode_message(3, ([(["a"], value)], [["b"]])))
+        path, encoded_value = message["set"][0]
+
+        assert message["version"] == 3
+        assert [_decode_value(path) for path in message["unset"]] == [["b"]]
+        assert _decode_value(path) == ["a"]
+        decoded_value = _decode_value(encoded_value)
+        assert decoded_value == value
+        assert repr(decoded_value) == repr(value)
+
+    def test_encode_message_with_non_string_keys_in_path(self):
+        message = json.loads(_encode_message(1, ([([1, (2, 3)], "value")], [])))
+
+        assert _decode_value(message["set"][0][0]) == [1, (2, 3)]
+
+    def test_subscribe_keeps_types(self, daemon, app_dir):
+        (app_dir / f".{APP_NAME}.toml").write_text(
+            f"[{APP_NAME}]\nday = 2024-01-02\nat = 2024-01-02T03:04:05Z\n"
+        )
+        config = Config.subscribe(str(app_dir / "daemon.sock"))
+        try:
+            self._update_config_file({APP_NAME: {"other": "changed"}})
+            assert config.wait_for_version(2, timeout=5)
+
+            assert config.get(f"{APP_NAME}.day") == date(2024, 1, 2)
+            assert config.get(f"{APP_NAME}.at") == datetime(
+                2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc
+            )
+        finally:
+            config.close()
+
+    def test_daemon_shutdown_keeps_last_version(self, daemon, app_dir):
+        config = Config.subscribe(str(app_dir / "daemon.sock"))
+
+        daemon.shutdown()
+        config._listener.join(timeout=5)
+
+        assert not config._listener.is_alive()
+        assert config.get(f"{APP_NAME}.other") == "value"
+        config.close()
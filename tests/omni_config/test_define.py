@@ -12,13 +12,16 @@ from prosper_shared.omni_config import (
     SchemaType,
     _define,
     config_schema,
+    defer_type_resolution,
     input_schema,
 )
 from prosper_shared.omni_config._define import (
     _arg_parse_from_schema,
     _fallback_type_builder,
+    _key_to_type_validator,
     _realize_config_schemata,
     _realize_input_schemata,
+    _resolve_type,
 )
 
 PROG_NAME = "test-cli"
@@ -226,6 +229,50 @@ class TestDefine:
         with pytest.raises(ValueError):
             _arg_parse_from_schema(test_schema, {}, PROG_NAME)
 
+    def test_resolve_type_caches_resolution(self, mocker):
+        mocker.patch.object(_define, "_resolved_type_cache", {})
+        import_module_spy = mocker.spy(_define, "import_module")
+
+        assert _resolve_type("enum.Enum") is Enum
+        assert _resolve_type("enum.Enum") is Enum
+        assert _define._resolved_type_cache == {"enum.Enum": Enum}
+        import_module_spy.assert_called_once_with("enum")
+
+    def test_key_to_type_validator_populates_cache(self, mocker):
+        mocker.patch.object(_define, "_resolved_type_cache", {})
+
+        assert _key_to_type_validator(Type[Enum])("enum.Enum") == "enum.Enum"
+        assert _define._resolved_type_cache == {"enum.Enum": Enum}
+
+    def test_key_to_type_validator_unresolvable(self):
+        with pytest.raises(TypeError):
+            _key_to_type_validator(Type[Enum])("nonexistent_module.Thing")
+
+    @pytest.mark.parametrize(
+        ["given_key", "expected_valid"],
+        [
+            ("nonexistent_module.Thing", True),
+            ("nonexistent.module.Thing", True),
+            ("Thing", False),
+            ("nonexistent module.Thing", False),
+            ("nonexistent_module.", False),
+            (123, False),
+        ],
+    )
+    def test_key_to_type_validator_deferred(self, mocker, given_key, expected_valid):
+        mocker.patch.object(_define, "_resolved_type_cache", {})
+        mocker.patch.object(_define, "_type_resolution_deferred", False)
+        import_module_spy = mocker.spy(_define, "import_module")
+        defer_type_resolution()
+
+        if expected_valid:
+            assert _key_to_type_validator(Type[Enum])(given_key) == given_key
+        else:
+            with pytest.raises(TypeError):
+                _key_to_type_validator(Type[Enum])(given_key)
+        import_module_spy.assert_not_called()
+        assert _define._resolved_type_cache == {}
+
     def test_config_key_str(self):
         assert (
             str(ConfigKey("key", "value", "default"))
@@ -0,0 +1,146 @@
+import os
+
+import pytest
+
+from prosper_shared.omni_config import (
+    AutoconfigStats,
+    Config,
+    DirectoryConfigurationSource,
+)
+from prosper_shared.omni_config import _directory as directory
+from prosper_shared.omni_config import _parse as parse
+from prosper_shared.omni_config._discovery import _shared_discovery
+from prosper_shared.omni_config._stats import _recording
+
+
+class TestDirectory:
+    @pytest.fixture
+    def config_dir(self, tmp_path):
+        config_dir = tmp_path / "config.d"
+        config_dir.mkdir()
+        (config_dir / "10-defaults.json").write_text(
+            '{"app": {"key": "json", "json": true, "list": [1]}}'
+        )
+        (config_dir / "20-service.yaml").write_text(
+            "app:\n  key: yaml\n  yaml: true\n  list: [2]\n"
+        )
+        (config_dir / "30-overrides.toml").write_text('[app]\nkey = "toml"\n')
+        (config_dir / "README.md").write_text("# Not a fragment")
+        (config_dir / ".40-hidden.json").write_text('{"app": {"key": "hidden"}}')
+        (config_dir / "50-directory.json").mkdir()
+        return config_dir
+
+    @pytest.fixture
+    def source(self, config_dir):
+        return DirectoryConfigurationSource(str(config_dir))
+
+    def test_read(self, source):
+        assert source.read() == {
+            "app": {
+                "key": "toml",
+                "json": True,
+                "yaml": True,
+                "list": [1, 2],
+            }
+        }
+
+    def test_fragments_are_merged_in_lexical_order(self, source, config_dir):
+        (config_dir / "05-early.yml").write_text("app:\n  key: early\n  early: 1\n")
+        (config_dir / "99-late.json").write_text('{"app": {"key": "late"}}')
+
+        config = source.read()
+
+        assert config["app"]["key"] == "late"
+        assert config["app"]["early"] == 1
+
+    def test_only_changed_fragments_are_parsed(self, source, config_dir, mocker):
+        parse_spy = mocker.spy(parse._FileConfigurationSource, "read")
+        source.read()
+        assert parse_spy.call_count == 3
+
+        source.read()
+        assert parse_spy.call_count == 3
+
+        fragment = config_dir / "20-service.yaml"
+        fragment.write_text("app:\n  key: changed\n")
+        stat = fragment.stat()
+        os.utime(fragment, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert source.read()["app"]["key"] == "toml"
+        assert "yaml" not in source.read()["app"]
+        assert parse_spy.call_count == 4
+
+    def test_removed_fragments_are_dropped(self, source, config_dir):
+        source.read()
+        (config_dir / "30-overrides.toml").unlink()
+
+        assert source.read()["app"]["key"] == "yaml"
+        assert len(source._parsed) == 2
+
+    def test_changed_fragments_are_parsed_in_parallel(self, source, mocker):
+        executor = mocker.spy(directory, "ThreadPoolExecutor")
+
+        source.read()
+        source.read()
+
+        executor.assert_called_once_with(None)
+
+    def test_parallel_parsing_keeps_the_context(self, source, config_dir):
+        stats = AutoconfigStats()
+
+        with _recording(stats), _shared_discovery() as discovery_cache:
+            source.read()
+
+        assert {
+            phase.details["path"] for phase in stats.phases if phase.name == "parse"
+        } == {
+            str(config_dir / name)
+            for name in ("10-defaults.json", "20-service.yaml", "30-overrides.toml")
+        }
+        assert len(discovery_cache._results) == 3
+
+    def test_cached_fragments_are_not_modified(self, source):
+        source.read()["app"]["key"] = "modified"
+
+        assert source.read()["app"]["key"] == "toml"
+
+    def test_pattern(self, config_dir):
+        source = DirectoryConfigurationSource(str(config_dir), pattern="*.json")
+
+        assert source.read() == {"app": {"key": "json", "json": True, "list": [1]}}
+
+    def test_config_root_and_inject_at(self, tmp_path):
+        (tmp_path / "fragment.toml").write_text('[tool.app]\nkey = "value"\n')
+        (tmp_path / "other.toml").write_text('[tool.other]\nkey = "value"\n')
+
+        source = DirectoryConfigurationSource(
+            str(tmp_path), config_root="tool.app", inject_at="app"
+        )
+
+        assert source.read() == {"app": {"key": "value"}}
+
+    def test_fragments_without_parser_backend_are_skipped(self, source, mocker):
+        mocker.patch.object(
+            directory,
+            "_has_parser_backend",
+            lambda file_format: file_format != "yaml",
+        )
+
+        assert "yaml" not in source.read()["app"]
+
+    def test_missing_directory(self, tmp_path):
+        source = DirectoryConfigurationSource(str(tmp_path / "missing"))
+
+        assert source.read() == {}
+        assert source.fingerprint().endswith(":absent")
+
+    def test_fingerprint(self, source, config_dir):
+        fingerprint = source.fingerprint()
+
+        assert fingerprint == source.fingerprint()
+        (config_dir / "README.md").write_text("# Still not a fragment")
+        assert source.fingerprint() == fingerprint
+        (config_dir / "60-new.json").write_text("{}")
+        assert source.fingerprint() != fingerprint
+
+    def test_config(self, source):
+        assert Config(source.read()).get("app.list") == [1, 2]
@@ -0,0 +1,135 @@
+import argparse
+import json
+
+import pytest
+
+from prosper_shared import omni_config
+from prosper_shared.omni_config import Config, ConfigKey, TomlConfigurationSource
+from prosper_shared.omni_config import _discovery as discovery
+from prosper_shared.omni_config import _parse as parse
+from prosper_shared.omni_config import _profile as profile
+from prosper_shared.omni_config._discovery import _memoize, _shared_discovery
+
+# The app running the tools, whose command line holds no arguments.
+APP_NAME = "launcher"
+APP_NAMES = ["tool-a", "tool-b"]
+
+
+class TestDiscovery:
+    @pytest.fixture
+    def app_schema(self):
+        return {
+            app_name: {ConfigKey("key", "key desc", default="default"): str}
+            for app_name in APP_NAMES
+        }
+
+    @pytest.fixture
+    def app_config_files(self):
+        return {
+            ".tool-a.json": {"tool-a": {"file": "a"}},
+            ".tool-a.prod.json": {"tool-a": {"file": "prod"}},
+        }
+
+    @pytest.fixture
+    def launcher_dir(self, monkeypatch, app_dir):
+        monkeypatch.setenv("TOOL_B_TOOL-B__FROM_ENV", "env")
+        (app_dir / ".pyproject.toml").write_text(
+            '[tools.tool-a]\nkey = "a"\n\n[tools.tool-b]\nkey = "b"\n'
+        )
+        return app_dir
+
+    def test_autoconfig_many(self, launcher_dir):
+        configs = Config.autoconfig_many(APP_NAMES)
+
+        assert list(configs) == APP_NAMES
+        assert configs["tool-a"].get("tool-a") == {"key": "a", "file": "a"}
+        assert configs["tool-b"].get("tool-b") == {"key": "b", "from_env": "env"}
+        assert configs["tool-a"].profiles == ["prod"]
+        assert configs["tool-b"].profiles == []
+
+    def test_discovery_is_shared(self, launcher_dir, mocker):
+        realize_spy = omni_config._realize_config_schemata
+        parse_spy = mocker.spy(parse._FileConfigurationSource, "_parse_file_content")
+        environ_spy = mocker.spy(parse.os.environ, "copy")
+        scandir_spy = mocker.spy(profile.os, "scandir")
+
+        Config.autoconfig_many(APP_NAMES)
+
+        assert realize_spy.call_count == 1
+        assert environ_spy.call_count == 1
+        parsed_files = [call.args[1] for call in parse_spy.call_args_list]
+        assert sorted(parsed_files) == sorted(
+            [
+                str(launcher_dir / ".pyproject.toml"),
+                str(launcher_dir / ".tool-a.json"),
+            ]
+        )
+        scanned_directories = [call.args[0] for call in scandir_spy.call_args_list]
+        assert len(scanned_directories) == len(set(scanned_directories))
+
+    def test_separate_autoconfig_calls_share_nothing(self, launcher_dir, mocker):
+        parse_spy = mocker.spy(parse._FileConfigurationSource, "_parse_file_content")
+
+        Config.autoconfig("tool-a")
+        Config.autoconfig("tool-a")
+
+        assert parse_spy.call_count > 2
+        assert discovery._active_cache.get() is None
+
+    def test_shared_arg_parse_parses_once(self, launcher_dir, mocker):
+        parser = argparse.ArgumentParser("launcher")
+        parser.add_argument("--verbose", action="store_true")
+        mocker.patch("sys.argv", ["launcher", "--verbose"])
+        parse_args_spy = mocker.spy(parser, "parse_args")
+
+        configs = Config.autoconfig_many(APP_NAMES, arg_parse=parser)
+
+        assert parse_args_spy.call_count == 1
+        assert configs["tool-a"].get("verbose") is True
+        assert configs["tool-b"].get("verbose") is True
+
+    def test_profile(self, launcher_dir):
+        with pytest.raises(ValueError, match="Unknown config profile"):
+            Config.autoconfig_many(APP_NAMES, profile="prod")
+
+        configs = Config.autoconfig_many(["tool-a"], profile="prod")
+        assert configs["tool-a"].get("tool-a.file") == "prod"
+        assert discovery._active_cache.get() is None
+
+    def test_changed_files_are_parsed_again(self, launcher_dir):
+        config_file = launcher_dir / "config.json"
+        config_file.write_text(json.dumps({"key": "old"}))
+        source = parse._JsonConfigurationSource(str(config_file))
+
+        with _shared_discovery():
+            assert source.read() == {"key": "old"}
+            config_file.write_text(json.dumps({"key": "changed"}))
+            assert source.read() == {"key": "changed"}
+
+    def test_streaming_toml_is_parsed_separately(self, launcher_dir):
+        path = str(launcher_dir / ".pyproject.toml")
+
+        with _shared_discovery():
+            assert TomlConfigurationSource(path, "tools.tool-a").read() == {"key": "a"}
+            assert TomlConfigurationSource(
+                path, "tools.tool-b", streaming=True
+            ).read() == {"key": "b"}
+            assert TomlConfigurationSource(
+                path, "tools.tool-a", streaming=True
+            ).read() == {"key": "a"}
+
+    def test_nested_shared_discovery(self):
+        with _shared_discovery() as cache:
+            with _shared_discovery() as nested_cache:
+                assert nested_cache is cache
+            assert discovery._active_cache.get() is cache
+        assert discovery._active_cache.get() is None
+
+    def test_memoize(self):
+        results = iter(range(10))
+
+        assert _memoize("key", lambda: next(results)) == 0
+        assert _memoize("key", lambda: next(results)) == 1
+        with _shared_discovery():
+            assert _memoize("key", lambda: next(results)) == 2
+            assert _memoize("key", lambda: next(results)) == 2
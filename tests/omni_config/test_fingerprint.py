@@ -0,0 +1,95 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from prosper_shared.omni_config import _fingerprint
+from prosper_shared.omni_config._fingerprint import (
+    _fingerprint_config,
+    _fingerprint_tree,
+)
+
+TEST_TREE = {
+    "section": {"string": "value", "list": [1, 2.0, None], "nested": {"a": True}},
+    "other": {"b": Decimal("1.5"), 1: date(2024, 1, 2)},
+}
+
+
+class TestFingerprint:
+    def test_digest_tree_mirrors_config_tree(self):
+        digest_tree = _fingerprint_tree(TEST_TREE)
+
+        assert digest_tree[0] is TEST_TREE
+        assert digest_tree[2]["section"][0] is TEST_TREE["section"]
+        assert len(digest_tree[2]["section"][2]["list"][2]) == 3
+        assert digest_tree[2]["section"][2]["string"][2] is None
+
+    @pytest.mark.parametrize(
+        ["tree", "other_tree", "expected_equal"],
+        [
+            ({"a": 1, "b": 2}, {"b": 2, "a": 1}, True),
+            ({"a": 1}, {"a": "1"}, False),
+            ({"a": 1}, {"a": True}, False),
+            ({"a": [1, 2]}, {"a": [2, 1]}, False),
+            ({"a": [1, 2]}, {"a": {0: 1, 1: 2}}, False),
+            ({"a": {}}, {"a": []}, False),
+            ({"a": {"b": 1}}, {"a": {"b": 1}, "c": None}, False),
+            ({1: "a"}, {"1": "a"}, False),
+        ],
+    )
+    def test_fingerprint_depends_only_on_content(
+        self, tree, other_tree, expected_equal
+    ):
+        assert (
+            _fingerprint_tree(tree)[1] == _fingerprint_tree(other_tree)[1]
+        ) is expected_equal
+
+    def test_unchanged_tree_is_not_hashed_again(self, mocker):
+        digest_tree = _fingerprint_tree(TEST_TREE)
+        digest_value_spy = mocker.spy(_fingerprint, "_digest_value")
+
+        assert _fingerprint_tree(TEST_TREE, digest_tree) is digest_tree
+        digest_value_spy.assert_not_called()
+
+    def test_only_changed_paths_are_hashed_again(self, mocker):
+        digest_tree = _fingerprint_tree(TEST_TREE)
+        new_tree = {
+            **TEST_TREE,
+            "section": {
+                **TEST_TREE["section"],
+                "list": [*TEST_TREE["section"]["list"], 3],
+            },
+        }
+        digest_value_spy = mocker.spy(_fingerprint, "_digest_value")
+
+        new_digest_tree = _fingerprint_tree(new_tree, digest_tree)
+
+        # Besides the new item, only the keys of the copied dicts are hashed again.
+        assert digest_value_spy.call_count == 1 + 3 + 2
+        assert new_digest_tree[1] == _fingerprint_tree(new_tree)[1]
+        assert new_digest_tree[1] != digest_tree[1]
+        assert new_digest_tree[2]["other"] is digest_tree[2]["other"]
+        assert new_digest_tree[2]["section"][2]["nested"] is (
+            digest_tree[2]["section"][2]["nested"]
+        )
+
+    def test_changed_value_types(self):
+        digest_tree = _fingerprint_tree({"a": {"b": 1}, "c": [1]})
+
+        new_digest_tree = _fingerprint_tree({"a": [1], "c": {"b": 1}}, digest_tree)
+
+        assert new_digest_tree[1] == _fingerprint_tree({"a": [1], "c": {"b": 1}})[1]
+
+    def test_config_fingerprint_includes_settings(self):
+        digest_tree = _fingerprint_tree(TEST_TREE)
+        fingerprint = _fingerprint_config(digest_tree, interpolate=False, profile=None)
+
+        assert fingerprint == _fingerprint_config(
+            digest_tree, profile=None, interpolate=False
+        )
+        assert fingerprint != _fingerprint_config(
+            digest_tree, interpolate=True, profile=None
+        )
+        assert fingerprint != _fingerprint_config(
+            digest_tree, interpolate=False, profile="prod"
+        )
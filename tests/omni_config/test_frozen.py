@@ -0,0 +1,119 @@
+import pickle
+from types import MappingProxyType
+
+import pytest
+
+from prosper_shared.omni_config import AccessRecorder, Config
+from prosper_shared.omni_config._frozen import _FrozenConfig
+
+TEST_CONFIG = {
+    "section": {"list": [{"key": "first"}, [1, 2]], "string": "value"},
+    "url": "${section.string}/path",
+}
+
+
+class TestFrozen:
+    @pytest.fixture
+    def config(self):
+        return Config(TEST_CONFIG).freeze()
+
+    def test_get_returns_read_only_values(self, config):
+        section = config.get("section")
+
+        assert isinstance(section, MappingProxyType)
+        assert section["list"] == ({"key": "first"}, (1, 2))
+        assert isinstance(section["list"][0], MappingProxyType)
+        with pytest.raises(TypeError):
+            section["string"] = "changed"
+        assert config.get("section.list.1") == (1, 2)
+        assert config.get("section.string") == "value"
+        assert config.get("missing") is None
+
+    def test_get_reuses_frozen_values(self, config):
+        assert config.get("section") is config.get("section")
+
+    def test_get_records_reused_values(self, config):
+        recorder = AccessRecorder()
+        config.record_access(recorder)
+
+        config.get("section")
+        config.get("section")
+
+        assert recorder.counts == {"section": 2}
+
+    def test_freeze_copies_the_tree(self):
+        config_dict = {"a": [1, 2]}
+        config = Config(config_dict)
+        frozen_config = config.freeze()
+
+        config.get("a").append(3)
+        config_dict["a"].append(4)
+
+        assert frozen_config.get("a") == (1, 2)
+        assert frozen_config.freeze() is frozen_config
+
+    def test_hash_and_eq(self, config):
+        equal_config = Config(TEST_CONFIG).freeze()
+
+        assert hash(config) == hash(equal_config)
+        assert config == equal_config
+        assert config != Config(TEST_CONFIG)
+        assert config.fingerprint == Config(TEST_CONFIG).fingerprint
+        assert config != Config(TEST_CONFIG, interpolate=True).freeze()
+        assert len({config, equal_config}) == 1
+
+    def test_fingerprint_is_computed_once(self, config, mocker):
+        fingerprint = config.fingerprint
+        fingerprint_spy = mocker.spy(Config, "fingerprint")
+
+        assert config.fingerprint == fingerprint
+        fingerprint_spy.assert_not_called()
+
+    def test_freeze_with_interpolation(self):
+        config = Config(TEST_CONFIG, interpolate=True).freeze()
+
+        assert config.get("url") == "value/path"
+        assert config.get("section")["string"] == "value"
+
+    def test_override_frozen_config(self, config):
+        with config.override({"section.string": "overridden"}):
+            assert config.get("section.string") == "overridden"
+            assert isinstance(config.get("section"), MappingProxyType)
+            assert config.get("section")["string"] == "overridden"
+
+        assert config.get("section")["string"] == "value"
+
+    def test_freeze_view(self):
+        view = Config(TEST_CONFIG).view("section")
+
+        frozen_view = view.freeze()
+
+        assert frozen_view.get("list.1") == (1, 2)
+        assert isinstance(frozen_view._parent, _FrozenConfig)
+        hash(frozen_view)
+
+    def test_freeze_keeps_the_profile(self):
+        config = Config(TEST_CONFIG)
+        config._profile = "prod"
+
+        frozen_config = config.freeze()
+
+        assert frozen_config.profile == "prod"
+        assert frozen_config != Config(TEST_CONFIG).freeze()
+
+    def test_freeze_with_lazy_sources(self, mocker):
+        config = Config(TEST_CONFIG, lazy_sources=[mocker.Mock()])
+
+        with pytest.raises(ValueError):
+            config.freeze()
+
+    def test_pickle(self, config):
+        unpickled = pickle.loads(pickle.dumps(config))
+
+        assert type(unpickled) is _FrozenConfig
+        assert unpickled == config
+        assert hash(unpickled) == hash(config)
+
+    def test_get_as_accessors(self, config):
+        assert config.get_as_frozenset("section.list.1") == frozenset({1, 2})
+        assert config.get_as_str("section.string") == "value"
@@ -0,0 +1,302 @@
+import json
+import pickle
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from prosper_shared.omni_config import Config, HttpConfigurationSource
+from prosper_shared.omni_config import _http as http_source
+
+LAST_MODIFIED = "Tue, 02 Jan 2024 00:00:00 GMT"
+
+
+class _ConfigService(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _ConfigHandler)
+        self.requests = []
+        self.client_ports = set()
+        self.status = None
+        self.close_connections = False
+        self.publish({"app": {"key": "value"}}, '"v1"')
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/config?env=test"
+
+    def publish(self, config, etag, body=None):
+        self.body = body if body is not None else json.dumps(config).encode()
+        self.etag = etag
+
+
+class _ConfigHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        service = self.server
+        service.requests.append((self.path, dict(self.headers)))
+        service.client_ports.add(self.client_address[1])
+
+        if service.status:
+            self._respond(service.status, b"")
+        elif service.etag and self.headers.get("If-None-Match") == service.etag:
+            self._respond(304, None)
+        else:
+            self._respond(200, service.body)
+
+    def _respond(self, status, body):
+        self.send_response(status)
+        if self.server.etag:
+            self.send_header("ETag", self.server.etag)
+        self.send_header("Last-Modified", LAST_MODIFIED)
+        if self.server.close_connections:
+            self.send_header("Connection", "close")
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _revalidate(source):
+    source._payload = source._payload._replace(fetched_at=0.0)
+    source._attempted_at = 0.0
+    source.read()
+    source._revalidation.join()
+
+
+class TestHttp:
+    @pytest.fixture
+    def service(self):
+        service = _ConfigService()
+        thread = threading.Thread(
+            target=service.serve_forever, args=(0.01,), daemon=True
+        )
+        thread.start()
+        yield service
+        service.shutdown()
+        service.server_close()
+        thread.join()
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+        return str(tmp_path / "cache" / "config.json")
+
+    @pytest.fixture
+    def source(self, service, cache_path):
+        source = HttpConfigurationSource(service.url, cache_path)
+        yield source
+        source.close()
+
+    def test_read(self, source, service, cache_path):
+        assert source.read() == {"app": {"key": "value"}}
+        assert service.requests[0][0] == "/config?env=test"
+        assert service.requests[0][1]["Accept"] == "application/json"
+        with open(cache_path) as cache_file:
+            assert json.load(cache_file) == {
+                "body": '{"app": {"key": "value"}}',
+                "etag": '"v1"',
+                "last_modified": LAST_MODIFIED,
+                "fetched_at": pytest.approx(time.time(), abs=60),
+            }
+
+    def test_stale_payload_is_served_while_revalidating(self, source, service):
+        source.read()
+        service.publish({"app": {"key": "changed"}}, '"v2"')
+        source._payload = source._payload._replace(fetched_at=0.0)
+        source._attempted_at = 0.0
+
+        assert source.read() == {"app": {"key": "value"}}
+        source._revalidation.join()
+        assert source.read() == {"app": {"key": "changed"}}
+
+    def test_revalidation_is_conditional(self, source, service, mocker):
+        parse_spy = mocker.spy(source, "_parse")
+        source.read()
+        _revalidate(source)
+
+        assert source.read() == {"app": {"key": "value"}}
+        assert len(service.requests) == 2
+        assert service.requests[1][1]["If-None-Match"] == '"v1"'
+        assert service.requests[1][1]["If-Modified-Since"] == LAST_MODIFIED
+        assert parse_spy.call_count == 1
+
+    def test_connection_is_reused(self, source, service):
+        source.read()
+        for _ in range(3):
+            _revalidate(source)
+
+        assert len(service.requests) == 4
+        assert len(service.client_ports) == 1
+
+    def test_connection_closed_by_the_service(self, source, service):
+        service.close_connections = True
+        source.read()
+        assert source._connection is None
+
+        service.close_connections = False
+        _revalidate(source)
+        assert len(service.client_ports) == 2
+
+    def test_stale_connection_is_replaced(self, source, service, mocker):
+        source.read()
+        mocker.patch.object(
+            source._connection, "request", side_effect=ConnectionResetError
+        )
+
+        _revalidate(source)
+
+        assert len(service.requests) == 2
+        assert len(service.client_ports) == 2
+        assert source._connection is not None
+
+    def test_connection_is_only_replaced_once(self, source, service, mocker):
+        source.read()
+        mocker.patch.object(
+            http_source.http.client.HTTPConnection,
+            "request",
+            side_effect=ConnectionResetError,
+        )
+
+        _revalidate(source)
+
+        assert len(service.requests) == 1
+        assert source._connection is None
+        assert source.read() == {"app": {"key": "value"}}
+
+    def test_fresh_payload_is_not_revalidated(self, service, cache_path):
+        source = HttpConfigurationSource(service.url, cache_path)
+
+        source.read()
+        source.read()
+
+        assert source._revalidation is None
+        assert len(service.requests) == 1
+        source.close()
+
+    def test_payload_on_disk_is_served_by_new_sources(
+        self, source, service, cache_path
+    ):
+        source.read()
+        service.publish({"app": {"key": "changed"}}, '"v2"')
+
+        new_source = HttpConfigurationSource(service.url, cache_path, max_age=0)
+        assert new_source.read() == {"app": {"key": "value"}}
+        new_source._revalidation.join()
+        assert new_source.read() == {"app": {"key": "changed"}}
+        new_source.close()
+
+    @pytest.mark.parametrize(
+        ["status", "body"],
+        [(500, None), (200, b"not json"), (200, b"[1, 2]"), (200, b"\xff")],
+    )
+    def test_failed_revalidation_keeps_the_payload(self, source, service, status, body):
+        source.read()
+        service.publish(None, None, body)
+        service.status = status if status != 200 else None
+
+        _revalidate(source)
+
+        assert source.read() == {"app": {"key": "value"}}
+
+    def test_unreachable_service(self, service, cache_path):
+        url = service.url
+        service.shutdown()
+        service.server_close()
+        source = HttpConfigurationSource(url, cache_path, timeout=1)
+
+        assert source.read() == {}
+        assert source.fingerprint().endswith(":absent")
+
+    def test_unreachable_service_is_retried_after_max_age(self, source, service):
+        source.read()
+        service.status = 503
+
+        _revalidate(source)
+        source.read()
+        assert len(service.requests) == 2
+
+        source._attempted_at = 0.0
+        source.read()
+        source._revalidation.join()
+        assert len(service.requests) == 3
+
+    def test_fingerprint(self, source, service):
+        fingerprint = source.fingerprint()
+
+        assert fingerprint == source.fingerprint()
+        service.publish({"app": {"key": "changed"}}, '"v2"')
+        _revalidate(source)
+        assert source.fingerprint() != fingerprint
+
+    def test_unreadable_cache_file(self, service, cache_path, tmp_path):
+        (tmp_path / "cache").mkdir()
+        (tmp_path / "cache" / "config.json").write_text("{")
+        source = HttpConfigurationSource(service.url, cache_path)
+
+        assert source.read() == {"app": {"key": "value"}}
+        assert len(service.requests) == 1
+
+    def test_unwritable_cache_file(self, service, tmp_path):
+        (tmp_path / "file").write_text("")
+        source = HttpConfigurationSource(service.url, str(tmp_path / "file" / "cache"))
+
+        assert source.read() == {"app": {"key": "value"}}
+
+    def test_default_cache_path(self, service, tmp_path, mocker):
+        mocker.patch("platformdirs.user_cache_dir", lambda app: str(tmp_path / app))
+
+        source = HttpConfigurationSource(service.url)
+        source.read()
+
+        assert len(list((tmp_path / "omni-config").glob("*.json"))) == 1
+
+    def test_headers(self, service, cache_path):
+        source = HttpConfigurationSource(
+            service.url, cache_path, headers={"Authorization": "Bearer token"}
+        )
+
+        source.read()
+
+        assert service.requests[0][1]["Authorization"] == "Bearer token"
+
+    def test_https_url(self, cache_path, mocker):
+        connection_class = mocker.patch.object(
+            http_source.http.client, "HTTPSConnection"
+        )
+        response = connection_class.return_value.getresponse.return_value
+        response.status = 200
+        response.headers = {}
+        response.read.return_value = b"{}"
+        source = HttpConfigurationSource("https://config.example.com", cache_path)
+
+        assert source.read() == {}
+        connection_class.assert_called_once_with("config.example.com", timeout=5.0)
+        connection_class.return_value.request.assert_called_once_with(
+            "GET", "/", headers={"Accept": "application/json"}
+        )
+
+    @pytest.mark.parametrize("url", ["ftp://example.com/config", "config.json"])
+    def test_invalid_url(self, url):
+        with pytest.raises(ValueError):
+            HttpConfigurationSource(url)
+
+    def test_pickle(self, source):
+        source.read()
+
+        unpickled = pickle.loads(pickle.dumps(source))
+
+        assert unpickled._connection is None
+        assert unpickled._payload is None
+        assert unpickled.read() == {"app": {"key": "value"}}
+        unpickled.close()
+
+    def test_config(self, source):
+        assert Config(source.read()).get("app.key") == "value"
@@ -0,0 +1,96 @@
+import subprocess
+import sys
+from os.path import dirname
+
+import pytest
+
+import prosper_shared.omni_config
+from prosper_shared.omni_config import Config
+
+REPO_ROOT = dirname(dirname(dirname(__file__)))
+
+HEAVY_MODULES = [
+    "argparse",
+    "caseconverter",
+    "decimal",
+    "deepmerge",
+    "dpath",
+    "platformdirs",
+    "schema",
+    "toml",
+    "yaml",
+]
+
+CONFIG_GET_SCRIPT = (
+    "from prosper_shared.omni_config import Config;"
+    "Config({'section': {'key': 'value'}}).get('section.key')"
+)
+
+# The stdlib modules `Config` genuinely needs; their cost is subtracted so the budget only covers this package.
+BASELINE_SCRIPT = "import importlib, logging, typing"
+
+# The dependencies `Config` used to import eagerly. Their import time, measured alongside, is the yardstick for the
+# budget, so it holds on slower and busier machines alike.
+EAGER_IMPORTS_SCRIPT = (
+    f"{BASELINE_SCRIPT}, argparse, decimal, deepmerge, dpath, platformdirs, schema"
+)
+
+# The share of the eager imports' cost that importing `Config` and getting a value may take.
+IMPORT_TIME_BUDGET_RATIO = 0.5
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _total_import_time_us(script: str) -> int:
+    """Sums the self time of every module imported by the given script, as reported by `-X importtime`."""
+    stderr = _run_python("-X", "importtime", "-c", script).stderr
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        total += int(line.split(":", 1)[1].split("|")[0])
+    return total
+
+
+class TestImport:
+    def test_lazy_member_is_cached(self):
+        assert prosper_shared.omni_config.Config is Config
+        assert prosper_shared.omni_config.__dict__["Config"] is Config
+
+    def test_unknown_member(self):
+        with pytest.raises(AttributeError):
+            prosper_shared.omni_config.NonexistentMember
+
+    def test_dir_includes_lazy_members(self):
+        assert set(prosper_shared.omni_config.__all__) <= set(
+            dir(prosper_shared.omni_config)
+        )
+
+    def test_config_get_does_not_import_heavy_modules(self):
+        result = _run_python(
+            "-c",
+            f"{CONFIG_GET_SCRIPT};import sys;print('\\n'.join(sys.modules))",
+        )
+
+        assert [m for m in HEAVY_MODULES if m in result.stdout.splitlines()] == []
+
+    def test_import_time_within_budget(self):
+        # Take the fastest of a few runs of each script to keep scheduling noise out of the measurement.
+        fastest_us = {
+            script: min(_total_import_time_us(script) for _ in range(5))
+            for script in (BASELINE_SCRIPT, CONFIG_GET_SCRIPT, EAGER_IMPORTS_SCRIPT)
+        }
+        import_cost_us = fastest_us[CONFIG_GET_SCRIPT] - fastest_us[BASELINE_SCRIPT]
+        eager_import_cost_us = (
+            fastest_us[EAGER_IMPORTS_SCRIPT] - fastest_us[BASELINE_SCRIPT]
+        )
+
+        assert import_cost_us < eager_import_cost_us * IMPORT_TIME_BUDGET_RATIO
@@ -0,0 +1,144 @@
+import pytest
+
+from prosper_shared.omni_config import Config
+from prosper_shared.omni_config._index import _KeyIndex
+
+TEST_CONFIG = {
+    "strategies": {
+        "conservative": {"max_bid": 25, "grades": ["A", "B"]},
+        "aggressive": {"max_bid": 100, "grades": []},
+        "aggressive-2": {"max_bid": 50},
+    },
+    "strategies-extra": {"max_bid": 1},
+    "empty": {},
+    "flag": True,
+    1: "int key",
+}
+
+
+class TestIndex:
+    @pytest.fixture
+    def config(self):
+        return Config(TEST_CONFIG)
+
+    @pytest.mark.parametrize(
+        ["prefix", "expected_keys"],
+        [
+            (
+                "",
+                [
+                    "1",
+                    "empty",
+                    "flag",
+                    "strategies-extra.max_bid",
+                    "strategies.aggressive-2.max_bid",
+                    "strategies.aggressive.grades",
+                    "strategies.aggressive.max_bid",
+                    "strategies.conservative.grades.0",
+                    "strategies.conservative.grades.1",
+                    "strategies.conservative.max_bid",
+                ],
+            ),
+            (
+                "strategies.aggressive",
+                ["strategies.aggressive.grades", "strategies.aggressive.max_bid"],
+            ),
+            (
+                ".strategies.conservative.grades.",
+                [
+                    "strategies.conservative.grades.0",
+                    "strategies.conservative.grades.1",
+                ],
+            ),
+            ("strategies.aggressive.max_bid", ["strategies.aggressive.max_bid"]),
+            ("empty", ["empty"]),
+            ("strat", []),
+            ("missing", []),
+        ],
+    )
+    def test_keys(self, config, prefix, expected_keys):
+        assert config.keys(prefix) == expected_keys
+
+    @pytest.mark.parametrize(
+        ["pattern", "expected_keys"],
+        [
+            (
+                "strategies.*.max_bid",
+                [
+                    "strategies.aggressive-2.max_bid",
+                    "strategies.aggressive.max_bid",
+                    "strategies.conservative.max_bid",
+                ],
+            ),
+            (
+                "strategies.aggressive*",
+                ["strategies.aggressive", "strategies.aggressive-2"],
+            ),
+            (
+                "strategies.conservative.grades.[01]",
+                [
+                    "strategies.conservative.grades.0",
+                    "strategies.conservative.grades.1",
+                ],
+            ),
+            (
+                "**.max_bid",
+                [
+                    "strategies-extra.max_bid",
+                    "strategies.aggressive-2.max_bid",
+                    "strategies.aggressive.max_bid",
+                    "strategies.conservative.max_bid",
+                ],
+            ),
+            (
+                "strategies.**.**.grades",
+                ["strategies.aggressive.grades", "strategies.conservative.grades"],
+            ),
+            (".flag", ["flag"]),
+            ("1", ["1"]),
+            ("strategies.missing.*", []),
+            ("", []),
+        ],
+    )
+    def test_find(self, config, pattern, expected_keys):
+        assert config.find(pattern) == expected_keys
+
+    def test_found_keys_can_be_looked_up(self, config):
+        assert [config.get(key) for key in config.find("strategies.*.max_bid")] == [
+            50,
+            100,
+            25,
+        ]
+
+    def test_index_is_reused_for_the_same_tree(self, config, mocker):
+        index_spy = mocker.spy(_KeyIndex, "__init__")
+
+        config.keys()
+        config.find("**")
+        assert index_spy.call_count == 1
+
+        config._config_dict = {"other": 1}
+        assert config.keys() == ["other"]
+        assert index_spy.call_count == 2
+
+    def test_view(self, config):
+        view = config.view("strategies")
+
+        assert view.keys("aggressive") == ["aggressive.grades", "aggressive.max_bid"]
+        assert view.keys()[:2] == ["aggressive-2.max_bid", "aggressive.grades"]
+        assert view.find("*.max_bid") == [
+            "aggressive-2.max_bid",
+            "aggressive.max_bid",
+            "conservative.max_bid",
+        ]
+        assert view.find("**") == config.view("strategies.").find(".**")
+        assert config.view("").keys("flag") == ["flag"]
+        assert config.view("").find("fl?g") == ["flag"]
+        assert config.view("flag").keys() == []
+
+    @pytest.mark.parametrize("config_dict", [None, {}])
+    def test_empty_config(self, config_dict):
+        config = Config(config_dict)
+
+        assert config.keys() == []
+        assert config.find("**") == []
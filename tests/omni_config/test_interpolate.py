@@ -0,0 +1,224 @@
+import pickle
+
+import pytest
+
+from prosper_shared.omni_config import Config
+from prosper_shared.omni_config import _transfer as transfer
+from prosper_shared.omni_config._interpolate import _Interpolator
+
+TEST_CONFIG = {
+    "api": {
+        "host": "example.com",
+        "port": 443,
+        "base_url": "https://${api.host}:${api.port}",
+        "v1": "${api.base_url}/v1",
+    },
+    "client": {
+        "port": "${api.port}",
+        "endpoints": ["${api.v1}/accounts", "${api.v1}/orders"],
+        "api": "${api}",
+        "escaped": "$${api.host} costs $$5",
+    },
+    "other": {"key": "value"},
+}
+
+
+class TestInterpolate:
+    @pytest.fixture
+    def config(self):
+        return Config(TEST_CONFIG, interpolate=True)
+
+    @pytest.mark.parametrize(
+        ["key", "expected_value"],
+        [
+            ("api.host", "example.com"),
+            ("api.base_url", "https://example.com:443"),
+            ("api.v1", "https://example.com:443/v1"),
+            (".api.v1", "https://example.com:443/v1"),
+            ("client.port", 443),
+            ("client.endpoints.1", "https://example.com:443/v1/orders"),
+            (
+                "client.endpoints",
+                [
+                    "https://example.com:443/v1/accounts",
+                    "https://example.com:443/v1/orders",
+                ],
+            ),
+            ("client.api.v1", "https://example.com:443/v1"),
+            ("client.port.nested", None),
+            ("client.escaped", "${api.host} costs $$5"),
+            ("cli?nt.port", 443),
+            ("other.key", "value"),
+            ("missing", None),
+        ],
+    )
+    def test_get(self, config, key, expected_value):
+        assert config.get(key) == expected_value
+        assert config.get(key) == expected_value
+
+    def test_get_subtree(self, config):
+        assert config.get("client")["api"] == {
+            "host": "example.com",
+            "port": 443,
+            "base_url": "https://example.com:443",
+            "v1": "https://example.com:443/v1",
+        }
+
+    def test_interpolation_is_opt_in(self):
+        assert Config(TEST_CONFIG).get("api.v1") == "${api.base_url}/v1"
+
+    def test_values_are_memoized(self, config, mocker):
+        interpolate_spy = mocker.spy(_Interpolator, "interpolate")
+
+        first = config.get("client.endpoints")
+        call_count = interpolate_spy.call_count
+        second = config.get("client.endpoints")
+
+        assert second is first
+        assert interpolate_spy.call_count == call_count
+        assert config.get("other") is config._config_dict["other"]
+        assert ("other",) not in config._interpolator._resolved
+
+    def test_get_as_accessors(self):
+        config = Config(
+            {"a": {"price": "12.5", "enabled": "true"}, "b": "${a.price}"},
+            interpolate=True,
+        )
+
+        assert str(config.get_as_decimal("b")) == "12.5"
+
+    @pytest.mark.parametrize(
+        "config_dict",
+        [
+            {"a": "${a}"},
+            {"a": "${b}", "b": "x${a}"},
+            {"a": {"b": "${a}"}},
+            {"a": "${b.c}", "b": {"c": "${d}", "e": 1}, "d": "${b}"},
+        ],
+    )
+    def test_circular_reference(self, config_dict):
+        with pytest.raises(ValueError, match="Circular config reference"):
+            Config(config_dict, interpolate=True)
+
+    def test_long_reference_chain(self):
+        config_dict = {f"k{i}": f"${{k{i + 1}}}" for i in range(5000)}
+        config_dict["k5000"] = "value"
+
+        assert Config(config_dict, interpolate=True).get("k4990") == "value"
+
+        config_dict["k5000"] = "${k0}"
+        with pytest.raises(ValueError, match="Circular config reference: k0 -> k1"):
+            Config(config_dict, interpolate=True)
+
+    def test_unresolved_reference(self):
+        config = Config({"a": "${missing.key}/v1"}, interpolate=True)
+
+        with pytest.raises(ValueError, match=r"\${missing.key}"):
+            config.get("a")
+
+    def test_reload_only_invalidates_dependent_values(self, config):
+        endpoints = config.get("client.endpoints")
+        port = config.get("client.port")
+        escaped = config.get("client.escaped")
+
+        config._config_dict = {
+            **TEST_CONFIG,
+            "api": {**TEST_CONFIG["api"], "host": "example.org"},
+            "other": {"key": "changed"},
+        }
+
+        assert config.get("client.port") is port
+        assert config.get("client.escaped") is escaped
+        assert config.get("client.endpoints") == [
+            "https://example.org:443/v1/accounts",
+            "https://example.org:443/v1/orders",
+        ]
+        assert config.get("client.endpoints") is not endpoints
+        assert config.get("other.key") == "changed"
+
+    def test_reload_with_new_and_removed_references(self, config):
+        config.get("client.port")
+        config.get("api.v1")
+
+        config._config_dict = {
+            "api": {"host": "example.com", "v1": "${other.key}"},
+            "client": {"port": 80},
+            "other": {"key": "value"},
+        }
+
+        assert config.get("client.port") == 80
+        assert config.get("api.v1") == "value"
+
+    def test_reload_with_circular_reference(self, config):
+        config._config_dict = {**TEST_CONFIG, "other": {"key": "${other}"}}
+
+        with pytest.raises(ValueError, match="Circular config reference"):
+            config.get("api.v1")
+
+    def test_override(self, config):
+        v1 = config.get("api.v1")
+
+        with config.override({"api.host": "localhost"}):
+            assert config.get("api.v1") == "https://localhost:443/v1"
+            assert config.view("client").get("endpoints.0") == (
+                "https://localhost:443/v1/accounts"
+            )
+
+        assert config.get("api.v1") is v1
+
+    def test_override_with_circular_reference(self, config):
+        with config.override({"api.host": "${api.v1}"}):
+            with pytest.raises(ValueError, match="Circular config reference"):
+                config.get("api.v1")
+
+        assert config.get("api.v1") == "https://example.com:443/v1"
+
+    def test_view(self, config):
+        view = config.view("client")
+
+        assert view.get("port") == 443
+        assert view._config_dict["port"] == "${api.port}"
+
+    def test_pickle(self, config):
+        unpickled = pickle.loads(pickle.dumps(config))
+
+        assert unpickled.get("client.port") == 443
+
+    def test_pickle_view(self, config):
+        assert pickle.loads(pickle.dumps(config.view("client"))).get("port") == 443
+        assert pickle.loads(pickle.dumps(config.view(""))).get("client.port") == 443
+
+    def test_handle(self, mocker, config):
+        cached_configs = mocker.patch.object(
+            transfer, "_cached_configs", transfer.OrderedDict()
+        )
+
+        with config.handle() as handle, Config(TEST_CONFIG).handle() as plain_handle:
+            pickled = pickle.dumps(handle)
+            cached_configs.clear()
+
+            assert handle.digest != plain_handle.digest
+            assert pickle.loads(pickled).get("client.port") == 443
+
+    def test_handle_view(self, mocker, config):
+        cached_configs = mocker.patch.object(
+            transfer, "_cached_configs", transfer.OrderedDict()
+        )
+
+        with config.view("client").handle() as handle:
+            pickled = pickle.dumps(handle)
+            cached_configs.clear()
+
+            assert pickle.loads(pickled).get("port") == 443
+
+    def test_share(self, config):
+        segment = config.share()
+        try:
+            attached = Config.attach(segment.name)
+
+            assert attached.get("client.port") == 443
+            assert attached.view("client").get("port") == 443
+            attached.close()
+        finally:
+            segment.close()
+            segment.unlink()
@@ -3,6 +3,7 @@ from copy import deepcopy
 import pytest
 
 from prosper_shared.omni_config import merge_config
+from prosper_shared.omni_config._merge import _diff_config
 
 
 class TestMerge:
@@ -31,3 +32,22 @@ class TestMerge:
         assert merge_config([conf1, conf2]) == expected_config
         assert conf1 == original_conf1
         assert conf2 == original_conf2
+
+    @pytest.mark.parametrize(
+        ["old", "new", "expected"],
+        [
+            ({}, {}, ([], [])),
+            ({"a": 1}, {"a": 1}, ([], [])),
+            ({"a": 1}, {"a": True}, ([(["a"], True)], [])),
+            ({"a": 1}, {"b": 1}, ([(["b"], 1)], [["a"]])),
+            ({"a": {"b": 1}}, {"a": 1}, ([(["a"], 1)], [])),
+            (
+                {"a": {"b": 1, "c": [1]}},
+                {"a": {"b": 1, "c": [1, 2]}},
+                ([(["a", "c"], [1, 2])], []),
+            ),
+            ({"a": {"b": {"c": 1}}}, {"a": {"b": {}}}, ([], [["a", "b", "c"]])),
+        ],
+    )
+    def test_diff_config(self, old, new, expected):
+        assert _diff_config(old, new) == expected
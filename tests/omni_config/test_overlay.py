@@ -0,0 +1,177 @@
+import asyncio
+import threading
+
+import pytest
+
+from prosper_shared.omni_config import Config
+from prosper_shared.omni_config._overlay import _flatten_overrides
+
+TEST_CONFIG = {
+    "account": {"limit": 100, "currency": "USD", "tags": ["a", "b"]},
+    "other": {"key": "value"},
+}
+
+
+class TestOverlay:
+    @pytest.fixture
+    def config(self):
+        return Config(TEST_CONFIG)
+
+    @pytest.mark.parametrize(
+        ["overrides", "key", "expected_value"],
+        [
+            ({"account": {"limit": 200}}, "account.limit", 200),
+            ({"account": {"limit": 200}}, "account.currency", "USD"),
+            ({"account.limit": 200}, "account.limit", 200),
+            ({"account.limit": 200}, ".account.limit", 200),
+            (
+                {"account.limit": 200},
+                "account",
+                {"limit": 200, "currency": "USD", "tags": ["a", "b"]},
+            ),
+            ({"account": {"new": {"nested": 1}}}, "account.new", {"nested": 1}),
+            ({"account.tags": ["c"]}, "account.tags.0", "c"),
+            ({"account.tags": ["c"]}, "account.tags.1", None),
+            ({"account": "replaced"}, "account.limit", None),
+            ({"account": {}}, "account", {}),
+            ({"missing.key": 1}, "missing", {"key": 1}),
+            ({"account.limit": None}, "account.limit", None),
+            ({"account.limit": 200}, "acc?unt.limit", 200),
+            ({"account.limit": 200}, "other.key", "value"),
+        ],
+    )
+    def test_override(self, config, overrides, key, expected_value):
+        with config.override(overrides) as overridden:
+            assert overridden is config
+            assert config.get(key) == expected_value
+
+        assert config._config_dict == TEST_CONFIG
+        assert config.get("account.limit") == 100
+
+    def test_nested_overrides(self, config):
+        with config.override({"account.limit": 200, "other.key": "first"}):
+            with config.override({"account": "replaced"}):
+                assert config.get("account") == "replaced"
+                assert config.get("other.key") == "first"
+                with config.override({"account.limit": 300}):
+                    assert config.get("account") == {"limit": 300}
+            assert config.get("account.limit") == 200
+
+        assert config.get("account.limit") == 100
+
+    def test_override_is_reset_on_error(self, config):
+        with pytest.raises(ValueError):
+            with config.override({"account.limit": 200}):
+                raise ValueError()
+
+        assert config.get("account.limit") == 100
+
+    def test_get_as_accessors(self, config):
+        with config.override({"account": {"limit": "12.5", "enabled": "yes"}}):
+            assert str(config.get_as_decimal("account.limit")) == "12.5"
+            assert config.get_as_bool("account.enabled") is True
+
+    def test_whole_config_operations_ignore_overrides(self, config):
+        fingerprint = config.fingerprint
+
+        with config.override({"account.limit": 200}):
+            assert config.fingerprint == fingerprint
+            assert config.fingerprint == Config(TEST_CONFIG).fingerprint
+
+    def test_override_is_isolated_between_threads(self, config):
+        entered = threading.Event()
+        checked = threading.Event()
+        values = []
+
+        def _override_in_thread():
+            with config.override({"account.limit": 200}):
+                entered.set()
+                checked.wait(5)
+                values.append(config.get("account.limit"))
+
+        thread = threading.Thread(target=_override_in_thread)
+        thread.start()
+        entered.wait(5)
+        values.append(config.get("account.limit"))
+        checked.set()
+        thread.join()
+
+        assert values == [100, 200]
+
+    def test_override_is_isolated_between_tasks(self, config):
+        async def _get_with_override(limit):
+            with config.override({"account.limit": limit}):
+                await asyncio.sleep(0)
+                return config.get("account.limit")
+
+        async def _run():
+            with config.override({"other.key": "outer"}):
+                results = await asyncio.gather(
+                    _get_with_override(200), _get_with_override(300)
+                )
+                return results, config.get("account.limit"), config.get("other.key")
+
+        assert asyncio.run(_run()) == ([200, 300], 100, "outer")
+
+    def test_view_sees_parent_overrides(self, config):
+        view = config.view("account")
+
+        with config.override({"account.limit": 200}):
+            assert view.get("limit") == 200
+            assert view._config_dict["limit"] == 100
+
+    def test_view_override(self, config):
+        view = config.view("account")
+
+        with view.override({"limit": 200}) as overridden:
+            assert overridden is view
+            assert view.get("limit") == 200
+            assert config.get("account.limit") == 200
+            assert config.get("other.key") == "value"
+
+        with config.view("").override({"other.key": "overridden"}):
+            assert config.get("other.key") == "overridden"
+
+    def test_shared_memory_config_override(self):
+        segment = Config(TEST_CONFIG).share()
+        try:
+            config = Config.attach(segment.name)
+            with config.override({"account.limit": 200}):
+                assert config.get("account.limit") == 200
+                assert config.view("account").get("currency") == "USD"
+            config.close()
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def test_override_list_items(self):
+        config = Config({"a": {"b": [1, 2], "c": [{"d": 1}], "n": 1}})
+
+        with config.override({"a.b.0": 5, "a.c.-1.d": 2, "a.b.3": 6}):
+            assert config.get("a.b") == [5, 2, None, 6]
+            assert config.get("a") == {"b": [5, 2, None, 6], "c": [{"d": 2}], "n": 1}
+            assert config.get("a.b.0") == 5
+            assert config.get("a.b.1") == 2
+            assert config.get("a.c.0.d") == 2
+            assert config.get("a.b.-1") == 6
+
+        assert config.get("a") == {"b": [1, 2], "c": [{"d": 1}], "n": 1}
+
+    def test_override_list_with_non_index_key(self):
+        config = Config({"a": [1, 2]})
+
+        with config.override({"a.-3": 5}):
+            assert config.get("a") == [1, 2]
+        with config.override({"a.b": 5}):
+            assert config.get("a") == {"b": 5}
+
+    def test_flatten_overrides(self):
+        assert _flatten_overrides(
+            {"a": {"b": 1, "c.d": 2, "e": {}}, ".f.": 3, 4: 5}, ("prefix",)
+        ) == (
+            (("prefix", "a", "b"), 1),
+            (("prefix", "a", "c", "d"), 2),
+            (("prefix", "a", "e"), {}),
+            (("prefix", "f"), 3),
+            (("prefix", "4"), 5),
+        )
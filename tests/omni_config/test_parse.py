@@ -13,7 +13,21 @@ from prosper_shared.omni_config import (
     TomlConfigurationSource,
     YamlConfigurationSource,
 )
-from prosper_shared.omni_config._parse import _extract_defaults_from_schema
+from prosper_shared.omni_config._parse import (
+    _extract_defaults_from_schema,
+    _extract_toml_tables,
+)
+
+PYPROJECT_LIB_CONFIG = {
+    "section1": {
+        "float_config": 123.456,
+        "int_config": 123,
+        "list_config": ["asdf", "qwer"],
+        "string_config": "string value",
+    },
+    "section2": {"nested_lists": [[1, 2], [3]], "literal": "[tool.ignored]\n"},
+    "items": [{"name": "first"}, {"name": "second"}],
+}
 
 
 class TestParse:
@@ -73,6 +87,44 @@ class TestParse:
         with pytest.raises(ValueError):
             toml_config_source.read()
 
+    def test_toml_read_with_config_root_not_found(self):
+        toml_config_source = TomlConfigurationSource(
+            join(dirname(__file__), "data", "test_parse_config.toml"),
+            "tool.other-lib-name",
+        )
+
+        assert toml_config_source.read() == {}
+
+    @pytest.mark.parametrize("streaming", [False, True])
+    def test_toml_read_pyproject_with_config_root(self, streaming):
+        toml_config_source = TomlConfigurationSource(
+            join(dirname(__file__), "data", "test_parse_pyproject.toml"),
+            "tool.lib-name",
+            streaming=streaming,
+        )
+
+        assert toml_config_source.read() == PYPROJECT_LIB_CONFIG
+
+    def test_toml_read_streaming_skips_unrelated_tables(self):
+        with open(join(dirname(__file__), "data", "test_parse_pyproject.toml")) as f:
+            content = f.read()
+
+        extracted = _extract_toml_tables(content, ["tool", "lib-name"])
+
+        assert "poetry" not in extracted
+        assert "ruff" not in extracted
+        assert "mypy" not in extracted
+        assert "dropped" not in extracted
+        assert 'top_level = "kept"' in extracted
+        assert "other = 'tool table [kept]'" in extracted
+
+    def test_toml_read_streaming_keeps_uninterpretable_tables(self):
+        content = "[tool.bad key]\nvalue = 1\n[tool.dropped]\nvalue = 2"
+
+        assert _extract_toml_tables(content, ["tool", "lib-name"]) == (
+            "[tool.bad key]\nvalue = 1"
+        )
+
     def test_toml_read_not_exists(self):
         toml_config_source = TomlConfigurationSource(
             join(dirname(__file__), "non_existent.toml")
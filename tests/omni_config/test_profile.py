@@ -0,0 +1,168 @@
+import json
+
+import pytest
+import yaml
+
+from prosper_shared.omni_config import Config, JsonConfigurationSource
+from prosper_shared.omni_config._profile import _discover_profile_sources
+
+APP_NAME = "profile-app"
+
+
+class TestProfile:
+    @pytest.fixture
+    def app_config_files(self):
+        return {
+            f".{APP_NAME}.json": {APP_NAME: {"env": "base", "file": "base"}},
+            f".{APP_NAME}.staging.json": {APP_NAME: {"env": "staging"}},
+            f".{APP_NAME}.prod.json": {APP_NAME: {"env": "prod", "file": "prod"}},
+        }
+
+    @pytest.fixture
+    def app_dir(self, app_dir):
+        user_config_dir = app_dir / "config" / APP_NAME
+        user_config_dir.mkdir(parents=True)
+        (user_config_dir / "config.prod.yml").write_text(
+            yaml.safe_dump({APP_NAME: {"env": "overridden", "user": "prod"}})
+        )
+        return app_dir
+
+    def test_autoconfig_without_profile(self, app_dir):
+        config = Config.autoconfig(APP_NAME)
+
+        assert config.profiles == ["prod", "staging"]
+        assert config.profile is None
+        assert config.get(APP_NAME) == {"key": "default", "env": "base", "file": "base"}
+
+    def test_autoconfig_with_profile(self, app_dir):
+        config = Config.autoconfig(APP_NAME, profile="prod")
+
+        assert config.profile == "prod"
+        assert config.get(APP_NAME) == {
+            "key": "default",
+            "env": "prod",
+            "file": "prod",
+            "user": "prod",
+        }
+
+    def test_environment_overrides_profile(self, app_dir, monkeypatch):
+        monkeypatch.setenv("PROFILE_APP_PROFILE-APP__ENV", "from env")
+
+        config = Config.autoconfig(APP_NAME, profile="staging")
+
+        assert config.get(f"{APP_NAME}.env") == "from env"
+
+    def test_use_profile(self, app_dir, mocker):
+        config = Config.autoconfig(APP_NAME)
+        read_spy = mocker.spy(JsonConfigurationSource, "read")
+
+        config.use_profile("staging")
+        assert config.profile == "staging"
+        assert config.get(f"{APP_NAME}.env") == "staging"
+        assert read_spy.call_count > 0
+
+        config.use_profile("prod")
+        assert config.get(f"{APP_NAME}.env") == "prod"
+        read_spy.reset_mock()
+
+        config.use_profile(None)
+        assert config.get(f"{APP_NAME}.env") == "base"
+        config.use_profile("staging")
+        assert config.get(f"{APP_NAME}.env") == "staging"
+        read_spy.assert_not_called()
+
+    def test_use_profile_with_interpolation(self, app_dir):
+        (app_dir / f".{APP_NAME}.json").write_text(
+            json.dumps(
+                {
+                    APP_NAME: {
+                        "env": "base",
+                        "host": "${%s.env}.example.com" % APP_NAME,
+                        "label": "${%s.key}" % APP_NAME,
+                    }
+                }
+            )
+        )
+        config = Config.autoconfig(APP_NAME, interpolate=True)
+        label = config.get(f"{APP_NAME}.label")
+        assert config.get(f"{APP_NAME}.host") == "base.example.com"
+
+        config.use_profile("staging")
+
+        assert config.get(f"{APP_NAME}.host") == "staging.example.com"
+        assert config.get(f"{APP_NAME}.label") is label
+
+    def test_fingerprint_follows_profile(self, app_dir):
+        config = Config.autoconfig(APP_NAME)
+        fingerprint = config.fingerprint
+
+        config.use_profile("prod")
+
+        assert config.fingerprint != fingerprint
+
+    def test_unknown_profile(self, app_dir):
+        with pytest.raises(ValueError):
+            Config.autoconfig(APP_NAME, profile="unknown")
+
+        config = Config.autoconfig(APP_NAME)
+        with pytest.raises(ValueError):
+            config.use_profile("unknown")
+        assert config.profile is None
+
+    def test_config_without_profiles(self, tmp_path, mocker, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        mocker.patch("sys.argv", [APP_NAME])
+        mocker.patch(
+            "platformdirs.user_config_dir", lambda app: str(tmp_path / "config" / app)
+        )
+        config = Config.autoconfig(APP_NAME)
+
+        assert config.profiles == []
+        assert config.fingerprint == Config.autoconfig(APP_NAME).fingerprint
+        config.use_profile(None)
+        with pytest.raises(ValueError):
+            config.use_profile("prod")
+
+    def test_autoconfig_snapshot_with_profile(self, app_dir, mocker):
+        snapshot_path = str(app_dir / "config.snapshot")
+        Config.autoconfig(APP_NAME, snapshot_path=snapshot_path, profile="prod")
+        read_spy = mocker.spy(JsonConfigurationSource, "read")
+
+        config = Config.autoconfig(
+            APP_NAME, snapshot_path=snapshot_path, profile="prod"
+        )
+
+        read_spy.assert_not_called()
+        assert config.get(f"{APP_NAME}.env") == "prod"
+        config.use_profile("staging")
+        assert config.get(f"{APP_NAME}.env") == "staging"
+
+    def test_discover_profile_sources(self, tmp_path):
+        for name in [
+            "config.json",
+            "config.a.json",
+            "config.b.c.json",
+            "config.a.yml",
+            "config..json",
+            "other.a.json",
+        ]:
+            (tmp_path / name).write_text("{}")
+        (tmp_path / "config.d.json").mkdir()
+        base_source = JsonConfigurationSource(
+            str(tmp_path / "config.json"), "root", inject_at="inject"
+        )
+
+        profile_sources = _discover_profile_sources(
+            [
+                {},
+                base_source,
+                JsonConfigurationSource(str(tmp_path / "missing" / "config.json")),
+            ]
+        )
+
+        assert list(profile_sources) == ["a"]
+        (profile_source,) = profile_sources["a"]
+        assert profile_source._config_file_path == str(tmp_path / "config.a.json")
+        assert profile_source._config_root == "root"
+        assert profile_source._inject_at == "inject"
+        assert base_source._config_file_path == str(tmp_path / "config.json")
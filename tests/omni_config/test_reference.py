@@ -0,0 +1,135 @@
+import copy
+import json
+import mmap
+import pickle
+from array import array
+
+import pytest
+
+from prosper_shared.omni_config import Config, JsonConfigurationSource
+from prosper_shared.omni_config import _reference as reference
+from prosper_shared.omni_config._reference import (
+    _FileReference,
+    _load_file_references,
+)
+
+
+class TestReference:
+    @pytest.fixture
+    def config_file(self, tmp_path):
+        data_dir = tmp_path / "data"
+        data_dir.mkdir()
+        (data_dir / "blocklist.bin").write_bytes(array("q", [5, 7, 11]).tobytes())
+        (data_dir / "notes.txt").write_text("héllo", encoding="utf-8")
+        (data_dir / "empty.bin").write_bytes(b"")
+
+        config_file = tmp_path / "config.json"
+        config_file.write_text(
+            json.dumps(
+                {
+                    "app": {
+                        "blocklist": {
+                            "$file": "data/blocklist.bin",
+                            "$typecode": "q",
+                        },
+                        "raw": {"$file": "data/blocklist.bin"},
+                        "notes": {"$file": "data/notes.txt", "$encoding": "utf-8"},
+                        "datasets": [{"$file": "data/empty.bin"}],
+                        "plain": {"file": "data/notes.txt"},
+                    }
+                }
+            )
+        )
+        return config_file
+
+    @pytest.fixture
+    def config(self, config_file):
+        return Config(JsonConfigurationSource(str(config_file)).read())
+
+    def test_get(self, config, config_file):
+        blocklist = config.get("app.blocklist")
+
+        assert list(blocklist) == [5, 7, 11]
+        assert 7 in blocklist
+        assert blocklist.readonly
+        assert config.get("app.blocklist") is blocklist
+        assert bytes(config.get("app.raw")) == array("q", [5, 7, 11]).tobytes()
+        assert config.get("app.notes") == "héllo"
+        assert bytes(config.get("app.datasets.0")) == b""
+        assert config.get("app.plain") == {"file": "data/notes.txt"}
+        assert config.get_as_frozenset("app.blocklist") == frozenset({5, 7, 11})
+
+    def test_references_are_resolved_relative_to_the_config_file(
+        self, config, config_file
+    ):
+        (dataset,) = config.get("app.datasets")
+
+        assert isinstance(dataset, _FileReference)
+        assert dataset.declaration == {
+            "$file": str(config_file.parent / "data" / "empty.bin")
+        }
+        assert config._config_dict["app"]["blocklist"].declaration == {
+            "$file": str(config_file.parent / "data" / "blocklist.bin"),
+            "$typecode": "q",
+        }
+
+    def test_files_are_only_mapped_on_first_access(self, config, mocker):
+        mmap_spy = mocker.spy(reference.mmap, "mmap")
+
+        config.get("app.notes")
+        config.get("app.notes")
+
+        mmap_spy.assert_called_once()
+        assert mmap_spy.call_args.kwargs == {"access": mmap.ACCESS_READ}
+
+    def test_configs_without_references_are_not_walked(self, tmp_path, mocker):
+        load_spy = mocker.spy(reference, "_load_file_references")
+        config_file = tmp_path / "config.json"
+        config_file.write_text(json.dumps({"app": {"key": "value"}}))
+
+        JsonConfigurationSource(str(config_file)).read()
+
+        load_spy.assert_not_called()
+
+    def test_pickle_and_copy(self, config):
+        notes = config._config_dict["app"]["notes"]
+        notes.resolve()
+
+        unpickled = pickle.loads(pickle.dumps(notes))
+
+        assert unpickled == notes
+        assert unpickled._value is reference._UNLOADED
+        assert unpickled.resolve() == "héllo"
+        assert copy.deepcopy(notes) is notes
+        assert Config(config._config_dict).get("app.notes") == "héllo"
+
+    def test_equality(self):
+        assert _FileReference("/a", "q") == _FileReference("/a", "q")
+        assert _FileReference("/a", "q") != _FileReference("/a", "d")
+        assert _FileReference("/a") != {"$file": "/a"}
+        assert len({_FileReference("/a"), _FileReference("/a")}) == 1
+        assert repr(_FileReference("/a", encoding="utf-8")) == (
+            "_FileReference('/a', typecode=None, encoding='utf-8')"
+        )
+
+    def test_fingerprint(self, config, config_file):
+        other = Config(JsonConfigurationSource(str(config_file)).read())
+
+        assert other.fingerprint == config.fingerprint
+
+    @pytest.mark.parametrize(
+        "declaration",
+        [
+            {"$file": "a", "$other": 1},
+            {"$file": "a", "$typecode": "q", "$encoding": "utf-8"},
+        ],
+    )
+    def test_malformed_reference(self, declaration):
+        with pytest.raises(ValueError):
+            _load_file_references({"key": [declaration]}, "/base")
+
+    def test_missing_file(self, tmp_path):
+        config = Config({"key": _FileReference(str(tmp_path / "missing"))})
+
+        with pytest.raises(FileNotFoundError):
+            config.get("key")
@@ -0,0 +1,195 @@
+import copy
+import pickle
+
+import pytest
+from schema import Regex, SchemaError, Use
+
+from prosper_shared.omni_config import Config, SecretsDirectoryConfigurationSource
+from prosper_shared.omni_config import _secrets as secrets
+from prosper_shared.omni_config._config import _resolve_sources
+from prosper_shared.omni_config._secrets import _SecretFile
+
+
+class TestSecrets:
+    @pytest.fixture
+    def secrets_dir(self, tmp_path):
+        secrets_dir = tmp_path / "secrets"
+        (secrets_dir / "prosper-api").mkdir(parents=True)
+        (secrets_dir / "prosper-api" / "client-id").write_text("id\n")
+        (secrets_dir / "prosper-api" / "client-secret").write_text("secret\r\n")
+        (secrets_dir / "token").write_text("token")
+        (secrets_dir / "empty").mkdir()
+        (secrets_dir / "..data").mkdir()
+        (secrets_dir / "..data" / "token").write_text("hidden")
+        return secrets_dir
+
+    @pytest.fixture
+    def clock(self, mocker):
+        return mocker.patch.object(secrets.time, "monotonic", return_value=100.0)
+
+    def test_read(self, secrets_dir):
+        source = SecretsDirectoryConfigurationSource(str(secrets_dir))
+
+        assert source.read() == {
+            "prosper-api": {
+                "client-id": _SecretFile(
+                    str(secrets_dir / "prosper-api" / "client-id")
+                ),
+                "client-secret": _SecretFile(
+                    str(secrets_dir / "prosper-api" / "client-secret")
+                ),
+            },
+            "token": _SecretFile(str(secrets_dir / "token")),
+        }
+
+    def test_get(self, secrets_dir):
+        config = Config(SecretsDirectoryConfigurationSource(str(secrets_dir)).read())
+
+        assert config.get("prosper-api.client-id") == "id"
+        assert config.get("prosper-api.client-secret") == "secret"
+        assert config.get("token") == "token"
+        assert config.get("empty") is None
+
+    def test_secrets_are_read_on_first_access(self, secrets_dir, mocker):
+        open_spy = mocker.patch.object(secrets, "open", create=True, wraps=open)
+        config = Config(SecretsDirectoryConfigurationSource(str(secrets_dir)).read())
+        open_spy.assert_not_called()
+
+        config.get("token")
+        config.get("token")
+
+        open_spy.assert_called_once()
+
+    def test_secrets_are_read_again_after_ttl(self, secrets_dir, clock):
+        source = SecretsDirectoryConfigurationSource(str(secrets_dir), ttl=10)
+        config = Config(source.read())
+        assert config.get("token") == "token"
+
+        (secrets_dir / "token").write_text("rotated")
+        clock.return_value = 109.0
+        assert config.get("token") == "token"
+
+        clock.return_value = 110.0
+        assert config.get("token") == "rotated"
+
+    def test_secrets_without_ttl_are_read_once(self, secrets_dir, clock):
+        config = Config(
+            SecretsDirectoryConfigurationSource(str(secrets_dir), ttl=None).read()
+        )
+        config.get("token")
+
+        (secrets_dir / "token").write_text("rotated")
+        clock.return_value = 1e9
+
+        assert config.get("token") == "token"
+
+    def test_cached_secrets_survive_reads(self, secrets_dir):
+        source = SecretsDirectoryConfigurationSource(str(secrets_dir))
+        token = source.read()["token"]
+        token.resolve()
+
+        (secrets_dir / "new").write_text("new")
+        assert source.read()["token"] is token
+
+        (secrets_dir / "token").unlink()
+        assert "token" not in source.read()
+        assert str(secrets_dir / "token") not in source._secrets
+
+    def test_inject_at(self, secrets_dir):
+        source = SecretsDirectoryConfigurationSource(
+            str(secrets_dir), inject_at="app.secrets"
+        )
+
+        assert Config(source.read()).get("app.secrets.token") == "token"
+
+    def test_missing_directory(self, tmp_path):
+        source = SecretsDirectoryConfigurationSource(
+            str(tmp_path / "missing"), inject_at="app"
+        )
+
+        assert source.read() == {}
+        assert source.fingerprint().endswith(":absent")
+
+    def test_fingerprint(self, secrets_dir):
+        source = SecretsDirectoryConfigurationSource(str(secrets_dir))
+        fingerprint = source.fingerprint()
+
+        (secrets_dir / "token").write_text("rotated")
+        assert source.fingerprint() == fingerprint
+        (secrets_dir / "other").write_text("other")
+        assert source.fingerprint() != fingerprint
+
+    def test_secret_file(self, secrets_dir):
+        token = _SecretFile(str(secrets_dir / "token"), 5)
+        token.resolve()
+
+        assert repr(token) == f"_SecretFile({str(secrets_dir / 'token')!r}, ttl=5)"
+        assert copy.deepcopy(token) is token
+        assert token != _SecretFile(str(secrets_dir / "token"), 6)
+        assert token != str(secrets_dir / "token")
+        assert len({token, _SecretFile(str(secrets_dir / "token"), 5)}) == 1
+
+        unpickled = pickle.loads(pickle.dumps(token))
+        assert unpickled == token
+        assert unpickled._value is None
+        assert unpickled.resolve() == "token"
+
+    def test_missing_secret(self, tmp_path):
+        config = Config({"token": _SecretFile(str(tmp_path / "missing"))})
+
+        with pytest.raises(FileNotFoundError):
+            config.get("token")
+
+    def test_fingerprint_of_config_never_reads_secrets(self, secrets_dir, mocker):
+        open_spy = mocker.patch.object(secrets, "open", create=True, wraps=open)
+        config = Config(SecretsDirectoryConfigurationSource(str(secrets_dir)).read())
+
+        assert config.fingerprint
+        open_spy.assert_not_called()
+
+    def test_validate_secrets(self, secrets_dir, clock):
+        schema = {
+            "prosper-api": {"client-id": str, "client-secret": Regex("^sec")},
+            "token": Use(str.upper),
+        }
+        config = Config(
+            SecretsDirectoryConfigurationSource(str(secrets_dir)).read(),
+            schema=schema,
+        )
+
+        assert config.get("prosper-api.client-id") == "id"
+        # Values converted by the schema are kept converted, rather than being reloaded.
+        assert config.get("token") == "TOKEN"
+        (secrets_dir / "prosper-api" / "client-id").write_text("rotated-id")
+        clock.return_value += 60
+        assert config.get("prosper-api.client-id") == "rotated-id"
+
+    def test_validate_invalid_secret(self, secrets_dir):
+        with pytest.raises(SchemaError):
+            Config(
+                SecretsDirectoryConfigurationSource(str(secrets_dir)).read(),
+                schema={"prosper-api": {str: Regex("^id$")}, "token": str},
+            )
+
+    def test_autoconfig_validates_secrets(self, secrets_dir):
+        source = SecretsDirectoryConfigurationSource(str(secrets_dir))
+
+        config_dict = _resolve_sources(
+            [source], {"prosper-api": {"client-id": int}}, validate=False
+        )
+        with pytest.raises(SchemaError):
+            _resolve_sources([source], {"prosper-api": {"client-id": int}}, True)
+        validated = _resolve_sources(
+            [source], {"prosper-api": Use(lambda secrets: "flattened")}, True
+        )
+
+        assert isinstance(config_dict["prosper-api"]["client-id"], _SecretFile)
+        assert validated == {"prosper-api": "flattened"}
+
+    def test_validate_secrets_in_list(self, secrets_dir):
+        token = _SecretFile(str(secrets_dir / "token"))
+
+        config = Config({"tokens": [token, "literal"]}, schema={"tokens": [str]})
+
+        assert config._config_dict == {"tokens": [token, "literal"]}
+        assert config.get("tokens.0") == "token"
@@ -0,0 +1,191 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+from decimal import Decimal
+
+import pytest
+
+from prosper_shared.omni_config import Config
+from prosper_shared.omni_config._shared import _SharedConfigReader
+
+TEST_CONFIG = {
+    "section": {
+        "string": "value",
+        "unicode": "välue",
+        "int": 123,
+        "big_int": 2**70,
+        "float": 123.456,
+        "true": True,
+        "false": False,
+        "none": None,
+        "decimal": Decimal("1.5"),
+        "int_keys": {1: "one"},
+        "list": [{"key": "first"}, {"key": "second"}],
+    },
+    "b_section": {"z": 1, "a": 2, "m": 3},
+}
+
+
+# Attaches to a segment from an unrelated process and a worker it spawns, then waits for its resource tracker to exit.
+ATTACH_SCRIPT = """
+import multiprocessing
+import os
+import sys
+from multiprocessing import resource_tracker
+
+from prosper_shared.omni_config import Config
+
+
+def get(name):
+    config = Config.attach(name)
+    try:
+        return config.get("key")
+    finally:
+        config.close()
+
+
+if __name__ == "__main__":
+    assert get(sys.argv[1]) == "value"
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        assert pool.apply(get, (sys.argv[1],)) == "value"
+
+    tracker = resource_tracker._resource_tracker
+    os.close(tracker._fd)
+    os.waitpid(tracker._pid, 0)
+"""
+
+
+def _get_from_shared_config(name, key):
+    config = Config.attach(name)
+    try:
+        return config.get(key)
+    finally:
+        config.close()
+
+
+class TestShared:
+    @pytest.fixture
+    def shared_config(self):
+        segment = Config(TEST_CONFIG).share()
+        config = Config.attach(segment.name)
+        yield config
+        config.close()
+        segment.close()
+        segment.unlink()
+
+    @pytest.mark.parametrize(
+        "key",
+        [
+            "section.string",
+            "section.unicode",
+            "section.int",
+            "section.big_int",
+            "section.float",
+            "section.true",
+            "section.false",
+            "section.none",
+            "section.decimal",
+            "section.int_keys",
+            "section.int_keys.1",
+            "section.list",
+            "section.list.1.key",
+            "section.list.-1.key",
+            "",
+            ".section.string",
+            "section",
+            "b_section",
+        ],
+    )
+    def test_get(self, shared_config, key):
+        assert shared_config.get(key) == Config(TEST_CONFIG).get(key)
+
+    @pytest.mark.parametrize(
+        "key",
+        [
+            "missing",
+            "section.missing",
+            "section.list.2",
+            "section.list.key",
+            "section.string.0",
+            "section.int_keys.2",
+            "section.list.-3",
+        ],
+    )
+    def test_get_missing(self, shared_config, key):
+        assert shared_config.get(key) is None
+
+    def test_get_preserves_key_order(self, shared_config):
+        assert list(shared_config.get("b_section")) == ["z", "a", "m"]
+
+    def test_get_with_glob(self, shared_config):
+        assert shared_config.get("section.li?t.1.key") == "second"
+
+    def test_get_as_accessors(self, shared_config):
+        assert shared_config.get_as_str("section.int") == "123"
+        assert shared_config.get_as_bool("section.true") is True
+        assert shared_config.get_as_decimal("section.float") == pytest.approx(
+            Decimal("123.456")
+        )
+
+    def test_whole_tree(self, shared_config):
+        assert shared_config._config_dict == TEST_CONFIG
+        assert shared_config.fingerprint == Config(TEST_CONFIG).fingerprint
+
+    def test_share_with_name(self):
+        segment = Config({"key": "value"}).share("omni_config_test_share")
+        try:
+            assert segment.name.endswith("omni_config_test_share")
+            assert _get_from_shared_config(segment.name, "key") == "value"
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def test_get_from_other_process(self):
+        segment = Config(TEST_CONFIG).share()
+        try:
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                assert (
+                    pool.apply(
+                        _get_from_shared_config, (segment.name, "section.list.0.key")
+                    )
+                    == "first"
+                )
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def test_attach_from_unrelated_process(self, mocker):
+        segment = Config({"key": "value"}).share()
+        mocker.patch("prosper_shared.omni_config._shared._created_segment_names", set())
+        unregister_mock = mocker.patch(
+            "prosper_shared.omni_config._shared.resource_tracker.unregister"
+        )
+        try:
+            assert _get_from_shared_config(segment.name, "key") == "value"
+            unregister_mock.assert_called_once_with(mocker.ANY, "shared_memory")
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def test_attach_from_child_of_unrelated_process(self, tmp_path):
+        script = tmp_path / "attach.py"
+        script.write_text(ATTACH_SCRIPT)
+        segment = Config({"key": "value"}).share()
+        try:
+            subprocess.run(
+                [sys.executable, str(script), segment.name],
+                check=True,
+                env=dict(os.environ, PYTHONPATH=os.getcwd()),
+                timeout=60,
+            )
+
+            # The unrelated process's resource tracker has exited without unlinking the segment.
+            assert _get_from_shared_config(segment.name, "key") == "value"
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def test_reader_invalid_buffer(self):
+        with pytest.raises(ValueError):
+            _SharedConfigReader(memoryview(b"NOTMAGIC\0\0\0\0\0"))
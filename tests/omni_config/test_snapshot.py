@@ -0,0 +1,251 @@
+import argparse
+import json
+import os
+import struct
+import subprocess
+import sys
+from enum import Enum
+from typing import Type
+
+import pytest
+from schema import Optional as SchemaOptional
+from schema import Or, Regex
+
+from prosper_shared.omni_config import (
+    ArgParseSource,
+    Config,
+    ConfigKey,
+    ConfigurationSource,
+    EnvironmentVariableSource,
+    JsonConfigurationSource,
+)
+from prosper_shared.omni_config._snapshot import (
+    _SNAPSHOT_HEADER,
+    _SNAPSHOT_MAGIC,
+    _fingerprint_schema,
+    _fingerprint_sources,
+    _read_snapshot,
+    _write_snapshot,
+)
+
+APP_NAME = "snapshot-app"
+
+
+class SnapshotEnum(Enum):
+    KEY = "value"
+
+
+def _schema(default="default"):
+    return {
+        APP_NAME: {
+            ConfigKey("key", "key desc", default=default): str,
+            SchemaOptional(ConfigKey("other", "other desc")): str,
+        }
+    }
+
+
+class TestSnapshot:
+    @pytest.fixture
+    def app_schema(self):
+        return _schema()
+
+    @pytest.fixture
+    def app_config_files(self):
+        return {f".{APP_NAME}.json": {APP_NAME: {"other": "from file"}}}
+
+    def test_autoconfig_writes_and_loads_snapshot(self, app_dir, mocker):
+        snapshot_path = str(app_dir / "config.snapshot")
+
+        config = Config.autoconfig(APP_NAME, validate=True, snapshot_path=snapshot_path)
+
+        assert os.path.exists(snapshot_path)
+        assert config.get(f"{APP_NAME}.key") == "default"
+        assert config.get(f"{APP_NAME}.other") == "from file"
+
+        read_spy = mocker.spy(JsonConfigurationSource, "read")
+        snapshot_config = Config.autoconfig(
+            APP_NAME, validate=True, snapshot_path=snapshot_path
+        )
+
+        read_spy.assert_not_called()
+        assert snapshot_config._config_dict == config._config_dict
+
+    def test_autoconfig_snapshot_stale_source_file(self, app_dir):
+        snapshot_path = str(app_dir / "config.snapshot")
+        Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+
+        (app_dir / f".{APP_NAME}.json").write_text(
+            json.dumps({APP_NAME: {"other": "changed in file"}})
+        )
+        config = Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+
+        assert config.get(f"{APP_NAME}.other") == "changed in file"
+
+    def test_autoconfig_snapshot_stale_environment(self, app_dir, monkeypatch):
+        snapshot_path = str(app_dir / "config.snapshot")
+        Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+
+        monkeypatch.setenv("SNAPSHOT_APP_SNAPSHOT-APP__OTHER", "from env")
+        config = Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+
+        assert config.get(f"{APP_NAME}.other") == "from env"
+
+    def test_autoconfig_snapshot_stale_schema(self, app_dir, realize_config_schemata):
+        snapshot_path = str(app_dir / "config.snapshot")
+        Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+
+        realize_config_schemata.return_value = [_schema("new default")]
+        config = Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+
+        assert config.get(f"{APP_NAME}.key") == "new default"
+
+    def test_autoconfig_snapshot_stale_validation(self, app_dir):
+        snapshot_path = str(app_dir / "config.snapshot")
+        Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+
+        with open(snapshot_path, "rb") as f:
+            snapshot = f.read()
+        Config.autoconfig(APP_NAME, validate=True, snapshot_path=snapshot_path)
+
+        with open(snapshot_path, "rb") as f:
+            assert f.read() != snapshot
+
+    @pytest.mark.parametrize(
+        "snapshot",
+        [
+            b"",
+            b"garbage",
+            _SNAPSHOT_HEADER.pack(b"NOTMAGIC", 1, 0),
+            _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, 999, 0),
+            _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, 1, 100) + b"{",
+        ],
+    )
+    def test_read_snapshot_invalid(self, tmp_path, snapshot):
+        snapshot_path = tmp_path / "config.snapshot"
+        snapshot_path.write_bytes(snapshot)
+
+        assert _read_snapshot(str(snapshot_path), "schema", []) is None
+
+    def test_read_snapshot_corrupt_payload(self, tmp_path):
+        snapshot_path = str(tmp_path / "config.snapshot")
+        _write_snapshot(snapshot_path, {"key": "value"}, "schema", ["source"])
+        with open(snapshot_path, "rb") as f:
+            snapshot = f.read()
+        with open(snapshot_path, "wb") as f:
+            f.write(snapshot[:-4])
+
+        assert _read_snapshot(snapshot_path, "schema", ["source"]) is None
+
+    def test_read_snapshot_not_found(self, tmp_path):
+        assert _read_snapshot(str(tmp_path / "missing"), "schema", []) is None
+
+    def test_snapshot_round_trip(self, tmp_path):
+        snapshot_path = str(tmp_path / "config.snapshot")
+        _write_snapshot(snapshot_path, {"key": ["value"]}, "schema", ["source"])
+
+        assert _read_snapshot(snapshot_path, "schema", ["source"]) == {"key": ["value"]}
+        assert _read_snapshot(snapshot_path, "other schema", ["source"]) is None
+        assert _read_snapshot(snapshot_path, "schema", ["other source"]) is None
+        assert (
+            struct.unpack_from("<8s", open(snapshot_path, "rb").read())[0]
+            == _SNAPSHOT_MAGIC
+        )
+
+    def test_snapshot_unsupported_source(self, tmp_path):
+        snapshot_path = str(tmp_path / "config.snapshot")
+        fingerprints = _fingerprint_sources(
+            [EnvironmentVariableSource("PREFIX"), ConfigurationSource()]
+        )
+
+        _write_snapshot(snapshot_path, {"key": "value"}, "schema", fingerprints)
+
+        assert fingerprints is None
+        assert not os.path.exists(snapshot_path)
+        assert _read_snapshot(snapshot_path, "schema", fingerprints) is None
+
+    def test_file_source_fingerprint(self, tmp_path):
+        config_path = tmp_path / "config.json"
+        source = JsonConfigurationSource(str(config_path))
+
+        absent_fingerprint = source.fingerprint()
+        config_path.write_text("{}")
+        present_fingerprint = source.fingerprint()
+
+        assert absent_fingerprint.endswith(":absent")
+        assert present_fingerprint != absent_fingerprint
+        assert present_fingerprint == source.fingerprint()
+
+    def test_fingerprint_schema_is_stable(self):
+        schema = {
+            ConfigKey("enum", "enum desc", default=SnapshotEnum.KEY): SnapshotEnum,
+            ConfigKey("regex", "regex desc"): Regex("^a+$"),
+            SchemaOptional("list", default=[1]): [int],
+            ConfigKey("either", "either desc"): Or(str, Type[SnapshotEnum]),
+            "callable": lambda value: value,
+            "nested": {ConfigKey("none", "none desc"): None},
+        }
+
+        assert _fingerprint_schema(schema, True) == _fingerprint_schema(
+            dict(reversed(list(schema.items()))), True
+        )
+        assert _fingerprint_schema(schema, True) != _fingerprint_schema(schema, False)
+
+    def test_fingerprint_schema_identifies_functions_by_code(self):
+        def greater_than(bound):
+            return lambda value: value > bound
+
+        assert _fingerprint_schema(
+            {"key": lambda value: value > 0}, True
+        ) == _fingerprint_schema({"key": lambda value: value > 0}, True)
+        assert _fingerprint_schema(
+            {"key": lambda value: value > 0}, True
+        ) != _fingerprint_schema({"key": lambda value: value < 0}, True)
+        assert _fingerprint_schema(
+            {"key": greater_than(0)}, True
+        ) != _fingerprint_schema({"key": greater_than(1)}, True)
+        assert _fingerprint_schema(
+            {"key": lambda value: [item for item in value if item]}, True
+        ) != _fingerprint_schema(
+            {"key": lambda value: [item for item in value if not item]}, True
+        )
+
+    def test_fingerprint_schema_is_stable_across_processes(self):
+        script = (
+            "from prosper_shared.omni_config._snapshot import _fingerprint_schema\n"
+            "print(_fingerprint_schema({'key': lambda value: value in {'a', 'b', 'c'}, "
+            "'choice': frozenset({'x', 'y', 'z'})}, True))\n"
+        )
+
+        fingerprints = {
+            subprocess.run(
+                [sys.executable, "-c", script],
+                env={**os.environ, "PYTHONHASHSEED": str(seed)},
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            for seed in range(3)
+        }
+
+        assert len(fingerprints) == 1
+        assert _fingerprint_schema({"choice": {"x", "y"}}, True) != _fingerprint_schema(
+            {"choice": {"x", "z"}}, True
+        )
+
+    def test_argparse_source_fingerprint(self, mocker):
+        def parser(default="default", **kwargs):
+            argument_parser = argparse.ArgumentParser(**kwargs)
+            argument_parser.add_argument(
+                "--key", default=default, type=lambda value: value.upper()
+            )
+            return argument_parser
+
+        mocker.patch("sys.argv", [APP_NAME, "--key", "value"])
+        fingerprint = ArgParseSource(parser()).fingerprint()
+
+        assert ArgParseSource(parser()).fingerprint() == fingerprint
+        assert ArgParseSource(parser("other")).fingerprint() != fingerprint
+        assert ArgParseSource(parser(prefix_chars="+-")).fingerprint() != fingerprint
+        assert ArgParseSource(parser(fromfile_prefix_chars="@")).fingerprint() is None
+        mocker.patch("sys.argv", [APP_NAME, "--key", "other"])
+        assert ArgParseSource(parser()).fingerprint() != fingerprint
@@ -0,0 +1,250 @@
+import json
+import pickle
+from datetime import date
+
+import pytest
+
+from prosper_shared.omni_config import Config, ConfigKey, SqliteConfigurationSource
+from prosper_shared.omni_config import _transfer as transfer
+
+APP_NAME = "sqlite-app"
+
+RULES = {
+    "rules": {
+        "A": {"max_bid": 100, "terms": [36, 60]},
+        "B": {"max_bid": 50, "enabled": False, "empty": {}},
+        "B-extra": {"max_bid": 1},
+    },
+    "updated": date(2024, 1, 2),
+}
+
+
+class TestSqlite:
+    @pytest.fixture
+    def database_path(self, tmp_path):
+        database_path = str(tmp_path / "rules.db")
+        SqliteConfigurationSource.write(database_path, RULES)
+        return database_path
+
+    @pytest.fixture
+    def source(self, database_path):
+        source = SqliteConfigurationSource(database_path)
+        yield source
+        source.close()
+
+    @pytest.mark.parametrize(
+        ["key", "expected_value"],
+        [
+            ("rules.A.max_bid", 100),
+            (".rules.A.terms", [36, 60]),
+            ("rules.B.enabled", False),
+            ("rules.B.empty", {}),
+            ("rules.B", {"max_bid": 50, "enabled": False, "empty": {}}),
+            ("rules.A.missing", None),
+            ("rul", None),
+            ("updated", "2024-01-02"),
+        ],
+    )
+    def test_get(self, source, key, expected_value):
+        assert source.get(key) == expected_value
+
+    def test_read(self, source):
+        assert source.read() == {**RULES, "updated": "2024-01-02"}
+        assert source.get("") == source.read()
+
+    def test_lookups_are_cached(self, database_path, mocker):
+        source = SqliteConfigurationSource(database_path, cache_size=2)
+        query_spy = mocker.spy(source, "_query")
+
+        source.get("rules.A.max_bid")
+        source.get("rules.B.max_bid")
+        source.get("rules.A.max_bid")
+        assert query_spy.call_count == 2
+
+        source.get("rules.missing")
+        source.get("rules.A.max_bid")
+        source.get("rules.B.max_bid")
+        assert query_spy.call_count == 4
+        source.close()
+
+    def test_missing_database(self, tmp_path):
+        source = SqliteConfigurationSource(str(tmp_path / "missing.db"))
+
+        assert source.read() == {}
+        assert source.get("key") is None
+        assert source.fingerprint().endswith(":absent")
+        source.close()
+
+    def test_database_is_read_only(self, source):
+        source.get("rules.A.max_bid")
+
+        with pytest.raises(Exception, match="readonly"):
+            source._connection.execute("DELETE FROM config")
+
+    def test_invalid_table_name(self, tmp_path):
+        with pytest.raises(ValueError):
+            SqliteConfigurationSource(str(tmp_path / "rules.db"), table="config; --")
+        with pytest.raises(ValueError):
+            SqliteConfigurationSource.write(str(tmp_path / "rules.db"), {}, "1table")
+
+    def test_write_replaces_table(self, database_path):
+        SqliteConfigurationSource.write(database_path, {"other": 1})
+        SqliteConfigurationSource.write(database_path, {"table": 2}, table="other")
+
+        assert SqliteConfigurationSource(database_path).read() == {"other": 1}
+        assert SqliteConfigurationSource(database_path, "other").read() == {"table": 2}
+
+    def test_fingerprint(self, database_path, source):
+        fingerprint = source.fingerprint()
+
+        assert fingerprint == source.fingerprint()
+        SqliteConfigurationSource.write(database_path, {"other": 1})
+        assert source.fingerprint() != fingerprint
+
+    def test_close(self, source):
+        source.get("rules.A.max_bid")
+        source.close()
+        source.close()
+
+        assert source.get("rules.B.max_bid") == 50
+
+    def test_pickle(self, source):
+        source.get("rules.A.max_bid")
+
+        unpickled = pickle.loads(pickle.dumps(source))
+
+        assert unpickled._connection is None
+        assert not unpickled._cache
+        assert unpickled.get("rules.A.max_bid") == 100
+        unpickled.close()
+
+    @pytest.mark.parametrize(
+        ["key", "expected_value"],
+        [
+            ("rules.A.max_bid", 200),
+            ("rules.A.terms", [36, 60]),
+            ("rules.A", {"max_bid": 200, "terms": [36, 60], "note": "from dict"}),
+            ("rules.B.max_bid", 50),
+            ("rules.C", "from dict"),
+            ("rules.C.max_bid", None),
+            ("rules.*.note", "from dict"),
+            ("missing", None),
+        ],
+    )
+    def test_config_with_lazy_source(self, source, key, expected_value):
+        config = Config(
+            {"rules": {"A": {"max_bid": 200, "note": "from dict"}, "C": "from dict"}},
+            lazy_sources=[source],
+        )
+
+        assert config.get(key) == expected_value
+
+    def test_later_lazy_sources_take_precedence(self, tmp_path, source):
+        other_path = str(tmp_path / "other.db")
+        SqliteConfigurationSource.write(
+            other_path, {"rules": {"A": {"max_bid": 300}, "B": "replaced"}}
+        )
+        other = SqliteConfigurationSource(other_path)
+        config = Config({"rules": {"C": {"max_bid": 5}}}, lazy_sources=[source, other])
+
+        assert config.get("rules.A") == {"max_bid": 300, "terms": [36, 60]}
+        assert config.get("rules.B") == "replaced"
+        assert Config(
+            {"rules": {"B": {"max_bid": 5}}}, lazy_sources=[source, other]
+        ).get("rules.B") == {"max_bid": 5}
+        assert config.get("rules.B-extra.max_bid") == 1
+        other.close()
+
+    def test_config_with_lazy_source_fingerprint(self, source):
+        config = Config({}, lazy_sources=[source])
+
+        assert config.fingerprint != Config({}).fingerprint
+        assert Config({}).fingerprint == Config({}).fingerprint
+
+    def test_config_with_lazy_source_features(self, source):
+        config = Config(
+            {"summary": "A bids ${rules.A.max_bid}"},
+            interpolate=True,
+            lazy_sources=[source],
+        )
+
+        assert config.get("summary") == "A bids 100"
+        assert config.view("rules.B").get("max_bid") == 50
+        with config.override({"rules.B.max_bid": 75}):
+            assert config.get("rules.B") == {
+                "max_bid": 75,
+                "enabled": False,
+                "empty": {},
+            }
+
+    def test_pickle_config_with_lazy_source(self, mocker, source):
+        mocker.patch.object(transfer, "_cached_configs", transfer.OrderedDict())
+        config = Config({}, lazy_sources=[source])
+
+        unpickled = pickle.loads(pickle.dumps(config))
+
+        assert unpickled.get("rules.A.max_bid") == 100
+        with config.handle() as handle, Config({}).handle() as plain_handle:
+            assert handle.digest != plain_handle.digest
+            assert pickle.loads(pickle.dumps(handle)).get("rules.A.max_bid") == 100
+
+    def test_autoconfig_with_lazy_source(
+        self, mocker, app_dir, realize_config_schemata, source
+    ):
+        realize_config_schemata.return_value = [
+            {
+                "rules": {
+                    "A": {
+                        ConfigKey("max_bid", "desc", default=10): int,
+                        ConfigKey("note", "desc", default="default note"): str,
+                    },
+                    "B": {ConfigKey("max_bid", "desc", default=1): int},
+                    "C": {ConfigKey("max_bid", "desc", default=7): int},
+                }
+            }
+        ]
+        (app_dir / f".{APP_NAME}.json").write_text(
+            json.dumps({"rules": {"B": {"max_bid": 60}}})
+        )
+        read_spy = mocker.spy(source, "read")
+
+        config = Config.autoconfig(APP_NAME, lazy_sources=[source])
+
+        read_spy.assert_not_called()
+        # Lazy sources take precedence over the schema defaults, but not over the other sources.
+        assert config.get("rules.A.max_bid") == 100
+        assert config.get("rules.A") == {
+            "max_bid": 100,
+            "terms": [36, 60],
+            "note": "default note",
+        }
+        assert config.get("rules.B.max_bid") == 60
+        assert config.get("rules.B") == {"max_bid": 60, "enabled": False, "empty": {}}
+        assert config.get("rules.C.max_bid") == 7
+        assert config.get("rules")["B-extra"] == {"max_bid": 1}
+
+        # Values only held by lazy sources aren't enumerated.
+        assert config.keys("rules.A") == ["rules.A.max_bid", "rules.A.note"]
+        assert config.find("rules.*.max_bid") == [
+            "rules.A.max_bid",
+            "rules.B.max_bid",
+            "rules.C.max_bid",
+        ]
+
+        unpickled = pickle.loads(pickle.dumps(config))
+        assert unpickled.get("rules.A.max_bid") == 100
+        assert unpickled.get("rules.C.max_bid") == 7
+
+    def test_autoconfig_values_set_to_their_default_count_as_defaults(
+        self, app_dir, realize_config_schemata, source
+    ):
+        realize_config_schemata.return_value = [
+            {"rules": {"A": {ConfigKey("max_bid", "desc", default=10): int}}}
+        ]
+        (app_dir / f".{APP_NAME}.json").write_text(
+            json.dumps({"rules": {"A": {"max_bid": 10}}})
+        )
+
+        config = Config.autoconfig(APP_NAME, lazy_sources=[source])
+
+        assert config.get("rules.A.max_bid") == 100
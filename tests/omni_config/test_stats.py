@@ -0,0 +1,147 @@
+import json
+import logging
+
+import pytest
+
+from prosper_shared.omni_config import AutoconfigStats, Config
+from prosper_shared.omni_config import _stats as stats_module
+from prosper_shared.omni_config._stats import _phase, _recording
+
+APP_NAME = "stats-app"
+
+
+class TestStats:
+    @pytest.fixture
+    def app_config_files(self):
+        return {f".{APP_NAME}.json": {APP_NAME: {"key": "file"}}}
+
+    def test_autoconfig_phases(self, app_dir):
+        stats = AutoconfigStats()
+
+        config = Config.autoconfig(
+            APP_NAME,
+            validate=True,
+            search_equivalent_names=False,
+            snapshot_path=str(app_dir / "config.snapshot"),
+            stats=stats,
+        )
+
+        assert config.get(f"{APP_NAME}.key") == "file"
+        names = [phase.name for phase in stats.phases]
+        assert names[-1] == "autoconfig"
+        assert set(names) >= {
+            "schema",
+            "argparse",
+            "discovery",
+            "snapshot read",
+            "read JsonConfigurationSource",
+            "parse",
+            "read EnvironmentVariableSource",
+            "read ArgParseSource",
+            "merge",
+            "validation",
+            "snapshot write",
+        }
+        (parse,) = [phase for phase in stats.phases if phase.name == "parse"]
+        assert parse.details == {
+            "path": str(app_dir / f".{APP_NAME}.json"),
+            "format": "json",
+            "bytes": len(json.dumps({APP_NAME: {"key": "file"}})),
+        }
+        autoconfig = stats.phases[-1]
+        assert autoconfig.details == {"app_name": APP_NAME}
+        assert all(
+            autoconfig.started_at <= phase.started_at
+            and phase.duration <= autoconfig.duration
+            for phase in stats.phases
+        )
+
+    def test_snapshot_hit(self, app_dir):
+        snapshot_path = str(app_dir / "config.snapshot")
+        Config.autoconfig(APP_NAME, snapshot_path=snapshot_path)
+        stats = AutoconfigStats()
+
+        Config.autoconfig(APP_NAME, snapshot_path=snapshot_path, stats=stats)
+
+        names = [phase.name for phase in stats.phases]
+        assert "merge" not in names
+        (snapshot_read,) = [p for p in stats.phases if p.name == "snapshot read"]
+        assert snapshot_read.details == {"path": snapshot_path, "hit": True}
+
+    def test_autoconfig_many(self, app_dir):
+        stats = AutoconfigStats()
+
+        Config.autoconfig_many([APP_NAME, "other-app"], stats=stats)
+
+        assert [
+            phase.details["app_name"]
+            for phase in stats.phases
+            if phase.name == "autoconfig"
+        ] == [APP_NAME, "other-app"]
+
+    def test_durations(self):
+        stats = AutoconfigStats()
+        stats._record("read", 0.0, {})
+        stats.phases = [
+            stats.phases[0]._replace(duration=1.0),
+            stats.phases[0]._replace(name="merge", duration=0.5),
+            stats.phases[0]._replace(duration=2.0),
+        ]
+
+        assert stats.durations() == {"read": 3.0, "merge": 0.5}
+
+    def test_log(self, app_dir, caplog):
+        stats = AutoconfigStats()
+        Config.autoconfig(APP_NAME, stats=stats)
+
+        with caplog.at_level(logging.DEBUG):
+            stats.log()
+            stats.log(logging.getLogger("custom"), logging.DEBUG)
+
+        assert len(caplog.records) == 2 * len(stats.phases)
+        record = caplog.records[len(stats.phases) - 1]
+        assert record.name == stats_module.__name__
+        assert record.levelno == logging.INFO
+        assert record.omni_config == {
+            "phase": "autoconfig",
+            "duration_ms": stats.phases[-1].duration * 1000,
+            "app_name": APP_NAME,
+        }
+        assert record.getMessage().startswith("autoconfig phase autoconfig took ")
+        assert caplog.records[-1].name == "custom"
+        assert caplog.records[-1].levelno == logging.DEBUG
+
+    def test_chrome_trace(self, app_dir, tmp_path):
+        stats = AutoconfigStats()
+        Config.autoconfig(APP_NAME, stats=stats)
+        trace_path = tmp_path / "trace.json"
+
+        stats.write_chrome_trace(str(trace_path))
+
+        trace = json.loads(trace_path.read_text())
+        assert trace["displayTimeUnit"] == "ms"
+        assert len(trace["traceEvents"]) == len(stats.phases)
+        event = trace["traceEvents"][-1]
+        assert event["name"] == "autoconfig"
+        assert event["ph"] == "X"
+        assert event["dur"] == pytest.approx(stats.phases[-1].duration * 1_000_000)
+        assert event["args"] == {"app_name": APP_NAME}
+
+    def test_phases_are_not_recorded_without_stats(self, app_dir, mocker):
+        record_spy = mocker.spy(AutoconfigStats, "_record")
+
+        Config.autoconfig(APP_NAME)
+        with _recording(None), _phase("phase") as details:
+            details["key"] = "value"
+
+        record_spy.assert_not_called()
+        assert stats_module._active_stats.get() is None
+
+    def test_failed_phases_are_recorded(self):
+        stats = AutoconfigStats()
+
+        with pytest.raises(ValueError), _recording(stats), _phase("failing"):
+            raise ValueError()
+
+        assert [phase.name for phase in stats.phases] == ["failing"]
+        assert stats_module._active_stats.get() is None
@@ -0,0 +1,143 @@
+import copy
+import multiprocessing
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from prosper_shared.omni_config import Config, ConfigHandle
+from prosper_shared.omni_config import _transfer as transfer
+from prosper_shared.omni_config._transfer import _cache_config, _resolve_config_handle
+
+TEST_CONFIG = {
+    "section": {"key": "value", "list": list(range(1000))},
+    "other": {"int": 123},
+}
+
+
+def _get_from_config(config, key):
+    return config.get(key)
+
+
+class SubConfig(Config):
+    pass
+
+
+class TestTransfer:
+    @pytest.fixture(autouse=True)
+    def cached_configs(self, mocker):
+        return mocker.patch.object(transfer, "_cached_configs", transfer.OrderedDict())
+
+    @pytest.mark.parametrize("protocol", range(2, pickle.HIGHEST_PROTOCOL + 1))
+    def test_pickle(self, protocol):
+        config = SubConfig(TEST_CONFIG)
+
+        unpickled = pickle.loads(pickle.dumps(config, protocol=protocol))
+
+        assert type(unpickled) is SubConfig
+        assert unpickled._config_dict == TEST_CONFIG
+
+    def test_pickle_serializes_config_dict_once(self):
+        config = Config(TEST_CONFIG)
+
+        pickled = pickle.dumps(config)
+
+        # The config dict is pickled straight into the stream, rather than as a pickled blob inside it.
+        assert len(pickled) < len(pickle.dumps(TEST_CONFIG)) + 200
+        assert pickle.loads(pickled).get("section.list.999") == 999
+
+    def test_pickle_after_in_place_modification(self):
+        config = Config(TEST_CONFIG)
+        pickle.dumps(config)
+
+        config.get("section.list").append(1000)
+
+        assert pickle.loads(pickle.dumps(config)).get("section.list.1000") == 1000
+
+    def test_copy(self):
+        config = Config(TEST_CONFIG)
+
+        copied = copy.deepcopy(config)
+
+        assert copied is not config
+        assert copied._config_dict == config._config_dict
+        assert copied._config_dict is not config._config_dict
+
+    def test_pickle_view(self):
+        view = SubConfig(TEST_CONFIG).view("other")
+
+        unpickled = pickle.loads(pickle.dumps(view))
+
+        assert type(unpickled) is Config
+        assert unpickled._config_dict == {"int": 123}
+
+    def test_pickle_shared_memory_config(self):
+        segment = Config(TEST_CONFIG).share()
+        try:
+            config = Config.attach(segment.name)
+            unpickled = pickle.loads(pickle.dumps(config))
+
+            assert type(unpickled) is type(config)
+            assert unpickled.get("other.int") == 123
+            unpickled.close()
+            config.close()
+        finally:
+            segment.close()
+            segment.unlink()
+
+    def test_handle(self):
+        config = Config(TEST_CONFIG)
+
+        with config.handle() as handle:
+            pickled = pickle.dumps(handle)
+            unpickled = pickle.loads(pickled)
+
+        assert isinstance(handle, ConfigHandle)
+        assert handle.digest in pickled.decode("latin-1")
+        assert len(pickled) < len(pickle.dumps(config)) / 10
+        assert unpickled._config_dict == TEST_CONFIG
+        assert unpickled is pickle.loads(pickled)
+
+    def test_handle_is_read_from_shared_memory(self, cached_configs):
+        config = Config(TEST_CONFIG)
+
+        with config.handle() as handle:
+            pickled = pickle.dumps(handle)
+            cached_configs.clear()
+
+            unpickled = pickle.loads(pickled)
+
+            assert unpickled._config_dict == TEST_CONFIG
+            assert cached_configs[handle.digest] is unpickled
+            assert pickle.loads(pickled) is unpickled
+
+    def test_handle_in_process_pool(self):
+        config = Config(TEST_CONFIG)
+
+        with config.handle() as handle, ProcessPoolExecutor(
+            1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            results = [
+                executor.submit(_get_from_config, handle, key).result()
+                for key in ("section.key", "other.int")
+            ]
+
+        assert results == ["value", 123]
+
+    def test_handle_has_same_digest_for_same_content(self):
+        with Config(TEST_CONFIG).handle() as handle, Config(
+            TEST_CONFIG
+        ).handle() as other_handle, Config({"other": "config"}).handle() as third:
+            assert handle.digest == other_handle.digest
+            assert handle.digest != third.digest
+
+    def test_cache_evicts_least_recently_used(self, mocker, cached_configs):
+        mocker.patch.object(transfer, "_MAX_CACHED_CONFIGS", 2)
+        first, second, third = Config({"a": 1}), Config({"b": 2}), Config({"c": 3})
+
+        _cache_config("first", first)
+        _cache_config("second", second)
+        assert _resolve_config_handle("first", "unused", 0) is first
+        _cache_config("third", third)
+
+        assert list(cached_configs) == ["first", "third"]